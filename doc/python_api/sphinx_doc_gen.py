@@ -69,7 +69,7 @@ import rna_info  # Blender module
 
 def rna_info_BuildRNAInfo_cache():
     if rna_info_BuildRNAInfo_cache.ret is None:
-        rna_info_BuildRNAInfo_cache.ret = rna_info.BuildRNAInfo()
+        rna_info_BuildRNAInfo_cache.ret = rna_info.BuildRNAInfo(cache_filepath=ARGS.rna_info_cache)
     return rna_info_BuildRNAInfo_cache.ret
 
 
@@ -180,6 +180,14 @@ def handle_args():
                              "* OUTPUT_DIR/.latex_make.log",
                         required=False)
 
+    parser.add_argument("-c", "--rna-info-cache",
+                        dest="rna_info_cache",
+                        type=str,
+                        default="",
+                        help="Path of a file caching RNA info, reused by later runs of the same Blender build "
+                             "with the same add-ons enabled (default=\"\", no cache)",
+                        required=False)
+
     # parse only the args passed after '--'
     argv = []
     if "--" in sys.argv:
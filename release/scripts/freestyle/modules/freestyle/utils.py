@@ -42,11 +42,15 @@ __all__ = (
     "iter_material_value",
     "iter_t2d_along_stroke",
     "material_from_fedge",
+    "material_value",
     "normal_at_I0D",
     "pairwise",
     "phase_to_direction",
     "rgb_to_bw",
     "simplify",
+    "simplify_batch",
+    "simplify_indices",
+    "simplify_stroke",
     "stroke_curvature",
     "stroke_normal",
     "StrokeCollector",
@@ -71,7 +75,8 @@ from freestyle.types import (
 from mathutils import Vector
 from functools import lru_cache, namedtuple
 from math import cos, sin, pi, atan2
-from itertools import tee, compress
+from itertools import tee
+from array import array
 
 
 # -- types -- #
@@ -235,44 +240,91 @@ def getSquareSegmentDistance(p, p1, p2):
     return dx * dx + dy * dy
 
 
-def simplifyDouglasPeucker(points, tolerance):
-    length = len(points)
-    markers = [0] * length
-
-    first = 0
-    last = length - 1
-
-    first_stack = []
-    last_stack = []
-
-    new_points = []
+def simplify_indices(coords, tolerance, start=0, end=None):
+    """
+    Douglas-Peucker simplification of the points *start* to *end* (exclusive)
+    of a flat sequence of 2D coordinates, *tolerance* is a squared distance.
 
-    markers[first] = 1
-    markers[last] = 1
+    The direction of each segment is rounded to single precision
+    (as done by mathutils.Vector), so the same points are kept as with
+    :func:`simplifyDouglasPeucker`.
 
-    while last:
+    :return: The indices of the kept points, in ascending order.
+    :rtype: list of ints
+    """
+    if end is None:
+        end = len(coords) // 2
+    if end - start < 3:
+        return list(range(start, end))
+
+    xs = coords[start * 2:end * 2:2]
+    ys = coords[start * 2 + 1:end * 2:2]
+    # Round to single precision.
+    direction = array('f', (0.0, 0.0))
+
+    markers = bytearray(end - start)
+    markers[0] = markers[-1] = 1
+    stack = [(0, end - start - 1)]
+
+    while stack:
+        first, last = stack.pop()
+        x1, y1 = xs[first], ys[first]
+        x2, y2 = xs[last], ys[last]
+        direction[0] = x2 - x1
+        direction[1] = y2 - y1
+        dx, dy = direction
+        sqlength = dx * dx + dy * dy
+
+        index = first
         max_sqdist = 0
-
-        for i in range(first, last):
-            sqdist = getSquareSegmentDistance(points[i], points[first], points[last])
-
+        for i, px, py in zip(range(first, last), xs[first:last], ys[first:last]):
+            # Square distance between point and the segment.
+            x, y = x1, y1
+            if sqlength:
+                t = ((px - x) * dx + (py - y) * dy) / sqlength
+                if t > 1:
+                    x, y = x2, y2
+                elif t > 0:
+                    x += dx * t
+                    y += dy * t
+            px -= x
+            py -= y
+            sqdist = px * px + py * py
             if sqdist > max_sqdist:
                 index = i
                 max_sqdist = sqdist
 
         if max_sqdist > tolerance:
             markers[index] = 1
+            stack.append((first, index))
+            stack.append((index, last))
 
-            first_stack.append(first)
-            last_stack.append(index)
+    return [start + i for i in range(end - start) if markers[i]]
 
-            first_stack.append(index)
-            last_stack.append(last)
 
-        first = first_stack.pop() if first_stack else None
-        last = last_stack.pop() if last_stack else None
+def simplify_batch(coords, offsets, tolerance):
+    """
+    Simplifies many sequences of points in one call, the points are
+    stored in a flat sequence of 2D coordinates, sequence n being the points
+    ``offsets[n]`` to ``offsets[n + 1]``.
 
-    return tuple(compress(points, markers))
+    :return: The coordinates of the kept points and their offsets.
+    :rtype: tuple of two arrays
+    """
+    sqtolerance = tolerance * tolerance
+    coords_simplified = array('d')
+    offsets_simplified = array('i', [0])
+    for start, end in zip(offsets, offsets[1:]):
+        for i in simplify_indices(coords, sqtolerance, start, end):
+            coords_simplified.append(coords[i * 2])
+            coords_simplified.append(coords[i * 2 + 1])
+        offsets_simplified.append(len(coords_simplified) // 2)
+    return coords_simplified, offsets_simplified
+
+
+def simplifyDouglasPeucker(points, tolerance):
+    coords = array('d', [value for point in points for value in point])
+    return tuple(points[i] for i in simplify_indices(coords, tolerance))
 
 
 def simplify(points, tolerance):
@@ -280,6 +332,28 @@ def simplify(points, tolerance):
     return simplifyDouglasPeucker(points, tolerance * tolerance)
 
 
+def simplify_stroke(stroke, tolerance):
+    """
+    Simplifies a stroke in place, the kept points are moved to the first
+    vertices of the stroke and the remaining vertices are removed at once.
+    """
+    svertices = tuple(stroke)
+    # 'point' is the only access to the 2D coordinates, read each vertex once.
+    coords = array('d')
+    for svert in svertices:
+        coords.extend(svert.point)
+    kept = simplify_indices(coords, tolerance * tolerance)
+    if len(kept) == len(svertices):
+        return
+
+    # Only write the points which move, the leading kept points don't.
+    for j, i in enumerate(kept):
+        if i != j:
+            svertices[j].point = coords[i * 2:i * 2 + 2]
+    # Also updates the length & curvilinear abscissa of the vertices.
+    stroke.remove_vertices(svertices[len(kept):])
+
+
 class BoundingBox:
     """Object representing a bounding box consisting out of 2 2D vectors"""
 
@@ -431,48 +505,52 @@ def iter_distance_from_object(stroke, location, range_min, range_max, normfac):
             yield (svert, 0.0) if distance < range_min else (svert, 1.0)
 
 
+def material_value(material, attribute):
+    """Returns a specific material attribute from a material."""
+    # main
+    if attribute == 'LINE':
+        value = rgb_to_bw(*material.line[0:3])
+    elif attribute == 'DIFF':
+        value = rgb_to_bw(*material.diffuse[0:3])
+    elif attribute == 'SPEC':
+        value = rgb_to_bw(*material.specular[0:3])
+    # line separate
+    elif attribute == 'LINE_R':
+        value = material.line[0]
+    elif attribute == 'LINE_G':
+        value = material.line[1]
+    elif attribute == 'LINE_B':
+        value = material.line[2]
+    elif attribute == 'LINE_A':
+        value = material.line[3]
+    # diffuse separate
+    elif attribute == 'DIFF_R':
+        value = material.diffuse[0]
+    elif attribute == 'DIFF_G':
+        value = material.diffuse[1]
+    elif attribute == 'DIFF_B':
+        value = material.diffuse[2]
+    elif attribute == 'ALPHA':
+        value = material.diffuse[3]
+    # specular separate
+    elif attribute == 'SPEC_R':
+        value = material.specular[0]
+    elif attribute == 'SPEC_G':
+        value = material.specular[1]
+    elif attribute == 'SPEC_B':
+        value = material.specular[2]
+    elif attribute == 'SPEC_HARDNESS':
+        value = material.shininess
+    else:
+        raise ValueError("unexpected material attribute: " + attribute)
+    return value
+
+
 def iter_material_value(stroke, func, attribute):
     """Yields a specific material attribute from the vertex' underlying material."""
     it = Interface0DIterator(stroke)
     for svert in it:
-        material = func(it)
-        # main
-        if attribute == 'LINE':
-            value = rgb_to_bw(*material.line[0:3])
-        elif attribute == 'DIFF':
-            value = rgb_to_bw(*material.diffuse[0:3])
-        elif attribute == 'SPEC':
-            value = rgb_to_bw(*material.specular[0:3])
-        # line separate
-        elif attribute == 'LINE_R':
-            value = material.line[0]
-        elif attribute == 'LINE_G':
-            value = material.line[1]
-        elif attribute == 'LINE_B':
-            value = material.line[2]
-        elif attribute == 'LINE_A':
-            value = material.line[3]
-        # diffuse separate
-        elif attribute == 'DIFF_R':
-            value = material.diffuse[0]
-        elif attribute == 'DIFF_G':
-            value = material.diffuse[1]
-        elif attribute == 'DIFF_B':
-            value = material.diffuse[2]
-        elif attribute == 'ALPHA':
-            value = material.diffuse[3]
-        # specular separate
-        elif attribute == 'SPEC_R':
-            value = material.specular[0]
-        elif attribute == 'SPEC_G':
-            value = material.specular[1]
-        elif attribute == 'SPEC_B':
-            value = material.specular[2]
-        elif attribute == 'SPEC_HARDNESS':
-            value = material.shininess
-        else:
-            raise ValueError("unexpected material attribute: " + attribute)
-        yield (svert, value)
+        yield (svert, material_value(func(it), attribute))
 
 
 def iter_distance_along_stroke(stroke):
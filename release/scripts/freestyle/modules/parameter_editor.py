@@ -95,13 +95,11 @@ from freestyle.utils import (
     curvature_from_stroke_vertex,
     getCurrentScene,
     iter_distance_along_stroke,
-    iter_distance_from_camera,
-    iter_distance_from_object,
-    iter_material_value,
     iter_t2d_along_stroke,
+    material_value,
     normal_at_I0D,
     pairwise,
-    simplify,
+    simplify_stroke,
     stroke_normal,
     )
 from _freestyle import (
@@ -125,6 +123,252 @@ callbacks_lineset_pre = []
 callbacks_modifiers_post = []
 callbacks_lineset_post = []
 
+# Apply the color, alpha and thickness modifiers of a line set
+# in a single pass over each stroke (see BatchedModifiersShader).
+use_batched_modifiers = True
+
+# Number of samples of the lookup tables used to evaluate
+# color ramps and curves, zero evaluates them for every vertex.
+lookup_table_resolution = 256
+
+# Time the stages of process() and each shader (see LinesetProfile),
+# reports are printed for each line set and written as JSON when
+# 'profile_filepath' is set, "#" is replaced by the frame number.
+use_profile = False
+profile_filepath = ""
+
+
+class StrokeData:
+    """
+    Per-vertex attributes of a stroke, read once and shared by all modifiers
+    applied to the stroke, modified attributes are written back by :meth:`write`.
+    """
+    def __init__(self, stroke):
+        self.stroke = stroke
+        self.sverts = tuple(stroke)
+        # Lists of the vertex attributes, None until a modifier uses them.
+        self.colors = None
+        self.alphas = None
+        self.thicknesses = None
+        self._cache = {}
+
+    def _cached(self, key, func):
+        value = self._cache.get(key)
+        if value is None:
+            value = self._cache[key] = func()
+        return value
+
+    def _map_0d(self, func):
+        it = Interface0DIterator(self.stroke)
+        return [func(it) for _ in it]
+
+    def colors_ensure(self):
+        if self.colors is None:
+            self.colors = [svert.attribute.color for svert in self.sverts]
+        return self.colors
+
+    def alphas_ensure(self):
+        if self.alphas is None:
+            self.alphas = [svert.attribute.alpha for svert in self.sverts]
+        return self.alphas
+
+    def thicknesses_ensure(self):
+        if self.thicknesses is None:
+            self.thicknesses = [tuple(svert.attribute.thickness) for svert in self.sverts]
+        return self.thicknesses
+
+    def write(self):
+        """Write the modified attributes back to the stroke."""
+        if self.colors is not None:
+            for svert, color in zip(self.sverts, self.colors):
+                svert.attribute.color = color
+        if self.alphas is not None:
+            for svert, alpha in zip(self.sverts, self.alphas):
+                svert.attribute.alpha = alpha
+        if self.thicknesses is not None:
+            for svert, thickness in zip(self.sverts, self.thicknesses):
+                svert.attribute.thickness = thickness
+
+    def t2d_along_stroke(self):
+        return self._cached("t2d_along_stroke", lambda: list(iter_t2d_along_stroke(self.stroke)))
+
+    def curvilinear_abscissas(self):
+        return self._cached(
+            "curvilinear_abscissas",
+            lambda: [svert.curvilinear_abscissa for svert in self.sverts],
+        )
+
+    def distances_from_camera(self):
+        # length in the camera coordinate
+        return self._cached(
+            "distances_from_camera",
+            lambda: [svert.point_3d.length for svert in self.sverts],
+        )
+
+    def distances_from_object(self, location):
+        return self._cached(
+            ("distances_from_object", location.to_tuple()),
+            lambda: [(svert.point_3d - location).length for svert in self.sverts],
+        )
+
+    def materials(self):
+        return self._cached("materials", lambda: self._map_0d(CurveMaterialF0D()))
+
+    def orientations(self):
+        return self._cached("orientations", lambda: self._map_0d(VertexOrientation2DF0D()))
+
+    def tangent_angles(self):
+        return self._cached("tangent_angles", lambda: self._map_0d(angle_x_normal))
+
+    def crease_angles(self):
+        # A list of crease angles or None.
+        return self._cached("crease_angles", lambda: [crease_angle(svert) for svert in self.sverts])
+
+    def curvatures(self):
+        # A list of curvatures or None.
+        return self._cached(
+            "curvatures",
+            lambda: [curvature_from_stroke_vertex(svert) for svert in self.sverts],
+        )
+
+    def thickness_swaps(self, persp_camera):
+        # See 'thickness_swap'.
+        return self._cached(
+            ("thickness_swaps", persp_camera),
+            lambda: [thickness_swap(svert, persp_camera) for svert in self.sverts],
+        )
+
+
+class LookupTable:
+    """
+    A function sampled over the range [0, 1] and linearly interpolated,
+    used to avoid evaluating color ramps and curves for every vertex.
+    """
+    __slots__ = ("fingerprint", "values")
+
+    def __init__(self, func, resolution, fingerprint):
+        scale = resolution - 1
+        # Used to check if the table is still valid.
+        self.fingerprint = fingerprint
+        self.values = [func(i / scale) for i in range(resolution)]
+
+    def evaluate_function(self, fallback):
+        """
+        Returns a function evaluating the table,
+        calling *fallback* for values outside the sampled range.
+        """
+        values = self.values
+        scale = len(values) - 1
+
+        def evaluate(t):
+            if not (0.0 <= t <= 1.0):
+                return fallback(t)
+            x = t * scale
+            i = int(x)
+            fac = x - i
+            if fac == 0.0:
+                return values[i]
+            a = values[i]
+            return a + (values[i + 1] - a) * fac
+        return evaluate
+
+
+class ColorLookupTable(LookupTable):
+    """A lookup table of RGB colors."""
+    __slots__ = ()
+
+    def evaluate_function(self, fallback):
+        values = self.values
+        scale = len(values) - 1
+
+        def evaluate(t):
+            if not (0.0 <= t <= 1.0):
+                return fallback(t)
+            x = t * scale
+            i = int(x)
+            fac = x - i
+            if fac == 0.0:
+                return values[i]
+            (r1, g1, b1), (r2, g2, b2) = values[i], values[i + 1]
+            return (r1 + (r2 - r1) * fac, g1 + (g2 - g1) * fac, b1 + (b2 - b1) * fac)
+        return evaluate
+
+
+# Lookup tables shared between modifiers and the frames of a render,
+# keyed by the pointer of the ramp or curve data.
+_lookup_tables = {}
+
+
+def lookup_table_ensure(cls, data, fingerprint, func):
+    """
+    Returns a lookup table of *func*, created when *data*
+    has no table or the *fingerprint* of the data changed.
+    """
+    key = (cls, data.as_pointer(), lookup_table_resolution)
+    table = _lookup_tables.get(key)
+    if table is None or table.fingerprint != fingerprint:
+        table = _lookup_tables[key] = cls(func, lookup_table_resolution, fingerprint)
+    return table
+
+
+@bpy.app.handlers.persistent
+def _lookup_tables_clear(*_args):
+    _lookup_tables.clear()
+
+
+# Only share the tables within a render job, the data of
+# previous renders may have been freed (and its pointer reused).
+bpy.app.handlers.render_init.append(_lookup_tables_clear)
+
+
+def color_ramp_lookup_table(ramp):
+    """Returns a lookup table for the color ramp or None."""
+    # Constant interpolation can't be interpolated from samples.
+    if lookup_table_resolution < 2 or ramp.interpolation == 'CONSTANT':
+        return None
+    fingerprint = (
+        ramp.color_mode,
+        ramp.interpolation,
+        ramp.hue_interpolation,
+        tuple((elem.position, tuple(elem.color)) for elem in ramp.elements),
+    )
+    return lookup_table_ensure(
+        ColorLookupTable, ramp, fingerprint,
+        lambda t: tuple(evaluateColorRamp(ramp, t).xyz),
+    )
+
+
+def curve_mapping_lookup_table(curve):
+    """Returns a lookup table for the first curve of the curve mapping or None."""
+    if lookup_table_resolution < 2:
+        return None
+    fingerprint = (
+        curve.extend,
+        curve.use_clip,
+        curve.clip_min_x, curve.clip_max_x,
+        curve.clip_min_y, curve.clip_max_y,
+        tuple((tuple(point.location), point.handle_type) for point in curve.curves[0].points),
+    )
+
+    def evaluate(t):
+        result = curve.evaluate(curve=curve.curves[0], position=t)
+        return bound(curve.clip_min_y, result, curve.clip_max_y)
+
+    curve.initialize()
+    return lookup_table_ensure(LookupTable, curve, fingerprint, evaluate)
+
+
+def range_values(values, range_min, range_max, normfac):
+    """
+    Returns the values relative to the given range, constrained by
+    given minimum and maximum values (see iter_distance_from_camera).
+    """
+    return [
+        (value - range_min) / normfac if range_min < value < range_max else
+        0.0 if value < range_min else 1.0
+        for value in values
+    ]
+
 
 class ColorRampModifier(StrokeShader):
     """Primitive for the color modifiers."""
@@ -133,6 +377,9 @@ class ColorRampModifier(StrokeShader):
         self.blend = blend
         self.influence = influence
         self.ramp = ramp
+        table = color_ramp_lookup_table(ramp)
+        if table is not None:
+            self.evaluate = table.evaluate_function(self.evaluate)
 
     def evaluate(self, t):
         col = evaluateColorRamp(self.ramp, t)
@@ -141,6 +388,24 @@ class ColorRampModifier(StrokeShader):
     def blend_ramp(self, a, b):
         return blendRamp(self.blend, a, self.influence, b)
 
+    def apply(self, data):
+        """
+        Blends the colors of a :class:`StrokeData` with the values returned by
+        ``self.stroke_values(data)``, defined by subclasses: a color for each
+        vertex of the stroke, None leaves the vertex unchanged.
+        """
+        colors = data.colors_ensure()
+        blend = self.blend
+        influence = self.influence
+        for i, b in enumerate(self.stroke_values(data)):
+            if b is not None:
+                colors[i] = blendRamp(blend, colors[i], influence, b)
+
+    def shade(self, stroke):
+        data = StrokeData(stroke)
+        self.apply(data)
+        data.write()
+
 
 class ScalarBlendModifier(StrokeShader):
     """Primitive for alpha and thickness modifiers."""
@@ -148,29 +413,59 @@ class ScalarBlendModifier(StrokeShader):
         StrokeShader.__init__(self)
         self.blend_type = blend_type
         self.influence = influence
-
-    def blend(self, v1, v2):
+        # ((blend_type, influence), function), blend() is called for each vertex.
+        self._blend_function_cache = None
+
+    def blend_function(self):
+        """Returns a function blending two values."""
+        key = (self.blend_type, self.influence)
+        cache = self._blend_function_cache
+        if cache is None or cache[0] != key:
+            cache = self._blend_function_cache = (key, self._blend_function_create())
+        return cache[1]
+
+    def _blend_function_create(self):
         fac = self.influence
         facm = 1.0 - fac
         if self.blend_type == 'MIX':
-            v1 = facm * v1 + fac * v2
+            return lambda v1, v2: facm * v1 + fac * v2
         elif self.blend_type == 'ADD':
-            v1 += fac * v2
+            return lambda v1, v2: v1 + fac * v2
         elif self.blend_type == 'MULTIPLY':
-            v1 *= facm + fac * v2
+            return lambda v1, v2: v1 * (facm + fac * v2)
         elif self.blend_type == 'SUBTRACT':
-            v1 -= fac * v2
+            return lambda v1, v2: v1 - fac * v2
         elif self.blend_type == 'DIVIDE':
-            v1 = facm * v1 + fac * v1 / v2 if v2 != 0.0 else v1
+            return lambda v1, v2: facm * v1 + fac * v1 / v2 if v2 != 0.0 else v1
         elif self.blend_type == 'DIFFERENCE':
-            v1 = facm * v1 + fac * abs(v1 - v2)
-        elif self.blend_type == 'MININUM':
-            v1 = min(fac * v2, v1)
+            return lambda v1, v2: facm * v1 + fac * abs(v1 - v2)
+        elif self.blend_type == 'MINIMUM':
+            return lambda v1, v2: min(fac * v2, v1)
         elif self.blend_type == 'MAXIMUM':
-            v1 = max(fac * v2, v1)
+            return lambda v1, v2: max(fac * v2, v1)
         else:
             raise ValueError("unknown curve blend type: " + self.blend_type)
-        return v1
+
+    def blend(self, v1, v2):
+        return self.blend_function()(v1, v2)
+
+    def apply(self, data):
+        """
+        Blends the alphas of a :class:`StrokeData` with the values returned by
+        ``self.stroke_values(data)``, defined by subclasses: a value for each
+        vertex of the stroke, None leaves the vertex unchanged.
+        Thickness modifiers override this (see :class:`ThicknessBlenderMixIn`).
+        """
+        alphas = data.alphas_ensure()
+        blend = self.blend_function()
+        for i, b in enumerate(self.stroke_values(data)):
+            if b is not None:
+                alphas[i] = blend(alphas[i], b)
+
+    def shade(self, stroke):
+        data = StrokeData(stroke)
+        self.apply(data)
+        data.write()
 
 
 class CurveMappingModifier(ScalarBlendModifier):
@@ -180,6 +475,10 @@ class CurveMappingModifier(ScalarBlendModifier):
         self.evaluate = getattr(self, mapping)
         self.invert = invert
         self.curve = curve
+        if mapping == 'CURVE':
+            table = curve_mapping_lookup_table(curve)
+            if table is not None:
+                self.evaluate = table.evaluate_function(self.CURVE)
 
     def LINEAR(self, t):
         return (1.0 - t) if self.invert else t
@@ -194,86 +493,96 @@ class CurveMappingModifier(ScalarBlendModifier):
         return bound(curve.clip_min_y, result, curve.clip_max_y)
 
 
+def thickness_swap(sv, persp_camera):
+    """
+    Returns True when the outer and inner thickness of a stroke vertex are swapped,
+    False when they are not and None when they are averaged.
+    """
+    fe = sv.fedge
+    nature = fe.nature
+    if (nature & Nature.BORDER):
+        if persp_camera:
+            point = -sv.point_3d.normalized()
+            dir = point.dot(fe.normal_left)
+        else:
+            dir = fe.normal_left.z
+        return dir < 0.0  # the back side is visible
+    elif (nature & Nature.SILHOUETTE):
+        return fe.is_smooth  # TODO more tests needed
+    return None
+
+
 class ThicknessModifierMixIn:
     def __init__(self):
         scene = getCurrentScene()
         self.persp_camera = (scene.camera.data.type == 'PERSP')
 
     def set_thickness(self, sv, outer, inner):
-        fe = sv.fedge
-        nature = fe.nature
-        if (nature & Nature.BORDER):
-            if self.persp_camera:
-                point = -sv.point_3d.normalized()
-                dir = point.dot(fe.normal_left)
-            else:
-                dir = fe.normal_left.z
-            if dir < 0.0:  # the back side is visible
-                outer, inner = inner, outer
-        elif (nature & Nature.SILHOUETTE):
-            if fe.is_smooth:  # TODO more tests needed
-                outer, inner = inner, outer
-        else:
+        swap = thickness_swap(sv, self.persp_camera)
+        if swap is None:
             outer = inner = (outer + inner) / 2
+        elif swap:
+            outer, inner = inner, outer
         sv.attribute.thickness = (outer, inner)
 
 
 class ThicknessBlenderMixIn(ThicknessModifierMixIn):
+    # Blend the thickness of each side separately,
+    # values are (right, left) pairs in this case.
+    asymmetric = False
+
     def __init__(self, position, ratio):
         ThicknessModifierMixIn.__init__(self)
         self.position = position
         self.ratio = ratio
 
-    def blend_thickness(self, svert, thickness, asymmetric=False):
-        """Blends and sets the thickness with respect to the position, blend mode and symmetry."""
-        if asymmetric:
-            right, left = thickness
-            self.blend_thickness_asymmetric(svert, right, left)
-        else:
-            if type(thickness) not in {int, float}:
-                thickness = sum(thickness)
-            self.blend_thickness_symmetric(svert, thickness)
-
-    def blend_thickness_symmetric(self, svert, v):
-        """Blends and sets the thickness. Thickness is equal on each side of the backbone"""
-        outer, inner = svert.attribute.thickness
-        v = self.blend(outer + inner, v)
-
-        # Part 1: blend
+    def thickness_split_function(self):
+        """Returns a function splitting a thickness into (outer, inner) with respect to the position."""
+        ratio = self.ratio
         if self.position == 'CENTER':
-            outer = inner = v * 0.5
+            return lambda v: (v * 0.5, v * 0.5)
         elif self.position == 'INSIDE':
-            outer, inner = 0, v
+            return lambda v: (0, v)
         elif self.position == 'OUTSIDE':
-            outer, inner = v, 0
+            return lambda v: (v, 0)
         elif self.position == 'RELATIVE':
-            outer, inner = v * self.ratio, v - (v * self.ratio)
+            return lambda v: (v * ratio, v - (v * ratio))
         else:
-            raise ValueError("unknown thickness position: " + position)
+            raise ValueError("unknown thickness position: " + self.position)
 
-        self.set_thickness(svert, outer, inner)
-
-    def blend_thickness_asymmetric(self, svert, right, left):
-        """Blends and sets the thickness. Thickness may be unequal on each side of the backbone"""
-        # blend the thickness values for both sides. This way, the blend mode is supported.
-        old = svert.attribute.thickness
-        new = (right, left)
-        right, left = (self.blend(*val) for val in zip(old, new))
-
-        fe = svert.fedge
-        nature = fe.nature
-        if (nature & Nature.BORDER):
-            if self.persp_camera:
-                point = -svert.point_3d.normalized()
-                dir = point.dot(fe.normal_left)
-            else:
-                dir = fe.normal_left.z
-            if dir < 0.0:  # the back side is visible
-                right, left = left, right
-        elif (nature & Nature.SILHOUETTE):
-            if fe.is_smooth:  # TODO more tests needed
-                right, left = left, right
-        svert.attribute.thickness = (right, left)
+    def apply(self, data):
+        """Blends and sets the thickness with respect to the position, blend mode and symmetry."""
+        thicknesses = data.thicknesses_ensure()
+        swaps = data.thickness_swaps(self.persp_camera)
+        blend = self.blend_function()
+        values = self.stroke_values(data)
+
+        if self.asymmetric:
+            # Thickness may be unequal on each side of the backbone.
+            for i, (v, swap) in enumerate(zip(values, swaps)):
+                if v is None:
+                    continue
+                # blend the thickness values for both sides. This way, the blend mode is supported.
+                outer, inner = thicknesses[i]
+                right, left = blend(outer, v[0]), blend(inner, v[1])
+                if swap:
+                    right, left = left, right
+                thicknesses[i] = (right, left)
+        else:
+            # Thickness is equal on each side of the backbone.
+            split = self.thickness_split_function()
+            for i, (v, swap) in enumerate(zip(values, swaps)):
+                if v is None:
+                    continue
+                if type(v) not in {int, float}:
+                    v = sum(v)
+                outer, inner = thicknesses[i]
+                outer, inner = split(blend(outer + inner, v))
+                if swap is None:
+                    outer = inner = (outer + inner) / 2
+                elif swap:
+                    outer, inner = inner, outer
+                thicknesses[i] = (outer, inner)
 
 
 class BaseThicknessShader(StrokeShader, ThicknessModifierMixIn):
@@ -295,29 +604,60 @@ class BaseThicknessShader(StrokeShader, ThicknessModifierMixIn):
         else:
             raise ValueError("unknown thickness position: " + position)
 
+    def apply(self, data):
+        thicknesses = data.thicknesses_ensure()
+        outer, inner = self.outer, self.inner
+        average = (outer + inner) / 2
+        for i, swap in enumerate(data.thickness_swaps(self.persp_camera)):
+            if swap is None:
+                thicknesses[i] = (average, average)
+            elif swap:
+                thicknesses[i] = (inner, outer)
+            else:
+                thicknesses[i] = (outer, inner)
+
     def shade(self, stroke):
         for svert in stroke:
             self.set_thickness(svert, self.outer, self.inner)
 
 
+class BatchedModifiersShader(StrokeShader):
+    """
+    Applies a list of color, alpha and thickness modifiers in a single pass,
+    the stroke attributes are read once, shared by all modifiers and written back once.
+    """
+    def __init__(self, modifiers):
+        StrokeShader.__init__(self)
+        self.modifiers = modifiers
+        # Timing of each modifier ([seconds, strokes]), see LinesetProfile.
+        self.timings = None
+
+    def shade(self, stroke):
+        data = StrokeData(stroke)
+        if self.timings is None:
+            for modifier in self.modifiers:
+                modifier.apply(data)
+        else:
+            for modifier, timing in zip(self.modifiers, self.timings):
+                t = time.perf_counter()
+                modifier.apply(data)
+                timing[0] += time.perf_counter() - t
+                timing[1] += 1
+        data.write()
+
+
 # Along Stroke modifiers
 
 class ColorAlongStrokeShader(ColorRampModifier):
     """Maps a ramp to the color of the stroke, using the curvilinear abscissa (t)."""
-    def shade(self, stroke):
-        for svert, t in zip(stroke, iter_t2d_along_stroke(stroke)):
-            a = svert.attribute.color
-            b = self.evaluate(t)
-            svert.attribute.color = self.blend_ramp(a, b)
+    def stroke_values(self, data):
+        return [self.evaluate(t) for t in data.t2d_along_stroke()]
 
 
 class AlphaAlongStrokeShader(CurveMappingModifier):
     """Maps a curve to the alpha/transparency of the stroke, using the curvilinear abscissa (t)."""
-    def shade(self, stroke):
-        for svert, t in zip(stroke, iter_t2d_along_stroke(stroke)):
-            a = svert.attribute.alpha
-            b = self.evaluate(t)
-            svert.attribute.alpha = self.blend(a, b)
+    def stroke_values(self, data):
+        return [self.evaluate(t) for t in data.t2d_along_stroke()]
 
 
 class ThicknessAlongStrokeShader(ThicknessBlenderMixIn, CurveMappingModifier):
@@ -328,10 +668,8 @@ class ThicknessAlongStrokeShader(ThicknessBlenderMixIn, CurveMappingModifier):
         CurveMappingModifier.__init__(self, blend, influence, mapping, invert, curve)
         self.value = BoundedProperty(value_min, value_max)
 
-    def shade(self, stroke):
-        for svert, t in zip(stroke, iter_t2d_along_stroke(stroke)):
-            b = self.value.min + self.evaluate(t) * self.value.delta
-            self.blend_thickness(svert, b)
+    def stroke_values(self, data):
+        return [self.value.min + self.evaluate(t) * self.value.delta for t in data.t2d_along_stroke()]
 
 
 # -- Distance from Camera modifiers -- #
@@ -342,12 +680,8 @@ class ColorDistanceFromCameraShader(ColorRampModifier):
         ColorRampModifier.__init__(self, blend, influence, ramp)
         self.range = BoundedProperty(range_min, range_max)
 
-    def shade(self, stroke):
-        it = iter_distance_from_camera(stroke, *self.range)
-        for svert, t in it:
-            a = svert.attribute.color
-            b = self.evaluate(t)
-            svert.attribute.color = self.blend_ramp(a, b)
+    def stroke_values(self, data):
+        return [self.evaluate(t) for t in range_values(data.distances_from_camera(), *self.range)]
 
 
 class AlphaDistanceFromCameraShader(CurveMappingModifier):
@@ -356,12 +690,8 @@ class AlphaDistanceFromCameraShader(CurveMappingModifier):
         CurveMappingModifier.__init__(self, blend, influence, mapping, invert, curve)
         self.range = BoundedProperty(range_min, range_max)
 
-    def shade(self, stroke):
-        it = iter_distance_from_camera(stroke, *self.range)
-        for svert, t in it:
-            a = svert.attribute.alpha
-            b = self.evaluate(t)
-            svert.attribute.alpha = self.blend(a, b)
+    def stroke_values(self, data):
+        return [self.evaluate(t) for t in range_values(data.distances_from_camera(), *self.range)]
 
 
 class ThicknessDistanceFromCameraShader(ThicknessBlenderMixIn, CurveMappingModifier):
@@ -373,10 +703,11 @@ class ThicknessDistanceFromCameraShader(ThicknessBlenderMixIn, CurveMappingModif
         self.range = BoundedProperty(range_min, range_max)
         self.value = BoundedProperty(value_min, value_max)
 
-    def shade(self, stroke):
-        for (svert, t) in iter_distance_from_camera(stroke, *self.range):
-            b = self.value.min + self.evaluate(t) * self.value.delta
-            self.blend_thickness(svert, b)
+    def stroke_values(self, data):
+        return [
+            self.value.min + self.evaluate(t) * self.value.delta
+            for t in range_values(data.distances_from_camera(), *self.range)
+        ]
 
 
 # Distance from Object modifiers
@@ -393,12 +724,8 @@ class ColorDistanceFromObjectShader(ColorRampModifier):
         # get the object location in the camera coordinate
         self.loc = matrix @ target.location
 
-    def shade(self, stroke):
-        it = iter_distance_from_object(stroke, self.loc, *self.range)
-        for svert, t in it:
-            a = svert.attribute.color
-            b = self.evaluate(t)
-            svert.attribute.color = self.blend_ramp(a, b)
+    def stroke_values(self, data):
+        return [self.evaluate(t) for t in range_values(data.distances_from_object(self.loc), *self.range)]
 
 
 class AlphaDistanceFromObjectShader(CurveMappingModifier):
@@ -413,12 +740,8 @@ class AlphaDistanceFromObjectShader(CurveMappingModifier):
         # get the object location in the camera coordinate
         self.loc = matrix @ target.location
 
-    def shade(self, stroke):
-        it = iter_distance_from_object(stroke, self.loc, *self.range)
-        for svert, t in it:
-            a = svert.attribute.alpha
-            b = self.evaluate(t)
-            svert.attribute.alpha = self.blend(a, b)
+    def stroke_values(self, data):
+        return [self.evaluate(t) for t in range_values(data.distances_from_object(self.loc), *self.range)]
 
 
 class ThicknessDistanceFromObjectShader(ThicknessBlenderMixIn, CurveMappingModifier):
@@ -436,11 +759,11 @@ class ThicknessDistanceFromObjectShader(ThicknessBlenderMixIn, CurveMappingModif
         # get the object location in the camera coordinate
         self.loc = matrix @ target.location
 
-    def shade(self, stroke):
-        it = iter_distance_from_object(stroke, self.loc, *self.range)
-        for svert, t in it:
-            b = self.value.min + self.evaluate(t) * self.value.delta
-            self.blend_thickness(svert, b)
+    def stroke_values(self, data):
+        return [
+            self.value.min + self.evaluate(t) * self.value.delta
+            for t in range_values(data.distances_from_object(self.loc), *self.range)
+        ]
 
 
 # Material modifiers
@@ -450,26 +773,17 @@ class ColorMaterialShader(ColorRampModifier):
         ColorRampModifier.__init__(self, blend, influence, ramp)
         self.attribute = material_attribute
         self.use_ramp = use_ramp
-        self.func = CurveMaterialF0D()
 
-    def shade(self, stroke, attributes={'DIFF', 'SPEC', 'LINE'}):
-        it = Interface0DIterator(stroke)
+    def stroke_values(self, data, attributes={'DIFF', 'SPEC', 'LINE'}):
+        materials = data.materials()
         if not self.use_ramp and self.attribute in attributes:
-            for svert in it:
-                material = self.func(it)
-                if self.attribute == 'LINE':
-                    b = material.line[0:3]
-                elif self.attribute == 'DIFF':
-                    b = material.diffuse[0:3]
-                else:
-                    b = material.specular[0:3]
-                a = svert.attribute.color
-                svert.attribute.color = self.blend_ramp(a, b)
-        else:
-            for svert, value in iter_material_value(stroke, self.func, self.attribute):
-                a = svert.attribute.color
-                b = self.evaluate(value)
-                svert.attribute.color = self.blend_ramp(a, b)
+            if self.attribute == 'LINE':
+                return [material.line[0:3] for material in materials]
+            elif self.attribute == 'DIFF':
+                return [material.diffuse[0:3] for material in materials]
+            else:
+                return [material.specular[0:3] for material in materials]
+        return [self.evaluate(material_value(material, self.attribute)) for material in materials]
 
 
 class AlphaMaterialShader(CurveMappingModifier):
@@ -477,13 +791,9 @@ class AlphaMaterialShader(CurveMappingModifier):
     def __init__(self, blend, influence, mapping, invert, curve, material_attribute):
         CurveMappingModifier.__init__(self, blend, influence, mapping, invert, curve)
         self.attribute = material_attribute
-        self.func = CurveMaterialF0D()
 
-    def shade(self, stroke):
-        for svert, value in iter_material_value(stroke, self.func, self.attribute):
-            a = svert.attribute.alpha
-            b = self.evaluate(value)
-            svert.attribute.alpha = self.blend(a, b)
+    def stroke_values(self, data):
+        return [self.evaluate(material_value(material, self.attribute)) for material in data.materials()]
 
 
 class ThicknessMaterialShader(ThicknessBlenderMixIn, CurveMappingModifier):
@@ -494,12 +804,12 @@ class ThicknessMaterialShader(ThicknessBlenderMixIn, CurveMappingModifier):
         CurveMappingModifier.__init__(self, blend, influence, mapping, invert, curve)
         self.attribute = material_attribute
         self.value = BoundedProperty(value_min, value_max)
-        self.func = CurveMaterialF0D()
 
-    def shade(self, stroke):
-        for svert, value in iter_material_value(stroke, self.func, self.attribute):
-            b = self.value.min + self.evaluate(value) * self.value.delta
-            self.blend_thickness(svert, b)
+    def stroke_values(self, data):
+        return [
+            self.value.min + self.evaluate(material_value(material, self.attribute)) * self.value.delta
+            for material in data.materials()
+        ]
 
 
 # Calligraphic thickness modifier
@@ -512,43 +822,30 @@ class CalligraphicThicknessShader(ThicknessBlenderMixIn, ScalarBlendModifier):
         ScalarBlendModifier.__init__(self, blend_type, influence)
         self.orientation = Vector((cos(orientation), sin(orientation)))
         self.thickness = BoundedProperty(thickness_min, thickness_max)
-        self.func = VertexOrientation2DF0D()
 
-    def shade(self, stroke):
-        it = Interface0DIterator(stroke)
-        for svert in it:
-            dir = self.func(it)
+    def stroke_values(self, data):
+        values = []
+        for dir in data.orientations():
             if dir.length != 0.0:
-                dir.normalize()
-                fac = abs(dir.orthogonal() @ self.orientation)
-                b = self.thickness.min + fac * self.thickness.delta
+                fac = abs(dir.normalized().orthogonal() @ self.orientation)
+                values.append(self.thickness.min + fac * self.thickness.delta)
             else:
-                b = self.thickness.min
-            self.blend_thickness(svert, b)
+                values.append(self.thickness.min)
+        return values
 
 
 # - Tangent Modifiers - #
 
 class TangentColorShader(ColorRampModifier):
     """Color based on the direction of the stroke"""
-    def shade(self, stroke):
-        it = Interface0DIterator(stroke)
-        for svert in it:
-            angle = angle_x_normal(it)
-            fac = self.evaluate(angle / pi)
-            a = svert.attribute.color
-            svert.attribute.color = self.blend_ramp(a, fac)
+    def stroke_values(self, data):
+        return [self.evaluate(angle / pi) for angle in data.tangent_angles()]
 
 
 class TangentAlphaShader(CurveMappingModifier):
     """Alpha transparency based on the direction of the stroke"""
-    def shade(self, stroke):
-        it = Interface0DIterator(stroke)
-        for svert in it:
-            angle = angle_x_normal(it)
-            fac = self.evaluate(angle / pi)
-            a = svert.attribute.alpha
-            svert.attribute.alpha = self.blend(a, fac)
+    def stroke_values(self, data):
+        return [self.evaluate(angle / pi) for angle in data.tangent_angles()]
 
 
 class TangentThicknessShader(ThicknessBlenderMixIn, CurveMappingModifier):
@@ -559,32 +856,38 @@ class TangentThicknessShader(ThicknessBlenderMixIn, CurveMappingModifier):
         CurveMappingModifier.__init__(self, blend, influence, mapping, invert, curve)
         self.thickness = BoundedProperty(thickness_min, thickness_max)
 
-    def shade(self, stroke):
-        it = Interface0DIterator(stroke)
-        for svert in it:
-            angle = angle_x_normal(it)
-            thickness = self.thickness.min + self.evaluate(angle / pi) * self.thickness.delta
-            self.blend_thickness(svert, thickness)
+    def stroke_values(self, data):
+        return [
+            self.thickness.min + self.evaluate(angle / pi) * self.thickness.delta
+            for angle in data.tangent_angles()
+        ]
 
 
 # - Noise Modifiers - #
 
 class NoiseShader:
     """Base class for noise shaders"""
+    # Shared by all noise shaders.
+    noise1 = Noise()
+    noise2 = Noise()
+
     def __init__(self, amplitude, period, seed=512):
         self.amplitude = amplitude
         self.scale = 1 / period / seed
         self.seed = seed
 
-    def noisegen(self, stroke, n1=Noise(), n2=Noise()):
-        """Produces two noise values per StrokeVertex for every vertex in the stroke"""
-        initU1 = stroke.length_2d * self.seed + n1.rand(512) * self.seed
-        initU2 = stroke.length_2d * self.seed + n2.rand() * self.seed
+    def noise_values(self, data):
+        """Produces two lists of noise values, with a value for every vertex in the stroke"""
+        n1, n2 = self.noise1, self.noise2
+        initU1 = data.stroke.length_2d * self.seed + n1.rand(512) * self.seed
+        initU2 = data.stroke.length_2d * self.seed + n2.rand() * self.seed
 
-        for svert in stroke:
-            a = n1.turbulence_smooth(self.scale * svert.curvilinear_abscissa + initU1, 2)
-            b = n2.turbulence_smooth(self.scale * svert.curvilinear_abscissa + initU2, 2)
-            yield (svert, a, b)
+        scale = self.scale
+        abscissas = data.curvilinear_abscissas()
+        return (
+            [n1.turbulence_smooth(scale * u + initU1, 2) for u in abscissas],
+            [n2.turbulence_smooth(scale * u + initU2, 2) for u in abscissas],
+        )
 
 
 class ThicknessNoiseShader(ThicknessBlenderMixIn, ScalarBlendModifier, NoiseShader):
@@ -595,12 +898,12 @@ class ThicknessNoiseShader(ThicknessBlenderMixIn, ScalarBlendModifier, NoiseShad
         NoiseShader.__init__(self, amplitude, period, seed)
         self.asymmetric = asymmetric
 
-    def shade(self, stroke):
-        for svert, noiseval1, noiseval2 in self.noisegen(stroke):
-            (r, l) = svert.attribute.thickness
-            l += noiseval1 * self.amplitude
-            r += noiseval2 * self.amplitude
-            self.blend_thickness(svert, (r, l), self.asymmetric)
+    def stroke_values(self, data):
+        amplitude = self.amplitude
+        return [
+            (r + noiseval2 * amplitude, l + noiseval1 * amplitude)
+            for (r, l), noiseval1, noiseval2 in zip(data.thicknesses_ensure(), *self.noise_values(data))
+        ]
 
 
 class ColorNoiseShader(ColorRampModifier, NoiseShader):
@@ -609,10 +912,11 @@ class ColorNoiseShader(ColorRampModifier, NoiseShader):
         ColorRampModifier.__init__(self, blend, influence, ramp)
         NoiseShader.__init__(self, amplitude, period, seed)
 
-    def shade(self, stroke):
-        for svert, noiseval1, noiseval2 in self.noisegen(stroke):
-            position = abs(noiseval1 + noiseval2)
-            svert.attribute.color = self.blend_ramp(svert.attribute.color, self.evaluate(position))
+    def stroke_values(self, data):
+        return [
+            self.evaluate(abs(noiseval1 + noiseval2))
+            for noiseval1, noiseval2 in zip(*self.noise_values(data))
+        ]
 
 
 class AlphaNoiseShader(CurveMappingModifier, NoiseShader):
@@ -621,10 +925,11 @@ class AlphaNoiseShader(CurveMappingModifier, NoiseShader):
         CurveMappingModifier.__init__(self, blend, influence, mapping, invert, curve)
         NoiseShader.__init__(self, amplitude, period, seed)
 
-    def shade(self, stroke, n1=Noise(), n2=Noise()):
-        for svert, noiseval1, noiseval2 in self.noisegen(stroke):
-            position = abs(noiseval1 + noiseval2)
-            svert.attribute.alpha = self.blend(svert.attribute.alpha, self.evaluate(position))
+    def stroke_values(self, data):
+        return [
+            self.evaluate(abs(noiseval1 + noiseval2))
+            for noiseval1, noiseval2 in zip(*self.noise_values(data))
+        ]
 
 
 # - Crease Angle Modifiers - #
@@ -646,13 +951,11 @@ class CreaseAngleColorShader(ColorRampModifier):
         # angles are (already) in radians
         self.angle = BoundedProperty(angle_min, angle_max)
 
-    def shade(self, stroke):
-        for svert in stroke:
-            angle = crease_angle(svert)
-            if angle is None:
-                continue
-            t = self.angle.interpolate(angle)
-            svert.attribute.color = self.blend_ramp(svert.attribute.color, self.evaluate(t))
+    def stroke_values(self, data):
+        return [
+            None if angle is None else self.evaluate(self.angle.interpolate(angle))
+            for angle in data.crease_angles()
+        ]
 
 
 class CreaseAngleAlphaShader(CurveMappingModifier):
@@ -662,13 +965,11 @@ class CreaseAngleAlphaShader(CurveMappingModifier):
         # angles are (already) in radians
         self.angle = BoundedProperty(angle_min, angle_max)
 
-    def shade(self, stroke):
-        for svert in stroke:
-            angle = crease_angle(svert)
-            if angle is None:
-                continue
-            t = self.angle.interpolate(angle)
-            svert.attribute.alpha = self.blend(svert.attribute.alpha, self.evaluate(t))
+    def stroke_values(self, data):
+        return [
+            None if angle is None else self.evaluate(self.angle.interpolate(angle))
+            for angle in data.crease_angles()
+        ]
 
 
 class CreaseAngleThicknessShader(ThicknessBlenderMixIn, CurveMappingModifier):
@@ -681,30 +982,28 @@ class CreaseAngleThicknessShader(ThicknessBlenderMixIn, CurveMappingModifier):
         self.angle = BoundedProperty(angle_min, angle_max)
         self.thickness = BoundedProperty(thickness_min, thickness_max)
 
-    def shade(self, stroke):
-        for svert in stroke:
-            angle = crease_angle(svert)
-            if angle is None:
-                continue
-            t = self.angle.interpolate(angle)
-            thickness = self.thickness.min + self.evaluate(t) * self.thickness.delta
-            self.blend_thickness(svert, thickness)
+    def stroke_values(self, data):
+        return [
+            None if angle is None else
+            self.thickness.min + self.evaluate(self.angle.interpolate(angle)) * self.thickness.delta
+            for angle in data.crease_angles()
+        ]
 
 
 # - Curvature3D Modifiers - #
 
-def normalized_absolute_curvature(svert, bounded_curvature):
+def normalized_absolute_curvatures(data, bounded_curvature):
     """
-    Gives the absolute curvature in range [0, 1].
+    Gives the absolute curvature in range [0, 1] for each vertex of the stroke.
 
     The actual curvature (Kr) value can be anywhere in the range [-inf, inf], where convex curvature
     yields a positive value, and concave a negative one. These shaders only look for the magnitude
     of the 3D curvature, hence the abs()
     """
-    curvature = curvature_from_stroke_vertex(svert)
-    if curvature is None:
-        return 0.0
-    return bounded_curvature.interpolate(abs(curvature))
+    return [
+        0.0 if curvature is None else bounded_curvature.interpolate(abs(curvature))
+        for curvature in data.curvatures()
+    ]
 
 
 class Curvature3DColorShader(ColorRampModifier):
@@ -713,12 +1012,8 @@ class Curvature3DColorShader(ColorRampModifier):
         ColorRampModifier.__init__(self, blend, influence, ramp)
         self.curvature = BoundedProperty(curvature_min, curvature_max)
 
-    def shade(self, stroke):
-        for svert in stroke:
-            t = normalized_absolute_curvature(svert, self.curvature)
-            a = svert.attribute.color
-            b = self.evaluate(t)
-            svert.attribute.color = self.blend_ramp(a, b)
+    def stroke_values(self, data):
+        return [self.evaluate(t) for t in normalized_absolute_curvatures(data, self.curvature)]
 
 
 class Curvature3DAlphaShader(CurveMappingModifier):
@@ -727,12 +1022,8 @@ class Curvature3DAlphaShader(CurveMappingModifier):
         CurveMappingModifier.__init__(self, blend, influence, mapping, invert, curve)
         self.curvature = BoundedProperty(curvature_min, curvature_max)
 
-    def shade(self, stroke):
-        for svert in stroke:
-            t = normalized_absolute_curvature(svert, self.curvature)
-            a = svert.attribute.alpha
-            b = self.evaluate(t)
-            svert.attribute.alpha = self.blend(a, b)
+    def stroke_values(self, data):
+        return [self.evaluate(t) for t in normalized_absolute_curvatures(data, self.curvature)]
 
 
 class Curvature3DThicknessShader(ThicknessBlenderMixIn, CurveMappingModifier):
@@ -744,12 +1035,11 @@ class Curvature3DThicknessShader(ThicknessBlenderMixIn, CurveMappingModifier):
         self.curvature = BoundedProperty(curvature_min, curvature_max)
         self.thickness = BoundedProperty(thickness_min, thickness_max)
 
-
-    def shade(self, stroke):
-        for svert in stroke:
-            t = normalized_absolute_curvature(svert, self.curvature)
-            thickness = self.thickness.min + self.evaluate(t) * self.thickness.delta
-            self.blend_thickness(svert, thickness)
+    def stroke_values(self, data):
+        return [
+            self.thickness.min + self.evaluate(t) * self.thickness.delta
+            for t in normalized_absolute_curvatures(data, self.curvature)
+        ]
 
 
 # Geometry modifiers
@@ -761,15 +1051,7 @@ class SimplificationShader(StrokeShader):
         self.tolerance = tolerance
 
     def shade(self, stroke):
-        points = tuple(svert.point for svert in stroke)
-        points_simplified = simplify(points, tolerance=self.tolerance)
-
-        it = iter(stroke)
-        for svert, point in zip(it, points_simplified):
-            svert.point = point
-
-        for svert in tuple(it):
-            stroke.remove_vertex(svert)
+        simplify_stroke(stroke, self.tolerance)
 
 
 class SinusDisplacementShader(StrokeShader):
@@ -1195,6 +1477,110 @@ def get_grouped_objects(group):
             yield ob
 
 
+class ProfileShader(StrokeShader):
+    """Times a stroke shader, see LinesetProfile."""
+    def __init__(self, shader, timing):
+        StrokeShader.__init__(self)
+        self.shader = shader
+        # [seconds, strokes]
+        self.timing = timing
+
+    def shade(self, stroke):
+        t = time.perf_counter()
+        self.shader.shade(stroke)
+        timing = self.timing
+        timing[0] += time.perf_counter() - t
+        timing[1] += 1
+
+
+class LinesetProfile:
+    """Timings and counts of the stages of process() for a line set."""
+    def __init__(self, scene, layer_name, lineset_name):
+        self.frame = scene.frame_current
+        self.layer_name = layer_name
+        self.lineset_name = lineset_name
+        # (stage name, seconds) pairs.
+        self.stages = []
+        # (shader name, [seconds, strokes]) pairs.
+        self.shaders = []
+        self.counts = {}
+        self._time = time.perf_counter()
+
+    def stage(self, name):
+        """Ends a stage, timed from the end of the previous one."""
+        t = time.perf_counter()
+        self.stages.append((name, t - self._time))
+        self._time = t
+
+    def shaders_wrap(self, shaders_list):
+        """Returns the shaders wrapped to time them."""
+        shaders_list_wrap = []
+        for shader in shaders_list:
+            timing = [0.0, 0]
+            self.shaders.append((type(shader).__name__, timing))
+            shaders_list_wrap.append(ProfileShader(shader, timing))
+            if isinstance(shader, BatchedModifiersShader):
+                shader.timings = [[0.0, 0] for _ in shader.modifiers]
+                self.shaders.extend(
+                    (type(shader).__name__ + "/" + type(modifier).__name__, timing)
+                    for modifier, timing in zip(shader.modifiers, shader.timings)
+                )
+        return shaders_list_wrap
+
+    def as_dict(self):
+        return {
+            "frame": self.frame,
+            "layer": self.layer_name,
+            "lineset": self.lineset_name,
+            "time": sum(seconds for name, seconds in self.stages),
+            "stages": {name: seconds for name, seconds in self.stages},
+            "shaders": [
+                {"name": name, "time": seconds, "strokes": strokes}
+                for name, (seconds, strokes) in self.shaders
+            ],
+            "counts": self.counts,
+        }
+
+    def report(self):
+        print("Freestyle: line set %r (view layer %r, frame %d): %.4f sec" % (
+            self.lineset_name, self.layer_name, self.frame,
+            sum(seconds for name, seconds in self.stages)))
+        for name, seconds in self.stages:
+            print("  %-20s %.4f" % (name, seconds))
+        for name, (seconds, strokes) in self.shaders:
+            print("    %-30s %.4f (%d strokes)" % (name, seconds, strokes))
+        for name, count in self.counts.items():
+            print("  %-20s %d" % (name, count))
+
+
+# (frame, [profile dictionaries]) for the frame being rendered.
+_profile_frame = None
+
+
+@bpy.app.handlers.persistent
+def _profile_frame_clear(*_args):
+    global _profile_frame
+    _profile_frame = None
+
+
+# Rendering a frame again replaces its profiles.
+bpy.app.handlers.render_pre.append(_profile_frame_clear)
+
+
+def profile_write(profile):
+    """Write the profiles of all line sets rendered for the frame to 'profile_filepath'."""
+    import json
+    global _profile_frame
+
+    if _profile_frame is None or _profile_frame[0] != profile.frame:
+        _profile_frame = (profile.frame, [])
+    _profile_frame[1].append(profile.as_dict())
+
+    filepath = bpy.path.abspath(profile_filepath.replace("#", "%.4d" % profile.frame))
+    with open(filepath, "w", encoding="utf-8") as fh:
+        json.dump(_profile_frame[1], fh, indent=2)
+
+
 integration_types = {
     'MEAN': IntegrationType.MEAN,
     'MIN': IntegrationType.MIN,
@@ -1210,10 +1596,15 @@ def process(layer_name, lineset_name):
     lineset = layer.freestyle_settings.linesets[lineset_name]
     linestyle = lineset.linestyle
 
+    profile = LinesetProfile(scene, layer_name, lineset_name) if use_profile else None
+
     # execute line set pre-processing callback functions
     for fn in callbacks_lineset_pre:
         fn(scene, layer, lineset)
 
+    if profile is not None:
+        profile.stage("callbacks_pre")
+
     selection_criteria = []
     # prepare selection criteria by visibility
     if lineset.select_by_visibility:
@@ -1290,6 +1681,9 @@ def process(layer_name, lineset_name):
     else:
         upred = TrueUP1D()
     Operators.select(upred)
+    if profile is not None:
+        profile.stage("selection")
+        profile.counts["view_edges"] = Operators.get_view_edges_size()
     # join feature edges to form chains
     if linestyle.use_chaining:
         if linestyle.chaining == 'PLAIN':
@@ -1304,6 +1698,9 @@ def process(layer_name, lineset_name):
                 Operators.bidirectional_chain(pySketchyChainingIterator(linestyle.rounds))
     else:
         Operators.chain(ChainPredicateIterator(FalseUP1D(), FalseBP1D()), NotUP1D(upred))
+    if profile is not None:
+        profile.stage("chaining")
+        profile.counts["chains"] = Operators.get_chains_size()
     # split chains
     if linestyle.material_boundary:
         Operators.sequential_split(MaterialBoundaryUP0D())
@@ -1330,6 +1727,9 @@ def process(layer_name, lineset_name):
             Operators.sequential_split(SplitPatternStartingUP0D(controller),
                                        SplitPatternStoppingUP0D(controller),
                                        sampling)
+    if profile is not None:
+        profile.stage("splitting")
+        profile.counts["chains_split"] = Operators.get_chains_size()
     # sort selected chains
     if linestyle.use_sorting:
         integration = integration_types.get(linestyle.integration_type, IntegrationType.MEAN)
@@ -1344,6 +1744,8 @@ def process(layer_name, lineset_name):
         if linestyle.sort_order == 'REVERSE':
             bpred = NotBP1D(bpred)
         Operators.sort(bpred)
+    if profile is not None:
+        profile.stage("sorting")
     # select chains
     if linestyle.use_length_min or linestyle.use_length_max:
         length_min = linestyle.length_min if linestyle.use_length_min else None
@@ -1351,6 +1753,9 @@ def process(layer_name, lineset_name):
         Operators.select(LengthThresholdUP1D(length_min, length_max))
     if linestyle.use_chain_count:
         Operators.select(pyNFirstUP1D(linestyle.chain_count))
+    if profile is not None:
+        profile.stage("chain_selection")
+        profile.counts["chains_selected"] = Operators.get_chains_size()
     # prepare a list of stroke shaders
     shaders_list = []
     for m in linestyle.geometry_modifiers:
@@ -1414,128 +1819,133 @@ def process(layer_name, lineset_name):
             print("Warning: Thickness position options are applied when chaining is disabled\n"
                   "         or the Plain chaining is used with the Same Object option enabled.")
     shaders_list.append(ConstantColorShader(*(linestyle.color), alpha=linestyle.alpha))
-    shaders_list.append(BaseThicknessShader(linestyle.thickness, thickness_position,
-                                            linestyle.thickness_ratio))
     # -- Modifiers -- #
+    modifiers_list = []
+    modifiers_list.append(BaseThicknessShader(linestyle.thickness, thickness_position,
+                                              linestyle.thickness_ratio))
     for m in linestyle.color_modifiers:
         if not m.use:
             continue
         if m.type == 'ALONG_STROKE':
-            shaders_list.append(ColorAlongStrokeShader(
+            modifiers_list.append(ColorAlongStrokeShader(
                 m.blend, m.influence, m.color_ramp))
         elif m.type == 'DISTANCE_FROM_CAMERA':
-            shaders_list.append(ColorDistanceFromCameraShader(
+            modifiers_list.append(ColorDistanceFromCameraShader(
                 m.blend, m.influence, m.color_ramp,
                 m.range_min, m.range_max))
         elif m.type == 'DISTANCE_FROM_OBJECT':
             if m.target is not None:
-                shaders_list.append(ColorDistanceFromObjectShader(
+                modifiers_list.append(ColorDistanceFromObjectShader(
                     m.blend, m.influence, m.color_ramp, m.target,
                     m.range_min, m.range_max))
         elif m.type == 'MATERIAL':
-            shaders_list.append(ColorMaterialShader(
+            modifiers_list.append(ColorMaterialShader(
                 m.blend, m.influence, m.color_ramp, m.material_attribute,
                 m.use_ramp))
         elif m.type == 'TANGENT':
-            shaders_list.append(TangentColorShader(
+            modifiers_list.append(TangentColorShader(
                 m.blend, m.influence, m.color_ramp))
         elif m.type == 'CREASE_ANGLE':
-            shaders_list.append(CreaseAngleColorShader(
+            modifiers_list.append(CreaseAngleColorShader(
                 m.blend, m.influence, m.color_ramp,
                 m.angle_min, m.angle_max))
         elif m.type == 'CURVATURE_3D':
-            shaders_list.append(Curvature3DColorShader(
+            modifiers_list.append(Curvature3DColorShader(
                 m.blend, m.influence, m.color_ramp,
                 m.curvature_min, m.curvature_max))
         elif m.type == 'NOISE':
-            shaders_list.append(ColorNoiseShader(
+            modifiers_list.append(ColorNoiseShader(
                 m.blend, m.influence, m.color_ramp,
                 m.amplitude, m.period, m.seed))
     for m in linestyle.alpha_modifiers:
         if not m.use:
             continue
         if m.type == 'ALONG_STROKE':
-            shaders_list.append(AlphaAlongStrokeShader(
+            modifiers_list.append(AlphaAlongStrokeShader(
                 m.blend, m.influence, m.mapping, m.invert, m.curve))
         elif m.type == 'DISTANCE_FROM_CAMERA':
-            shaders_list.append(AlphaDistanceFromCameraShader(
+            modifiers_list.append(AlphaDistanceFromCameraShader(
                 m.blend, m.influence, m.mapping, m.invert, m.curve,
                 m.range_min, m.range_max))
         elif m.type == 'DISTANCE_FROM_OBJECT':
             if m.target is not None:
-                shaders_list.append(AlphaDistanceFromObjectShader(
+                modifiers_list.append(AlphaDistanceFromObjectShader(
                     m.blend, m.influence, m.mapping, m.invert, m.curve, m.target,
                     m.range_min, m.range_max))
         elif m.type == 'MATERIAL':
-            shaders_list.append(AlphaMaterialShader(
+            modifiers_list.append(AlphaMaterialShader(
                 m.blend, m.influence, m.mapping, m.invert, m.curve,
                 m.material_attribute))
         elif m.type == 'TANGENT':
-            shaders_list.append(TangentAlphaShader(
+            modifiers_list.append(TangentAlphaShader(
                 m.blend, m.influence, m.mapping, m.invert, m.curve,))
         elif m.type == 'CREASE_ANGLE':
-            shaders_list.append(CreaseAngleAlphaShader(
+            modifiers_list.append(CreaseAngleAlphaShader(
                 m.blend, m.influence, m.mapping, m.invert, m.curve,
                 m.angle_min, m.angle_max))
         elif m.type == 'CURVATURE_3D':
-            shaders_list.append(Curvature3DAlphaShader(
+            modifiers_list.append(Curvature3DAlphaShader(
                 m.blend, m.influence, m.mapping, m.invert, m.curve,
                 m.curvature_min, m.curvature_max))
         elif m.type == 'NOISE':
-            shaders_list.append(AlphaNoiseShader(
+            modifiers_list.append(AlphaNoiseShader(
                 m.blend, m.influence, m.mapping, m.invert, m.curve,
                 m.amplitude, m.period, m.seed))
     for m in linestyle.thickness_modifiers:
         if not m.use:
             continue
         if m.type == 'ALONG_STROKE':
-            shaders_list.append(ThicknessAlongStrokeShader(
+            modifiers_list.append(ThicknessAlongStrokeShader(
                 thickness_position, linestyle.thickness_ratio,
                 m.blend, m.influence, m.mapping, m.invert, m.curve,
                 m.value_min, m.value_max))
         elif m.type == 'DISTANCE_FROM_CAMERA':
-            shaders_list.append(ThicknessDistanceFromCameraShader(
+            modifiers_list.append(ThicknessDistanceFromCameraShader(
                 thickness_position, linestyle.thickness_ratio,
                 m.blend, m.influence, m.mapping, m.invert, m.curve,
                 m.range_min, m.range_max, m.value_min, m.value_max))
         elif m.type == 'DISTANCE_FROM_OBJECT':
             if m.target is not None:
-                shaders_list.append(ThicknessDistanceFromObjectShader(
+                modifiers_list.append(ThicknessDistanceFromObjectShader(
                     thickness_position, linestyle.thickness_ratio,
                     m.blend, m.influence, m.mapping, m.invert, m.curve, m.target,
                     m.range_min, m.range_max, m.value_min, m.value_max))
         elif m.type == 'MATERIAL':
-            shaders_list.append(ThicknessMaterialShader(
+            modifiers_list.append(ThicknessMaterialShader(
                 thickness_position, linestyle.thickness_ratio,
                 m.blend, m.influence, m.mapping, m.invert, m.curve,
                 m.material_attribute, m.value_min, m.value_max))
         elif m.type == 'CALLIGRAPHY':
-            shaders_list.append(CalligraphicThicknessShader(
+            modifiers_list.append(CalligraphicThicknessShader(
                 thickness_position, linestyle.thickness_ratio,
                 m.blend, m.influence,
                 m.orientation, m.thickness_min, m.thickness_max))
         elif m.type == 'TANGENT':
-            shaders_list.append(TangentThicknessShader(
+            modifiers_list.append(TangentThicknessShader(
                 thickness_position, linestyle.thickness_ratio,
                 m.blend, m.influence, m.mapping, m.invert, m.curve,
                 m.thickness_min, m.thickness_max))
         elif m.type == 'NOISE':
-            shaders_list.append(ThicknessNoiseShader(
+            modifiers_list.append(ThicknessNoiseShader(
                 thickness_position, linestyle.thickness_ratio,
                 m.blend, m.influence,
                 m.amplitude, m.period, m.seed, m.use_asymmetric))
         elif m.type == 'CREASE_ANGLE':
-            shaders_list.append(CreaseAngleThicknessShader(
+            modifiers_list.append(CreaseAngleThicknessShader(
                 thickness_position, linestyle.thickness_ratio,
                 m.blend, m.influence, m.mapping, m.invert, m.curve,
                 m.angle_min, m.angle_max, m.thickness_min, m.thickness_max))
         elif m.type == 'CURVATURE_3D':
-            shaders_list.append(Curvature3DThicknessShader(
+            modifiers_list.append(Curvature3DThicknessShader(
                 thickness_position, linestyle.thickness_ratio,
                 m.blend, m.influence, m.mapping, m.invert, m.curve,
                 m.curvature_min, m.curvature_max, m.thickness_min, m.thickness_max))
         else:
             raise RuntimeError("No Thickness modifier with type", type(m), m)
+    if use_batched_modifiers:
+        shaders_list.append(BatchedModifiersShader(modifiers_list))
+    else:
+        shaders_list.extend(modifiers_list)
     # -- Textures -- #
     has_tex = False
     if linestyle.use_nodes and linestyle.node_tree:
@@ -1560,9 +1970,27 @@ def process(layer_name, lineset_name):
         if len(pattern) > 0:
             shaders_list.append(DashedLineShader(pattern))
 
+    if profile is not None:
+        profile.stage("shaders_setup")
+        shaders_list = profile.shaders_wrap(shaders_list)
+        strokes_num_prev = Operators.get_strokes_size()
+
     # create strokes using the shaders list
     Operators.create(TrueUP1D(), shaders_list)
 
+    if profile is not None:
+        profile.stage("stroke_creation")
+
     # execute line set post-processing callback functions
     for fn in callbacks_lineset_post:
         fn(scene, layer, lineset)
+
+    if profile is not None:
+        profile.stage("callbacks_post")
+        strokes_num = Operators.get_strokes_size()
+        profile.counts["strokes"] = strokes_num - strokes_num_prev
+        profile.counts["stroke_vertices"] = sum(
+            len(Operators.get_stroke_from_index(i)) for i in range(strokes_num_prev, strokes_num))
+        profile.report()
+        if profile_filepath:
+            profile_write(profile)
@@ -58,105 +58,270 @@ def paths():
     return addon_paths
 
 
-def modules_refresh(module_cache=addons_fake_modules):
+def _bl_info_read(mod_path, speedy=True):
+    """
+    Read the ``bl_info`` dictionary from an addon file without running it.
+
+    :return: The ``bl_info`` or None when it can't be read.
+    :rtype: dict
+    """
     global error_encoding
+    import ast
+
+    try:
+        file_mod = open(mod_path, "r", encoding='UTF-8')
+    except OSError as ex:
+        print("Error opening file:", mod_path, ex)
+        return None
+
+    with file_mod:
+        if speedy:
+            lines = []
+            line_iter = iter(file_mod)
+            l = ""
+            while not l.startswith("bl_info"):
+                try:
+                    l = line_iter.readline()
+                except UnicodeDecodeError as ex:
+                    if not error_encoding:
+                        error_encoding = True
+                        print("Error reading file as UTF-8:", mod_path, ex)
+                    return None
+
+                if len(l) == 0:
+                    break
+            while l.rstrip():
+                lines.append(l)
+                try:
+                    l = line_iter.readline()
+                except UnicodeDecodeError as ex:
+                    if not error_encoding:
+                        error_encoding = True
+                        print("Error reading file as UTF-8:", mod_path, ex)
+                    return None
+
+            data = "".join(lines)
+
+        else:
+            data = file_mod.read()
+    del file_mod
+
+    try:
+        ast_data = ast.parse(data, filename=mod_path)
+    except:
+        print("Syntax error 'ast.parse' can't read:", repr(mod_path))
+        import traceback
+        traceback.print_exc()
+        ast_data = None
+
+    body_info = None
+
+    if ast_data:
+        for body in ast_data.body:
+            if body.__class__ == ast.Assign:
+                if len(body.targets) == 1:
+                    if getattr(body.targets[0], "id", "") == "bl_info":
+                        body_info = body
+                        break
+
+    if body_info:
+        try:
+            return ast.literal_eval(body_info.value)
+        except:
+            print("AST error parsing bl_info for:", repr(mod_path))
+            import traceback
+            traceback.print_exc()
+            raise
+    else:
+        print(
+            "fake_module: addon missing 'bl_info' "
+            "gives bad performance!:",
+            repr(mod_path),
+        )
+        return None
+
+
+# -----------------------------------------------------------------------------
+# Persistent 'bl_info' Cache
+#
+# Store the 'bl_info' of each addon file between sessions,
+# keyed by the file path, only reading files which have been modified.
+# Maps: path -> (mtime, size, bl_info)
+
+_bl_info_cache = None
+_bl_info_cache_is_dirty = False
+_bl_info_cache_version = 1
+_bl_info_cache_filename = "addons_bl_info_cache.pickle"
+
+
+def _bl_info_cache_filepath(create=False):
     import os
+    # Only create the configuration directory when writing the cache.
+    path = _bpy.utils.user_resource('CONFIG', create=create)
+    if not path:
+        return None
+    return os.path.join(path, _bl_info_cache_filename)
+
+
+def _bl_info_cache_load():
+    global _bl_info_cache
+    if _bl_info_cache is not None:
+        return _bl_info_cache
+
+    _bl_info_cache = {}
+    filepath = _bl_info_cache_filepath()
+    if filepath is None:
+        return _bl_info_cache
+
+    import pickle
+    try:
+        with open(filepath, "rb") as fh:
+            version, cache = pickle.load(fh)
+    except FileNotFoundError:
+        return _bl_info_cache
+    except Exception as ex:
+        print("Error reading addon cache:", repr(filepath), ex)
+        return _bl_info_cache
+
+    if version == _bl_info_cache_version:
+        _bl_info_cache = cache
+    return _bl_info_cache
+
+
+def _bl_info_cache_save():
+    global _bl_info_cache_is_dirty
+    if not _bl_info_cache_is_dirty:
+        return
+    _bl_info_cache_is_dirty = False
+
+    filepath = _bl_info_cache_filepath(create=True)
+    if filepath is None:
+        return
+
+    import os
+    import pickle
+    filepath_tmp = filepath + ".tmp"
+    try:
+        with open(filepath_tmp, "wb") as fh:
+            pickle.dump((_bl_info_cache_version, _bl_info_cache), fh)
+        os.replace(filepath_tmp, filepath)
+    except OSError as ex:
+        print("Error writing addon cache:", repr(filepath), ex)
+
+
+def _bl_info_cache_lookup(mod_path):
+    """
+    :return: The cached (bl_info, mtime) pair, or None when out of date.
+    :rtype: tuple
+    """
+    import os
+    try:
+        st = os.stat(mod_path)
+    except OSError:
+        return None
+    item = _bl_info_cache.get(mod_path)
+    if item is not None:
+        mtime, size, bl_info = item
+        if mtime == st.st_mtime and size == st.st_size:
+            return bl_info, mtime
+    return None
+
+
+def _bl_info_cache_update(mod_path):
+    """
+    Read the ``bl_info`` of *mod_path*, storing it in the cache.
+    Thread safe, as only a single item is assigned.
+
+    Files without a valid ``bl_info`` are stored too (as None),
+    so they're not read again until they change.
+
+    :return: The (bl_info, mtime) pair, or None when the file can't be found.
+    :rtype: tuple
+    """
+    global _bl_info_cache_is_dirty
+    import os
+    try:
+        st = os.stat(mod_path)
+    except OSError as ex:
+        print("Error opening file:", mod_path, ex)
+        return None
+
+    bl_info = _bl_info_read(mod_path)
+    _bl_info_cache[mod_path] = (st.st_mtime, st.st_size, bl_info)
+    _bl_info_cache_is_dirty = True
+    return bl_info, st.st_mtime
+
+
+def _bl_info_cache_ensure(mod_paths, use_threads):
+    """
+    Update the cache for all out of date *mod_paths*,
+    reading them in parallel when *use_threads* is enabled.
+
+    :return: The number of files read.
+    :rtype: int
+    """
+    mod_paths_update = [
+        mod_path for mod_path in mod_paths
+        if _bl_info_cache_lookup(mod_path) is None
+    ]
+    if use_threads and len(mod_paths_update) > 1:
+        import os
+        from concurrent.futures import ThreadPoolExecutor
+        # Reading is mostly I/O bound (especially on network drives).
+        max_workers = min(32, (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for _ in executor.map(_bl_info_cache_update, mod_paths_update):
+                pass
+    else:
+        for mod_path in mod_paths_update:
+            _bl_info_cache_update(mod_path)
+    return len(mod_paths_update)
+
+
+def modules_refresh(module_cache=addons_fake_modules, *, use_threads=True):
+    global error_encoding
+    import os
+
+    use_time = _bpy.app.debug_python
+    if use_time:
+        import time
+        time_start = time.time()
 
     error_encoding = False
     error_duplicates.clear()
 
     path_list = paths()
 
-    # fake module importing
-    def fake_module(mod_name, mod_path, speedy=True, force_support=None):
-        global error_encoding
+    _bl_info_cache_load()
 
+    # fake module importing
+    def fake_module(mod_name, mod_path, force_support=None):
         if _bpy.app.debug_python:
             print("fake_module", mod_path, mod_name)
         import ast
         ModuleType = type(ast)
-        try:
-            file_mod = open(mod_path, "r", encoding='UTF-8')
-        except OSError as ex:
-            print("Error opening file:", mod_path, ex)
-            return None
-
-        with file_mod:
-            if speedy:
-                lines = []
-                line_iter = iter(file_mod)
-                l = ""
-                while not l.startswith("bl_info"):
-                    try:
-                        l = line_iter.readline()
-                    except UnicodeDecodeError as ex:
-                        if not error_encoding:
-                            error_encoding = True
-                            print("Error reading file as UTF-8:", mod_path, ex)
-                        return None
-
-                    if len(l) == 0:
-                        break
-                while l.rstrip():
-                    lines.append(l)
-                    try:
-                        l = line_iter.readline()
-                    except UnicodeDecodeError as ex:
-                        if not error_encoding:
-                            error_encoding = True
-                            print("Error reading file as UTF-8:", mod_path, ex)
-                        return None
-
-                data = "".join(lines)
-
-            else:
-                data = file_mod.read()
-        del file_mod
-
-        try:
-            ast_data = ast.parse(data, filename=mod_path)
-        except:
-            print("Syntax error 'ast.parse' can't read:", repr(mod_path))
-            import traceback
-            traceback.print_exc()
-            ast_data = None
 
-        body_info = None
+        item = _bl_info_cache_lookup(mod_path)
+        if item is None:
+            item = _bl_info_cache_update(mod_path)
+            if item is None:
+                return None
+        bl_info, mtime = item
+        if bl_info is None:
+            return None
 
-        if ast_data:
-            for body in ast_data.body:
-                if body.__class__ == ast.Assign:
-                    if len(body.targets) == 1:
-                        if getattr(body.targets[0], "id", "") == "bl_info":
-                            body_info = body
-                            break
+        mod = ModuleType(mod_name)
+        # Copy, as the 'bl_info' is modified once loaded (see 'module_bl_info').
+        mod.bl_info = dict(bl_info)
+        mod.__file__ = mod_path
+        mod.__time__ = mtime
 
-        if body_info:
-            try:
-                mod = ModuleType(mod_name)
-                mod.bl_info = ast.literal_eval(body.value)
-                mod.__file__ = mod_path
-                mod.__time__ = os.path.getmtime(mod_path)
-            except:
-                print("AST error parsing bl_info for:", mod_name)
-                import traceback
-                traceback.print_exc()
-                raise
-
-            if force_support is not None:
-                mod.bl_info["support"] = force_support
-
-            return mod
-        else:
-            print(
-                "fake_module: addon missing 'bl_info' "
-                "gives bad performance!:",
-                repr(mod_path),
-            )
-            return None
+        if force_support is not None:
+            mod.bl_info["support"] = force_support
 
-    modules_stale = set(module_cache.keys())
+        return mod
 
+    path_module_names = []
     for path in path_list:
 
         # force all contrib addons to be 'TESTING'
@@ -165,7 +330,26 @@ def modules_refresh(module_cache=addons_fake_modules):
         else:
             force_support = None
 
-        for mod_name, mod_path in _bpy.path.module_names(path):
+        path_module_names.append(
+            (force_support, _bpy.path.module_names(path))
+        )
+
+    # Read all modules not found in the 'module_cache' up-front,
+    # so they can be read in parallel.
+    mod_paths_read_num = _bl_info_cache_ensure(
+        [
+            mod_path
+            for _force_support, module_names in path_module_names
+            for mod_name, mod_path in module_names
+            if mod_name not in module_cache
+        ],
+        use_threads,
+    )
+
+    modules_stale = set(module_cache.keys())
+
+    for force_support, module_names in path_module_names:
+        for mod_name, mod_path in module_names:
             modules_stale.discard(mod_name)
             mod = module_cache.get(mod_name)
             if mod:
@@ -202,6 +386,17 @@ def modules_refresh(module_cache=addons_fake_modules):
         del module_cache[mod_stale]
     del modules_stale
 
+    _bl_info_cache_save()
+
+    if use_time:
+        print(
+            "addon_utils.modules_refresh: %d addons, %d read in %.4f sec" % (
+                len(module_cache),
+                mod_paths_read_num,
+                time.time() - time_start,
+            )
+        )
+
 
 def modules(module_cache=addons_fake_modules, *, refresh=True):
     if refresh or ((module_cache is addons_fake_modules) and modules._is_first):
@@ -294,6 +489,11 @@ def enable(module_name, *, default_set=False, persistent=False, handle_error=Non
     import sys
     from bpy_restrict_state import RestrictBlend
 
+    use_profile = _bpy.app.debug_python_profile
+    if use_profile:
+        import time
+        from bpy.utils import _profile_report
+
     if handle_error is None:
         def handle_error(_ex):
             import traceback
@@ -347,6 +547,8 @@ def enable(module_name, *, default_set=False, persistent=False, handle_error=Non
     with RestrictBlend():
 
         # 1) try import
+        if use_profile:
+            t_profile = time.perf_counter()
         try:
             mod = __import__(module_name)
             mod.__time__ = os.path.getmtime(mod.__file__)
@@ -362,6 +564,9 @@ def enable(module_name, *, default_set=False, persistent=False, handle_error=Non
                 _addon_remove(module_name)
             return None
 
+        if use_profile:
+            _profile_report("import", module_name, t_profile)
+
         # 1.1) Fail when add-on is too old.
         # This is a temporary 2.8x migration check, so we can manage addons that are supported.
 
@@ -378,6 +583,8 @@ def enable(module_name, *, default_set=False, persistent=False, handle_error=Non
         _bl_owner_id_set(module_name)
 
         # 3) Try run the modules register function.
+        if use_profile:
+            t_profile = time.perf_counter()
         try:
             mod.register()
         except Exception as ex:
@@ -393,6 +600,9 @@ def enable(module_name, *, default_set=False, persistent=False, handle_error=Non
         finally:
             _bl_owner_id_set(owner_id_prev)
 
+        if use_profile:
+            _profile_report("register", module_name, t_profile)
+
     # * OK loaded successfully! *
     mod.__addon_enabled__ = True
     mod.__addon_persistent__ = persistent
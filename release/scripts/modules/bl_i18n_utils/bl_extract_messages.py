@@ -22,10 +22,16 @@
 # XXX: This script is meant to be used from inside Blender!
 #      You should not directly use this script, rather use update_msg.py!
 
+import bisect
 import collections
+import concurrent.futures
 import copy
 import datetime
+import functools
+import hashlib
+import itertools
 import os
+import pickle
 import re
 import sys
 
@@ -718,6 +724,75 @@ def dump_py_messages(msgs, reports, addons, settings, addons_only=False):
 
 
 ##### C source code #####
+_src_keyword_re = re.compile(r"([A-Za-z_][A-Za-z_0-9]*)\\\(")
+
+
+@functools.lru_cache(maxsize=None)
+def src_keywords_scanner(keywords):
+    """
+    Return a regex finding calls to the functions matched by given keywords' regexes (PYGETTEXT_KEYWORDS),
+    a mapping of each function name to the other ones it ends with (like 'IFACE_' for 'CTX_IFACE_', calls to those
+    being overlapped), and the function name of each keyword regex (None if it does not start with a function name).
+    """
+    names = []
+    for keyword in keywords:
+        m = _src_keyword_re.match(keyword)
+        names.append(m.group(1) if m else None)
+    # Longest names first, so that a name is never shadowed by one of its prefixes.
+    names_unique = sorted({name for name in names if name}, key=lambda name: (-len(name), name))
+    suffixes = {name: tuple(n for n in names_unique if n != name and name.endswith(n)) for name in names_unique}
+    return re.compile(r"(" + "|".join(names_unique) + r")\("), suffixes, names
+
+
+def extract_src_file_messages(path, keywords, max_multi_ctxt):
+    """
+    Return a list of raw (msgctxts, msgid, line) messages found in given C/C++ source file by keywords' regexes
+    (PYGETTEXT_KEYWORDS), in the same order as when searching the whole file with each regex in turn.
+    msgctxts is a tuple of raw contexts (a message being generated for each of them).
+    """
+    with open(path) as f:
+        data = f.read()
+    # Checking each keyword regex only where a call to its function starts is much quicker than searching for it
+    # in the whole file (and lets us skip most files, which have no translated messages at all).
+    scanner, suffixes, names = src_keywords_scanner(keywords)
+    calls = {}
+    for m in scanner.finditer(data):
+        name = m.group(1)
+        calls.setdefault(name, []).append(m.start())
+        for suffix in suffixes[name]:
+            calls.setdefault(suffix, []).append(m.end(1) - len(suffix))
+
+    messages = []
+    lines = None
+    for keyword, name in zip(keywords, names):
+        regex = re.compile(keyword)
+        if name is None:
+            matches = regex.finditer(data)
+        else:
+            matches = []
+            end = 0
+            for start in calls.get(name, ()):
+                if start >= end:
+                    m = regex.match(data, start)
+                    if m:
+                        matches.append(m)
+                        end = m.end()
+        for m in matches:
+            if lines is None:
+                # Offset of the start of each line (but the first one), to get the line of a match
+                # with a binary search.
+                lines = tuple(itertools.accumulate(len(line) + 1 for line in data.split("\n")))
+            d = m.groupdict()
+            # First, try the "multi-contexts" stuff!
+            msgctxts = tuple(d.get("ctxt_raw{}".format(i)) for i in range(max_multi_ctxt))
+            if msgctxts[0]:
+                msgctxts = tuple(itertools.takewhile(bool, msgctxts))
+            else:
+                msgctxts = (d.get("ctxt_raw"),)
+            messages.append((msgctxts, d.get("msg_raw"), bisect.bisect_right(lines, m.start())))
+    return messages
+
+
 def dump_src_messages(msgs, reports, settings):
     def get_contexts():
         """Return a mapping {C_CTXT_NAME: ctxt_value}."""
@@ -725,75 +800,48 @@ def dump_src_messages(msgs, reports, settings):
 
     contexts = get_contexts()
 
-    # Build regexes to extract messages (with optional contexts) from C source.
-    pygettexts = tuple(re.compile(r).search for r in settings.PYGETTEXT_KEYWORDS)
-
     _clean_str = re.compile(settings.str_clean_re).finditer
 
     def clean_str(s):
         return "".join(m.group("clean") for m in _clean_str(s))
 
-    def dump_src_file(path, rel_path, msgs, reports, settings):
-        def process_entry(_msgctxt, _msgid):
-            # Context.
-            msgctxt = settings.DEFAULT_CONTEXT
-            if _msgctxt:
-                if _msgctxt in contexts:
-                    msgctxt = contexts[_msgctxt]
-                elif '"' in _msgctxt or "'" in _msgctxt:
-                    msgctxt = clean_str(_msgctxt)
-                else:
-                    print("WARNING: raw context “{}” couldn’t be resolved!".format(_msgctxt))
-            # Message.
-            msgid = ""
-            if _msgid:
-                if '"' in _msgid or "'" in _msgid:
-                    msgid = clean_str(_msgid)
-                else:
-                    print("WARNING: raw message “{}” couldn’t be resolved!".format(_msgid))
-            return msgctxt, msgid
-
-        check_ctxt_src = None
-        if reports["check_ctxt"]:
-            check_ctxt = reports["check_ctxt"]
-            check_ctxt_src = {
-                "multi_lines": check_ctxt.get("multi_lines"),
-                "not_capitalized": check_ctxt.get("not_capitalized"),
-                "end_point": check_ctxt.get("end_point"),
-                "spell_checker": check_ctxt.get("spell_checker"),
-                "spell_errors": check_ctxt.get("spell_errors"),
-            }
-
-        data = ""
-        with open(path) as f:
-            data = f.read()
-        for srch in pygettexts:
-            m = srch(data)
-            line = pos = 0
-            while m:
-                d = m.groupdict()
-                # Line.
-                line += data[pos:m.start()].count('\n')
-                msgsrc = rel_path + ":" + str(line)
-                _msgid = d.get("msg_raw")
-                # First, try the "multi-contexts" stuff!
-                _msgctxts = tuple(d.get("ctxt_raw{}".format(i)) for i in range(settings.PYGETTEXT_MAX_MULTI_CTXT))
-                if _msgctxts[0]:
-                    for _msgctxt in _msgctxts:
-                        if not _msgctxt:
-                            break
-                        msgctxt, msgid = process_entry(_msgctxt, _msgid)
-                        process_msg(msgs, msgctxt, msgid, msgsrc, reports, check_ctxt_src, settings)
-                        reports["src_messages"].append((msgctxt, msgid, msgsrc))
-                else:
-                    _msgctxt = d.get("ctxt_raw")
-                    msgctxt, msgid = process_entry(_msgctxt, _msgid)
-                    process_msg(msgs, msgctxt, msgid, msgsrc, reports, check_ctxt_src, settings)
-                    reports["src_messages"].append((msgctxt, msgid, msgsrc))
+    def process_entry(_msgctxt, _msgid):
+        # Context.
+        msgctxt = settings.DEFAULT_CONTEXT
+        if _msgctxt:
+            if _msgctxt in contexts:
+                msgctxt = contexts[_msgctxt]
+            elif '"' in _msgctxt or "'" in _msgctxt:
+                msgctxt = clean_str(_msgctxt)
+            else:
+                print("WARNING: raw context “{}” couldn’t be resolved!".format(_msgctxt))
+        # Message.
+        msgid = ""
+        if _msgid:
+            if '"' in _msgid or "'" in _msgid:
+                msgid = clean_str(_msgid)
+            else:
+                print("WARNING: raw message “{}” couldn’t be resolved!".format(_msgid))
+        return msgctxt, msgid
 
-                pos = m.end()
-                line += data[m.start():pos].count('\n')
-                m = srch(data, pos)
+    check_ctxt_src = None
+    if reports["check_ctxt"]:
+        check_ctxt = reports["check_ctxt"]
+        check_ctxt_src = {
+            "multi_lines": check_ctxt.get("multi_lines"),
+            "not_capitalized": check_ctxt.get("not_capitalized"),
+            "end_point": check_ctxt.get("end_point"),
+            "spell_checker": check_ctxt.get("spell_checker"),
+            "spell_errors": check_ctxt.get("spell_errors"),
+        }
+
+    def dump_src_file(rel_path, src_messages):
+        for _msgctxts, _msgid, line in src_messages:
+            msgsrc = rel_path + ":" + str(line)
+            for _msgctxt in _msgctxts:
+                msgctxt, msgid = process_entry(_msgctxt, _msgid)
+                process_msg(msgs, msgctxt, msgid, msgsrc, reports, check_ctxt_src, settings)
+                reports["src_messages"].append((msgctxt, msgid, msgsrc))
 
     forbidden = set()
     forced = set()
@@ -819,10 +867,60 @@ def dump_src_messages(msgs, reports, settings):
                 continue
             elif rel_path not in forced:
                 forced.add(rel_path)
+
+    # Raw messages of each file are cached, keyed by the hash of its content (and of the keywords used),
+    # so that only modified files have to be parsed again.
+    keywords = tuple(settings.PYGETTEXT_KEYWORDS)
+    keywords_hash = hashlib.new(settings.PARSER_CACHE_HASH, repr(keywords).encode()).digest()
+    cache_path = settings.SRC_MESSAGES_CACHE
+    cache = {}
+    if cache_path and os.path.isfile(cache_path):
+        try:
+            with open(cache_path, 'rb') as f:
+                cache = pickle.load(f)
+        except Exception as e:
+            print("WARNING: could not read source messages cache {} ({}), ignoring it.".format(cache_path, e))
+
+    src_files = []
     for rel_path in sorted(forced):
         path = os.path.join(settings.SOURCE_DIR, rel_path)
         if os.path.exists(path):
-            dump_src_file(path, rel_path, msgs, reports, settings)
+            with open(path, 'rb') as f:
+                src_hash = hashlib.new(settings.PARSER_CACHE_HASH, f.read())
+            src_hash.update(keywords_hash)
+            src_files.append((rel_path, path, src_hash.digest()))
+
+    src_messages = {}
+    modified = []
+    for rel_path, path, src_hash in src_files:
+        cached = cache.get(rel_path)
+        if cached and cached[0] == src_hash:
+            src_messages[rel_path] = cached[1]
+        else:
+            modified.append((rel_path, path, src_hash))
+    if modified:
+        args = (
+            tuple(path for _rel_path, path, _src_hash in modified),
+            (keywords,) * len(modified),
+            (settings.PYGETTEXT_MAX_MULTI_CTXT,) * len(modified),
+        )
+        if len(modified) > 64:
+            with concurrent.futures.ProcessPoolExecutor() as exctr:
+                files_messages = tuple(exctr.map(extract_src_file_messages, *args, chunksize=16))
+        else:
+            # Not worth starting worker processes for a few modified files.
+            files_messages = tuple(map(extract_src_file_messages, *args))
+        for (rel_path, _path, src_hash), messages in zip(modified, files_messages):
+            src_messages[rel_path] = messages
+            cache[rel_path] = (src_hash, messages)
+
+    for rel_path, _path, _src_hash in src_files:
+        dump_src_file(rel_path, src_messages[rel_path])
+
+    if cache_path and modified:
+        cache = {rel_path: cache[rel_path] for rel_path, _path, _src_hash in src_files}
+        with open(cache_path, 'wb') as f:
+            pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL)
 
 
 ##### Main functions! #####
@@ -506,6 +506,10 @@ SRC_POTFILES = ""
 # A cache storing validated msgids, to avoid re-spellchecking them.
 SPELL_CACHE = os.path.join("/tmp", ".spell_cache")
 
+# A cache storing messages extracted from C/C++ source files (keyed by their content hash),
+# to only parse again modified files.
+SRC_MESSAGES_CACHE = os.path.join("/tmp", ".src_messages_cache")
+
 # Threshold defining whether a new msgid is similar enough with an old one to reuse its translation...
 SIMILAR_MSGID_THRESHOLD = 0.75
 
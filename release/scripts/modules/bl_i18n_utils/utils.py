@@ -20,6 +20,8 @@
 
 # Some misc utilities...
 
+import array
+import bisect
 import collections
 import concurrent.futures
 import copy
@@ -28,7 +30,6 @@ import os
 import re
 import struct
 import sys
-import tempfile
 #import time
 
 from bl_i18n_utils import (
@@ -80,6 +81,196 @@ def get_best_similar(data):
     return key, tmp
 
 
+class SimilarMsgidIndex:
+    """
+    Index of msgids, to quickly find the one most similar to a given msgid.
+
+    Gives the same results as get_best_similar(), but instead of checking the whole pool for each msgid, candidates
+    are sorted by length and indexed by their characters (the n-th occurrence of each character being a separate
+    entry). This allows to compute the quick_ratio() of all candidates of a valid length at once, and to only compute
+    the (expensive) ratio() of the best ones.
+    """
+    __slots__ = (
+        "msgids",
+        "lengths",
+        "pool_indices",
+        "char_indices",
+    )
+
+    def __init__(self, similar_pool):
+        pool_indices = sorted(range(len(similar_pool)), key=lambda i: len(similar_pool[i]))
+        self.msgids = tuple(similar_pool[i] for i in pool_indices)
+        self.lengths = array.array('i', (len(msgid) for msgid in self.msgids))
+        # Index in the original pool, to return the same match as get_best_similar() between equally similar ones.
+        self.pool_indices = array.array('i', pool_indices)
+        # Maps (char, nth_occurence) to the (sorted) indices of msgids containing at least nth_occurence of char.
+        self.char_indices = char_indices = {}
+        for i, msgid in enumerate(self.msgids):
+            char_count = {}
+            for c in msgid:
+                n = char_count[c] = char_count.get(c, 0) + 1
+                indices = char_indices.get((c, n))
+                if indices is None:
+                    indices = char_indices[(c, n)] = array.array('i')
+                indices.append(i)
+
+    def best_similar(self, msgid, use_similar):
+        """
+        Return the most similar msgid with a similarity ratio above use_similar, or None.
+        """
+        import difflib
+
+        bisect_left = bisect.bisect_left
+        lengths = self.lengths
+        len_key = len(msgid)
+        # Same length limits as get_best_similar(), narrowed by the real_quick_ratio() (with some margin,
+        # exact check is done with quick_ratio() below).
+        min_len = max(len_key // 2 + 1, int(len_key * use_similar / (2.0 - use_similar)) - 1)
+        max_len = min(len_key * 2 - 1, int(len_key * (2.0 - use_similar) / use_similar) + 1)
+        start = bisect_left(lengths, min_len)
+        end = bisect_left(lengths, max_len + 1)
+        if start >= end:
+            return None
+
+        # Number of matching characters of each candidate (as in quick_ratio()).
+        matches = collections.Counter()
+        char_indices = self.char_indices
+        char_count = {}
+        for c in msgid:
+            n = char_count[c] = char_count.get(c, 0) + 1
+            indices = char_indices.get((c, n))
+            if indices is not None:
+                matches.update(indices[bisect_left(indices, start):bisect_left(indices, end)])
+
+        candidates = []
+        for i, n in matches.items():
+            quick_ratio = 2.0 * n / (len_key + lengths[i])
+            if quick_ratio >= use_similar:
+                candidates.append((quick_ratio, i))
+        # Best candidates first, ratio() being never above quick_ratio() we can stop early.
+        candidates.sort(reverse=True)
+
+        best = None
+        best_pool_index = -1
+        s = difflib.SequenceMatcher()
+        s.set_seq2(msgid)
+        for quick_ratio, i in candidates:
+            if quick_ratio < use_similar:
+                break
+            s.set_seq1(self.msgids[i])
+            sratio = s.ratio()
+            if sratio > use_similar or (sratio == use_similar and self.pool_indices[i] > best_pool_index):
+                best = i
+                best_pool_index = self.pool_indices[i]
+                use_similar = sratio
+        return None if best is None else self.msgids[best]
+
+
+# Index used by worker processes of I18nMessages.update(), so that the pool is only sent once to each of them.
+_similar_msgid_index = None
+
+
+def _similar_msgid_index_init(similar_pool):
+    global _similar_msgid_index
+    _similar_msgid_index = SimilarMsgidIndex(similar_pool)
+
+
+def _similar_msgid_index_best_similar(data):
+    key, use_similar = data
+    return key, _similar_msgid_index.best_similar(key[1], use_similar)
+
+
+##### MO files #####
+# Using https://www.gnu.org/software/gettext/manual/html_node/MO-Files.html notation.
+
+MO_MAGIC_NUMBER = 0x950412de
+MO_HEADER_SIZE = 7 * 4
+# Used to concatenate context and msgid.
+MO_CONTEXT_SEPARATOR = b"\x04"
+
+
+def mo_key_hash(key):
+    """
+    Return the hash of given (utf-8 encoded) key, as used by gettext hash tables ('hashpjw' function,
+    on an unsigned int of 32 bits, like readers of mo files do).
+    """
+    hval = 0
+    for c in key:
+        hval = ((hval << 4) + c) & 0xffffffff
+        g = hval & 0xf0000000
+        if g:
+            hval ^= g >> 24
+            hval ^= g
+    return hval
+
+
+def mo_hash_table_size(messages_num):
+    """
+    Return the size of the hash table for given number of messages (same as msgfmt).
+    """
+    size = max(3, (messages_num * 4) // 3)
+    # Next prime number.
+    size |= 1
+    while any(size % d == 0 for d in range(3, int(size ** 0.5) + 1, 2)):
+        size += 2
+    return size
+
+
+def gen_mo_data(messages):
+    """
+    Return the content of a mo file, from a sorted list of (key, msgstr) utf-8 encoded pairs
+    (see I18nMessages.mo_messages()).
+    """
+    messages_num = len(messages)
+    hash_size = mo_hash_table_size(messages_num)
+    keys_offset = MO_HEADER_SIZE
+    msgstrs_offset = keys_offset + messages_num * 8
+    hash_offset = msgstrs_offset + messages_num * 8
+    data_offset = hash_offset + hash_size * 4
+
+    # Strings are null terminated, their length does not include the null char.
+    keys_table = array.array('I')
+    offset = data_offset
+    for key, _msgstr in messages:
+        keys_table.extend((len(key), offset))
+        offset += len(key) + 1
+    msgstrs_table = array.array('I')
+    for _key, msgstr in messages:
+        msgstrs_table.extend((len(msgstr), offset))
+        offset += len(msgstr) + 1
+
+    # Open addressing with double hashing, entries are message indices + 1 (0 being an empty slot).
+    hash_table = array.array('I', [0]) * hash_size
+    for i, (key, _msgstr) in enumerate(messages):
+        hval = mo_key_hash(key)
+        idx = hval % hash_size
+        incr = 1 + (hval % (hash_size - 2))
+        while hash_table[idx]:
+            idx += incr
+            if idx >= hash_size:
+                idx -= hash_size
+        hash_table[idx] = i + 1
+
+    if sys.byteorder != 'little':
+        for table in (keys_table, msgstrs_table, hash_table):
+            table.byteswap()
+
+    return b"".join((
+        struct.pack("<7I", MO_MAGIC_NUMBER, 0, messages_num, keys_offset, msgstrs_offset, hash_size, hash_offset),
+        keys_table.tobytes(),
+        msgstrs_table.tobytes(),
+        hash_table.tobytes(),
+        b"".join(key + b"\0" for key, _msgstr in messages),
+        b"".join(msgstr + b"\0" for _key, msgstr in messages),
+    ))
+
+
+def _write_mo_file(data):
+    fname, messages = data
+    with open(fname, 'wb') as f:
+        f.write(gen_mo_data(messages))
+
+
 def locale_match(loc1, loc2):
     """
     Return:
@@ -566,9 +757,12 @@ class I18nMessages:
 
         # Next process new keys.
         if use_similar > 0.0:
-            with concurrent.futures.ProcessPoolExecutor() as exctr:
-                for key, msgid in exctr.map(get_best_similar,
-                                            tuple((nk, use_similar, tuple(similar_pool.keys())) for nk in new_keys)):
+            with concurrent.futures.ProcessPoolExecutor(
+                    initializer=_similar_msgid_index_init,
+                    initargs=(tuple(similar_pool.keys()),),
+            ) as exctr:
+                for key, msgid in exctr.map(_similar_msgid_index_best_similar,
+                                            tuple((nk, use_similar) for nk in new_keys), chunksize=64):
                     if msgid:
                         # Try to get the same context, else just get one...
                         skey = (key[0], msgid)
@@ -1060,78 +1254,40 @@ class I18nMessages:
         else:
             _write(self, fname, compact)
 
+    def mo_messages(self):
+        """
+        Return a sorted list of (key, msgstr) utf-8 encoded pairs of the messages to write in a mo file
+        (key being the msgid, prefixed by its context if not default one).
+        Only translated, not fuzzy nor commented messages are taken into account (and the header).
+        """
+        default_context = self.settings.DEFAULT_CONTEXT
+        header_key = self.settings.PO_HEADER_KEY
+        messages = []
+        for key, msg in self.msgs.items():
+            if key != header_key and (msg.is_fuzzy or msg.is_commented or not msg.msgid):
+                continue
+            msgstr = msg.msgstr
+            if not msgstr:
+                continue
+            msgid = msg.msgid.encode("utf-8")
+            msgctxt = msg.msgctxt
+            if msgctxt and msgctxt != default_context:
+                msgid = msgctxt.encode("utf-8") + MO_CONTEXT_SEPARATOR + msgid
+            messages.append((msgid, msgstr.encode("utf-8")))
+        messages.sort()
+        return messages
+
     def write_messages_to_mo(self, fname):
         """
         Write messages in fname mo file.
         """
-        # XXX Temp solution, until I can make own mo generator working...
-        import subprocess
-        with tempfile.NamedTemporaryFile(mode='w+', encoding="utf-8") as tmp_po_f:
-            self.write_messages_to_po(tmp_po_f)
-            cmd = (
-                self.settings.GETTEXT_MSGFMT_EXECUTABLE,
-                "--statistics",  # show stats
-                tmp_po_f.name,
-                "-o",
-                fname,
-            )
-            print("Running ", " ".join(cmd))
-            ret = subprocess.call(cmd)
-            print("Finished.")
-            return
-        # XXX Code below is currently broken (generates corrupted mo files it seems :( )!
-        # Using http://www.gnu.org/software/gettext/manual/html_node/MO-Files.html notation.
-        # Not generating hash table!
-        # Only translated, unfuzzy messages are taken into account!
-        default_context = self.settings.DEFAULT_CONTEXT
-        msgs = tuple(v for v in self.msgs.values() if not (v.is_fuzzy or v.is_commented) and v.msgstr and v.msgid)
-        msgs = sorted(msgs[:2],
-                      key=lambda e: (e.msgctxt + e.msgid) if (e.msgctxt and e.msgctxt != default_context) else e.msgid)
-        magic_nbr = 0x950412de
-        format_rev = 0
-        N = len(msgs)
-        O = 32
-        T = O + N * 8
-        S = 0
-        H = T + N * 8
-        # Prepare our data! we need key (optional context and msgid), translation, and offset and length of both.
-        # Offset are relative to start of their own list.
-        EOT = b"0x04"  # Used to concatenate context and msgid
-        _msgid_offset = 0
-        _msgstr_offset = 0
-
-        def _gen(v):
-            nonlocal _msgid_offset, _msgstr_offset
-            msgid = v.msgid.encode("utf-8")
-            msgstr = v.msgstr.encode("utf-8")
-            if v.msgctxt and v.msgctxt != default_context:
-                msgctxt = v.msgctxt.encode("utf-8")
-                msgid = msgctxt + EOT + msgid
-            # Don't forget the final NULL char!
-            _msgid_len = len(msgid) + 1
-            _msgstr_len = len(msgstr) + 1
-            ret = ((msgid, _msgid_len, _msgid_offset), (msgstr, _msgstr_len, _msgstr_offset))
-            _msgid_offset += _msgid_len
-            _msgstr_offset += _msgstr_len
-            return ret
-        msgs = tuple(_gen(v) for v in msgs)
-        msgid_start = H
-        msgstr_start = msgid_start + _msgid_offset
-        print(N, msgstr_start + _msgstr_offset)
-        print(msgs)
-
-        with open(fname, 'wb') as f:
-            # Header...
-            f.write(struct.pack("=8I", magic_nbr, format_rev, N, O, T, S, H, 0))
-            # Msgid's length and offset.
-            f.write(b"".join(struct.pack("=2I", length, msgid_start + offset) for (_1, length, offset), _2 in msgs))
-            # Msgstr's length and offset.
-            f.write(b"".join(struct.pack("=2I", length, msgstr_start + offset) for _1, (_2, length, offset) in msgs))
-            # No hash table!
-            # Msgid's.
-            f.write(b"\0".join(msgid for (msgid, _1, _2), _3 in msgs) + b"\0")
-            # Msgstr's.
-            f.write(b"\0".join(msgstr for _1, (msgstr, _2, _3) in msgs) + b"\0")
+        data = gen_mo_data(self.mo_messages())
+        if isinstance(fname, str):
+            with open(fname, 'wb') as f:
+                f.write(data)
+        # Else assume fname is already a file(like) object!
+        else:
+            fname.write(data)
 
     parsers = {
         "PO": parse_messages_from_po,
@@ -1189,6 +1345,9 @@ class I18n:
                         return os.path.join(os.path.dirname(path), "blender.pot")
                 if not path.endswith(".po"):
                     return os.path.join(os.path.dirname(path), uid + ".po")
+            elif kind == 'MO':
+                if not path.endswith(".mo"):
+                    return os.path.join(os.path.dirname(path), uid + ".mo")
             elif kind == 'PY':
                 if not path.endswith(".py"):
                     if self.src.get(self.settings.PARSER_PY_ID):
@@ -1394,6 +1553,19 @@ class I18n:
             dst = self.dst(self, self.src.get(uid, ""), uid, 'PO')
             self.trans[uid].write('PO', dst)
 
+    def write_to_mo(self, langs=set()):
+        """
+        Write all translations into mo files, compiled in parallel. By default, write in the same dir as the source
+        (as uid.mo files), specify a custom self.dst function to write somewhere else!
+        """
+        keys = self.trans.keys() - {self.settings.PARSER_TEMPLATE_ID}
+        if langs:
+            keys &= langs
+        data = tuple((self.dst(self, self.src.get(uid, ""), uid, 'MO'), self.trans[uid].mo_messages()) for uid in keys)
+        with concurrent.futures.ProcessPoolExecutor() as exctr:
+            # Consume results, to get errors from worker processes.
+            tuple(exctr.map(_write_mo_file, data))
+
     def write_to_py(self, langs=set()):
         """
         Write all translations as python code, either in a "translations.py" file under same dir as source(s), or in
@@ -1556,4 +1728,5 @@ class I18n:
     writers = {
         "PO": write_to_po,
         "PY": write_to_py,
+        "MO": write_to_mo,
     }
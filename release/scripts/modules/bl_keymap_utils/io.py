@@ -22,6 +22,7 @@
 # Export Functions
 
 __all__ = (
+    "keyconfig_data_from_file_cached",
     "keyconfig_export_as_data",
     "keyconfig_import_from_data",
     "keyconfig_init_from_data",
@@ -238,6 +239,14 @@ def keymap_init_from_data(km, km_items, is_modal=False):
                 kmi_props = kmi.properties
                 assert type(kmi_props_data) is list
                 for attr, value in kmi_props_data:
+                    # Assign plain values directly (the common case),
+                    # nested properties & errors are handled by '_kmi_props_setattr'.
+                    if type(value) is not list:
+                        try:
+                            setattr(kmi_props, attr, value)
+                            continue
+                        except Exception:
+                            pass
                     _kmi_props_setattr(kmi_props, attr, value)
 
 
@@ -245,6 +254,12 @@ def keyconfig_init_from_data(kc, keyconfig_data):
     # Load data in the format defined above.
     #
     # Runs at load time, keep this fast!
+    import bpy
+    use_time = bpy.app.debug_python
+    if use_time:
+        import time
+        time_start = time.time()
+
     for (km_name, km_args, km_content) in keyconfig_data:
         km = kc.keymaps.new(km_name, **km_args)
         km_items = km_content["items"]
@@ -256,6 +271,14 @@ def keyconfig_init_from_data(kc, keyconfig_data):
         assert type(km_items) is list
         keymap_init_from_data(km, km_items, is_modal=km_args.get("modal", False))
 
+    if use_time:
+        print("Keyconfig %r initialized in %.4f sec (%d keymaps, %d items)" % (
+            kc.name,
+            time.time() - time_start,
+            len(keyconfig_data),
+            sum(len(km_content["items"]) for (_, _, km_content) in keyconfig_data),
+        ))
+
 
 def keyconfig_import_from_data(name, keyconfig_data):
     # Load data in the format defined above.
@@ -269,6 +292,145 @@ def keyconfig_import_from_data(name, keyconfig_data):
     return kc
 
 
+# -----------------------------------------------------------------------------
+# Cache Functions
+#
+# Key-config data is generated by running all key-map functions of a module
+# (which needs to be executed first), cache the resulting data
+# for the parameters & source files it was generated from.
+
+_keyconfig_data_cache = None
+_keyconfig_data_cache_is_dirty = False
+_keyconfig_data_cache_version = 1
+_keyconfig_data_cache_filename = "keyconfig_data_cache.pickle"
+# Enough for switching between a few key-configurations & preferences.
+_keyconfig_data_cache_items_max = 8
+
+
+def _keyconfig_data_cache_filepath(create=False):
+    import os
+    import bpy
+    # Only create the configuration directory when writing the cache.
+    path = bpy.utils.user_resource('CONFIG', create=create)
+    if not path:
+        return None
+    return os.path.join(path, _keyconfig_data_cache_filename)
+
+
+def _keyconfig_data_cache_load(use_disk_cache):
+    global _keyconfig_data_cache
+    if _keyconfig_data_cache is not None:
+        return _keyconfig_data_cache
+
+    _keyconfig_data_cache = {}
+    filepath = _keyconfig_data_cache_filepath() if use_disk_cache else None
+    if filepath is None:
+        return _keyconfig_data_cache
+
+    import pickle
+    try:
+        with open(filepath, "rb") as fh:
+            version, cache = pickle.load(fh)
+    except FileNotFoundError:
+        return _keyconfig_data_cache
+    except Exception as ex:
+        print("Error reading keyconfig cache:", repr(filepath), ex)
+        return _keyconfig_data_cache
+
+    if version == _keyconfig_data_cache_version:
+        _keyconfig_data_cache = cache
+    return _keyconfig_data_cache
+
+
+def _keyconfig_data_cache_save():
+    global _keyconfig_data_cache_is_dirty
+    if not _keyconfig_data_cache_is_dirty:
+        return
+    _keyconfig_data_cache_is_dirty = False
+
+    filepath = _keyconfig_data_cache_filepath(create=True)
+    if filepath is None:
+        return
+
+    import os
+    import pickle
+    filepath_tmp = filepath + ".tmp"
+    try:
+        with open(filepath_tmp, "wb") as fh:
+            pickle.dump((_keyconfig_data_cache_version, _keyconfig_data_cache), fh)
+        os.replace(filepath_tmp, filepath)
+    except OSError as ex:
+        print("Error writing keyconfig cache:", repr(filepath), ex)
+
+
+def _keyconfig_data_cache_key(filepaths, params):
+    import hashlib
+    from sys import platform
+
+    hash_data = hashlib.sha1()
+    for filepath in filepaths:
+        with open(filepath, "rb") as fh:
+            hash_data.update(fh.read())
+    # The platform is used for parameter defaults.
+    hash_data.update(repr((platform, sorted(params.items()))).encode("utf-8"))
+    return hash_data.hexdigest()
+
+
+def keyconfig_data_from_file_cached(filepath, params, *, filepaths_depends=(), use_disk_cache=True):
+    """
+    Return the key-config data of ``generate_keymaps(Params(**params))``
+    from the module at *filepath*, cached (in memory and on disk when *use_disk_cache* is enabled)
+    by the *params* values and the contents of *filepath* & *filepaths_depends*
+    (other files the key-map data is generated from).
+
+    The module is only executed when the data isn't found in the cache.
+    A new copy of the data is returned on each call, so it can be modified.
+
+    :arg filepath: Key-map data module, defining ``Params`` and ``generate_keymaps``.
+    :type filepath: string
+    :arg params: Keyword arguments for ``Params``.
+    :type params: dict
+    """
+    import os
+    import pickle
+    import bpy
+    global _keyconfig_data_cache_is_dirty
+
+    use_time = bpy.app.debug_python
+    if use_time:
+        import time
+        time_start = time.time()
+
+    cache = _keyconfig_data_cache_load(use_disk_cache)
+    key = _keyconfig_data_cache_key((filepath, *filepaths_depends), params)
+    keyconfig_data_pickle = cache.pop(key, None)
+    is_cached = keyconfig_data_pickle is not None
+    if is_cached:
+        keyconfig_data = pickle.loads(keyconfig_data_pickle)
+    else:
+        mod = bpy.utils.execfile(filepath)
+        keyconfig_data = mod.generate_keymaps(mod.Params(**params))
+        keyconfig_data_pickle = pickle.dumps(keyconfig_data, protocol=pickle.HIGHEST_PROTOCOL)
+        while len(cache) >= _keyconfig_data_cache_items_max:
+            # Remove the least recently used data.
+            del cache[next(iter(cache))]
+        _keyconfig_data_cache_is_dirty = True
+
+    # Most recently used last.
+    cache[key] = keyconfig_data_pickle
+    if use_disk_cache:
+        _keyconfig_data_cache_save()
+
+    if use_time:
+        print("Keyconfig data %r %s in %.4f sec" % (
+            os.path.basename(filepath),
+            "read from cache" if is_cached else "generated",
+            time.time() - time_start,
+        ))
+
+    return keyconfig_data
+
+
 # -----------------------------------------------------------------------------
 # Utility Functions
 
@@ -32,72 +32,292 @@
 # } BHead;
 
 
-def read_blend_rend_chunk(path):
+# Size of the buffer used when streaming gzip compressed files.
+GZIP_BUFFER_SIZE = 1 << 20
 
-    import struct
 
-    blendfile = open(path, "rb")
+class BlendFileHandle:
+    """
+    An open blend file, uncompressed files are memory-mapped,
+    gzip compressed files are streamed.
 
-    head = blendfile.read(7)
+    Use as a context manager, ``handle`` is None for files
+    which aren't blend files.
+    """
+    __slots__ = (
+        "path",
+        "handle",
+        "is_64_bit",
+        "is_big_endian",
+        "version",
+        "_file",
+    )
 
-    if head[0:2] == b'\x1f\x8b':  # gzip magic
-        import gzip
-        blendfile.seek(0)
-        blendfile = gzip.open(blendfile, "rb")
-        head = blendfile.read(7)
+    def __init__(self, path):
+        self.path = path
+        self.handle = None
+        self.is_64_bit = False
+        self.is_big_endian = False
+        self.version = b''
+        self._file = None
 
-    if head != b'BLENDER':
-        print("not a blend file:", path)
-        blendfile.close()
-        return []
+    def __enter__(self):
+        self._file = open(self.path, "rb")
+        head = self._file.read(7)
 
-    is_64_bit = (blendfile.read(1) == b'-')
+        if head[0:2] == b'\x1f\x8b':  # gzip magic
+            import gzip
+            import io
+            self._file.seek(0)
+            self.handle = io.BufferedReader(
+                gzip.GzipFile(fileobj=self._file, mode="rb"),
+                buffer_size=GZIP_BUFFER_SIZE,
+            )
+        elif head == b'BLENDER':
+            import mmap
+            self.handle = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            return self
 
-    # true for PPC, false for X86
-    is_big_endian = (blendfile.read(1) == b'V')
+        try:
+            header = self.handle.read(12)
+        except EOFError:
+            # Truncated gzip stream.
+            header = b''
+        if len(header) != 12 or header[0:7] != b'BLENDER':
+            self.handle.close()
+            self.handle = None
+            return self
 
-    # Now read the bhead chunk!!!
-    blendfile.read(3)  # skip the version
+        self.is_64_bit = (header[7:8] == b'-')
+        # true for PPC, false for X86
+        self.is_big_endian = (header[8:9] == b'V')
+        self.version = header[9:12]
+        return self
 
-    scenes = []
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.handle is not None:
+            self.handle.close()
+            self.handle = None
+        self._file.close()
+        self._file = None
 
-    sizeof_bhead = 24 if is_64_bit else 20
+    def blocks(self, codes=None):
+        """
+        Lazily iterate over the blocks of the file,
+        reading the data of blocks in *codes* (all blocks when None),
+        the data of other blocks is skipped.
 
-    while blendfile.read(4) == b'REND':
-        sizeof_bhead_left = sizeof_bhead - 4
+        :arg codes: Block codes to read the data for, e.g. ``{b'REND'}``.
+        :type codes: collection of bytes
+        :return: Generator of ``(code, sdna_index, count, data)``,
+           where data is None for skipped blocks.
+        """
+        import mmap
+        import struct
 
-        struct.unpack('>i' if is_big_endian else '<i', blendfile.read(4))[0]
-        sizeof_bhead_left -= 4
+        handle = self.handle
+        # BHead: code, len, old (pointer), SDNAnr, nr.
+        bhead = struct.Struct(
+            (">" if self.is_big_endian else "<") +
+            ("4siQii" if self.is_64_bit else "4siIii")
+        )
+        sizeof_bhead = bhead.size
+        read = handle.read
+        seek = handle.seek
+        tell = handle.tell
+        # Memory-mapped files can't seek past their end,
+        # reading stops at the end of truncated files.
+        size = handle.size() if isinstance(handle, mmap.mmap) else None
 
-        # We don't care about the rest of the bhead struct
-        blendfile.read(sizeof_bhead_left)
+        while True:
+            try:
+                bhead_data = read(sizeof_bhead)
+                if len(bhead_data) != sizeof_bhead:
+                    break
+                code, length, _old, sdna_index, count = bhead.unpack(bhead_data)
+                if code == b'ENDB' or length < 0:
+                    break
+                if codes is None or code in codes:
+                    data = read(length)
+                    if len(data) != length:
+                        break
+                elif size is not None and tell() + length > size:
+                    break
+                else:
+                    data = None
+                    seek(length, 1)
+            except EOFError:
+                # Truncated gzip stream.
+                break
+            yield (code, sdna_index, count, data)
 
-        # Now we want the scene name, start and end frame. this is 32bites long
-        start_frame, end_frame = struct.unpack('>2i' if is_big_endian else '<2i', blendfile.read(8))
 
-        scene_name = blendfile.read(64)
+def blend_blocks_iter(path, codes=None):
+    """
+    Lazily iterate over the blocks of the blend file at *path*,
+    see :meth:`BlendFileHandle.blocks`.
+    """
+    with BlendFileHandle(path) as blend:
+        if blend.handle is None:
+            return
+        yield from blend.blocks(codes)
 
-        scene_name = scene_name[:scene_name.index(b'\0')]
 
-        try:
-            scene_name = str(scene_name, "utf8")
-        except TypeError:
-            pass
+def _rend_chunk_parse(data, is_big_endian):
+    import struct
+    # Now we want the scene name, start and end frame. this is 32bites long
+    start_frame, end_frame = struct.unpack_from('>2i' if is_big_endian else '<2i', data)
+
+    scene_name = data[8:72]
+
+    scene_name = scene_name[:scene_name.index(b'\0')]
+
+    try:
+        scene_name = str(scene_name, "utf8")
+    except TypeError:
+        pass
+
+    return (start_frame, end_frame, scene_name)
+
+
+def read_blend_rend_chunk(path):
+    """
+    Return a list of ``(start_frame, end_frame, scene_name)``
+    for each scene in the blend file at *path*.
+    """
+    scenes = []
 
-        scenes.append((start_frame, end_frame, scene_name))
+    with BlendFileHandle(path) as blend:
+        if blend.handle is None:
+            print("not a blend file:", path)
+            return []
 
-    blendfile.close()
+        # REND blocks are always written first,
+        # stop reading at the first block that isn't.
+        for code, _sdna_index, _count, data in blend.blocks(codes={b'REND'}):
+            if code != b'REND':
+                break
+            scenes.append(_rend_chunk_parse(data, blend.is_big_endian))
 
     return scenes
 
 
+def _read_blend_rend_chunk_with_path(path):
+    # Errors are returned so one file can't abort reading all others.
+    try:
+        return path, read_blend_rend_chunk(path), None
+    except Exception as ex:
+        return path, [], "%s: %s" % (type(ex).__name__, ex)
+
+
+def read_blend_rend_chunks(paths, *, jobs=None, errors=None):
+    """
+    Read the render info of many files using a process pool.
+
+    :arg jobs: The number of processes to use, all CPU's when None,
+       when 1 the files are read in this process.
+    :arg errors: When a dictionary is passed, it's filled with a message
+       for each path that couldn't be read (these paths have no scenes).
+    :type errors: dict
+    :return: A dictionary mapping paths to their scenes.
+    :rtype: dict
+    """
+    if jobs == 1 or len(paths) < 2:
+        items = map(_read_blend_rend_chunk_with_path, paths)
+        return _read_blend_rend_chunks_result(items, errors)
+
+    import os
+    from concurrent.futures import ProcessPoolExecutor
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        # Large chunks, each file only takes a short time to read.
+        chunksize = max(1, len(paths) // (jobs * 4))
+        items = executor.map(_read_blend_rend_chunk_with_path, paths, chunksize=chunksize)
+        return _read_blend_rend_chunks_result(items, errors)
+
+
+def _read_blend_rend_chunks_result(items, errors):
+    result = {}
+    for path, scenes, error in items:
+        result[path] = scenes
+        if error is not None and errors is not None:
+            errors[path] = error
+    return result
+
+
+def blend_paths_from_args(args):
+    """
+    Expand directories in *args* into the blend files they contain (recursively).
+    """
+    import os
+    paths = []
+    for arg in args:
+        if os.path.isdir(arg):
+            for dirpath, dirnames, filenames in os.walk(arg):
+                dirnames.sort()
+                paths.extend(
+                    os.path.join(dirpath, filename)
+                    for filename in sorted(filenames)
+                    if filename.lower().endswith('.blend')
+                )
+        elif arg.lower().endswith('.blend'):
+            paths.append(arg)
+    return paths
+
+
 def main():
-    import sys
-    for arg in sys.argv[1:]:
-        if arg.lower().endswith('.blend'):
-            for value in read_blend_rend_chunk(arg):
+    import argparse
+    parser = argparse.ArgumentParser(
+        description="Print the frame range and name of the scenes in blend files.",
+    )
+    parser.add_argument(
+        "paths", nargs="*",
+        help="Blend files or directories to search for blend files",
+    )
+    parser.add_argument(
+        "--json", dest="use_json", action="store_true",
+        help="Output a JSON object mapping paths to a list of scenes",
+    )
+    parser.add_argument(
+        "--jobs", "-j", dest="jobs", type=int, default=None,
+        help="Number of processes to use (defaults to the number of CPU's)",
+    )
+    args = parser.parse_args()
+
+    paths = blend_paths_from_args(args.paths)
+    errors = {}
+    result = read_blend_rend_chunks(paths, jobs=args.jobs, errors=errors)
+
+    if args.use_json:
+        import json
+        import sys
+        json.dump(
+            {
+                path: [
+                    {"start_frame": start_frame, "end_frame": end_frame, "scene": scene_name}
+                    for start_frame, end_frame, scene_name in result[path]
+                ]
+                for path in paths
+            },
+            sys.stdout,
+            indent=2,
+        )
+        print()
+    else:
+        for path in paths:
+            for value in result[path]:
                 print("%d %d %s" % value)
 
+    if errors:
+        import sys
+        for path in paths:
+            error = errors.get(path)
+            if error is not None:
+                print("Error reading %r: %s" % (path, error), file=sys.stderr)
+        sys.exit(1)
+
 
 if __name__ == '__main__':
     main()
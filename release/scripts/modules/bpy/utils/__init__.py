@@ -30,6 +30,8 @@ __all__ = (
     "keyconfig_set",
     "load_scripts",
     "modules_from_path",
+    "object_relations_index_enable",
+    "object_relations_index_refresh",
     "preset_find",
     "preset_paths",
     "refresh_script_paths",
@@ -91,8 +93,23 @@ def execfile(filepath, mod=None):
     return mod
 
 
+def _profile_report(kind, module_name, time_start):
+    """
+    Print the time passed since ``time_start`` (from :func:`time.perf_counter`)
+    as a line of JSON, used by ``--debug-python-profile``.
+    """
+    import json
+    import time
+    print(json.dumps({
+        "python_profile": kind,
+        "module": module_name,
+        "time": round(time.perf_counter() - time_start, 6),
+    }))
+
+
 def _test_import(module_name, loaded_modules):
     use_time = _bpy.app.debug_python
+    use_profile = _bpy.app.debug_python_profile
 
     if module_name in loaded_modules:
         return None
@@ -101,9 +118,10 @@ def _test_import(module_name, loaded_modules):
               "multiple periods" % module_name)
         return None
 
-    if use_time:
+    if use_time or use_profile:
         import time
         t = time.time()
+        t_profile = time.perf_counter()
 
     try:
         mod = __import__(module_name)
@@ -114,6 +132,8 @@ def _test_import(module_name, loaded_modules):
 
     if use_time:
         print("time %s %.4f" % (module_name, time.time() - t))
+    if use_profile:
+        _profile_report("import", module_name, t_profile)
 
     loaded_modules.add(mod.__name__)  # should match mod.__name__ too
     return mod
@@ -168,11 +188,13 @@ def load_scripts(reload_scripts=False, refresh_scripts=False):
     :type refresh_scripts: bool
     """
     use_time = use_class_register_check = _bpy.app.debug_python
+    use_profile = _bpy.app.debug_python_profile
     use_user = not _is_factory_startup
 
-    if use_time:
+    if use_time or use_profile:
         import time
         t_main = time.time()
+        t_main_profile = time.perf_counter()
 
     loaded_modules = set()
 
@@ -190,11 +212,15 @@ def load_scripts(reload_scripts=False, refresh_scripts=False):
     def register_module_call(mod):
         register = getattr(mod, "register", None)
         if register:
+            if use_profile:
+                t_profile = time.perf_counter()
             try:
                 register()
             except:
                 import traceback
                 traceback.print_exc()
+            if use_profile:
+                _profile_report("register", mod.__name__, t_profile)
         else:
             print("\nWarning! '%s' has no register function, "
                   "this is now a requirement for registerable scripts" %
@@ -288,6 +314,8 @@ def load_scripts(reload_scripts=False, refresh_scripts=False):
 
     if use_time:
         print("Python Script Load Time %.4f" % (time.time() - t_main))
+    if use_profile:
+        _profile_report("total", None, t_main_profile)
 
     if use_class_register_check:
         for cls in _bpy.types.bpy_struct.__subclasses__():
@@ -963,6 +991,63 @@ def unregister_tool(tool_cls):
             kc.keymaps.remove(km)
 
 
+# -----------------------------------------------------------------------------
+# Object Relations Index
+#
+# Optional reverse lookup tables used by:
+# 'Object.children', 'Object.users_collection' & 'Object.users_scene'.
+
+@_bpy.app.handlers.persistent
+def _object_relations_index_invalidate(*_args):
+    import bpy_types
+    bpy_types._object_relations_index = None
+
+
+_object_relations_index_handlers = (
+    "depsgraph_update_post",
+    "load_post",
+    "undo_post",
+    "redo_post",
+)
+
+
+def object_relations_index_enable(enable=True):
+    """
+    Use an index for looking up object relationships,
+    so :class:`bpy.types.Object` ``children``, ``users_collection``
+    and ``users_scene`` don't need to search all blend-file data on access.
+
+    The index is built on first access and invalidated on depsgraph updates,
+    file load, undo & redo. Scripts that change parenting or collection
+    membership without a depsgraph update in between should call
+    :func:`object_relations_index_refresh`.
+
+    :arg enable: Enable or disable the index.
+    :type enable: bool
+    """
+    import bpy_types
+    handlers = _bpy.app.handlers
+    for handler_id in _object_relations_index_handlers:
+        handler_list = getattr(handlers, handler_id)
+        if _object_relations_index_invalidate in handler_list:
+            handler_list.remove(_object_relations_index_invalidate)
+        if enable:
+            handler_list.append(_object_relations_index_invalidate)
+
+    bpy_types._object_relations_index_use = enable
+    bpy_types._object_relations_index = None
+
+
+def object_relations_index_refresh():
+    """
+    Rebuild the object relations index immediately,
+    does nothing when the index isn't enabled.
+    """
+    import bpy_types
+    bpy_types._object_relations_index = None
+    bpy_types._object_relations_index_get()
+
+
 # -----------------------------------------------------------------------------
 # Manual lookups, each function has to return a basepath and a sequence
 # of...
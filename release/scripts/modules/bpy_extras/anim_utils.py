@@ -28,6 +28,16 @@ __all__ = (
 
 import bpy
 
+# Note: BBONE_PROPS is a list so we can preserve the ordering
+BBONE_PROPS = [
+    'bbone_curveinx', 'bbone_curveoutx',
+    'bbone_curveiny', 'bbone_curveouty',
+    'bbone_rollin', 'bbone_rollout',
+    'bbone_scaleinx', 'bbone_scaleoutx',
+    'bbone_scaleiny', 'bbone_scaleouty',
+    'bbone_easein', 'bbone_easeout'
+]
+
 
 def bake_action(
         obj,
@@ -122,7 +132,8 @@ def bake_action_iter(
         do_visual_keying=True,
         do_constraint_clear=False,
         do_parents_clear=False,
-        do_clean=False
+        do_clean=False,
+        do_bulk=False
 ):
     """
     An coroutine that bakes action for a single object.
@@ -146,6 +157,11 @@ def bake_action_iter(
     :type do_parents_clear: bool
     :arg do_clean: Remove redundant keyframes after baking.
     :type do_clean: bool
+    :arg do_bulk: Store baked transformations in arrays and write whole F-Curves at once,
+       instead of inserting keyframes one by one (much faster for many bones & frames).
+       Keyframes on baked frames replace existing ones and use the settings of keyframes
+       created by ``keyframe_points.add``, other existing keyframes are kept unchanged.
+    :type do_bulk: bool
 
     :return: an action or None
     :rtype: :class:`bpy.types.Action`
@@ -153,16 +169,6 @@ def bake_action_iter(
     # -------------------------------------------------------------------------
     # Helper Functions and vars
 
-    # Note: BBONE_PROPS is a list so we can preserve the ordering
-    BBONE_PROPS = [
-        'bbone_curveinx', 'bbone_curveoutx',
-        'bbone_curveiny', 'bbone_curveouty',
-        'bbone_rollin', 'bbone_rollout',
-        'bbone_scaleinx', 'bbone_scaleoutx',
-        'bbone_scaleiny', 'bbone_scaleouty',
-        'bbone_easein', 'bbone_easeout'
-    ]
-
     def pose_frame_info(obj):
         matrix = {}
         bbones = {}
@@ -218,6 +224,22 @@ def bake_action_iter(
 
     options = {'INSERTKEY_NEEDED'}
 
+    if do_bulk:
+        from array import array
+
+        frames = []
+        pbones = [
+            pbone for pbone in obj.pose.bones
+            if not (only_selected and not pbone.bone.select)
+        ] if do_pose else []
+        # Flat matrices (rows) for all frames, per bone.
+        pose_matrices = [array('f') for _ in pbones]
+        pose_bbones = [
+            [array('f') for _ in BBONE_PROPS] if pbone.bone.bbone_segments > 1 else None
+            for pbone in pbones
+        ]
+        obj_matrices = array('f')
+
     # -------------------------------------------------------------------------
     # Collect transformations
 
@@ -229,6 +251,24 @@ def bake_action_iter(
         if frame is None:
             break
 
+        if do_bulk:
+            frames.append(frame)
+            for pbone, matrices, bbones in zip(pbones, pose_matrices, pose_bbones):
+                if do_visual_keying:
+                    matrix = obj.convert_space(pose_bone=pbone, matrix=pbone.matrix,
+                                               from_space='POSE', to_space='LOCAL')
+                else:
+                    matrix = pbone.matrix_basis
+                for row in matrix:
+                    matrices.extend(row)
+                if bbones is not None:
+                    for values, bb_prop in zip(bbones, BBONE_PROPS):
+                        values.append(getattr(pbone, bb_prop))
+            if do_object:
+                for row in obj_frame_info(obj):
+                    obj_matrices.extend(row)
+            continue
+
         if do_pose:
             pose_info.append((frame, *pose_frame_info(obj)))
         if do_object:
@@ -236,7 +276,7 @@ def bake_action_iter(
 
     # -------------------------------------------------------------------------
     # Clean (store initial data)
-    if do_clean and action is not None:
+    if do_clean and action is not None and not do_bulk:
         clean_orig_data = {fcu: {p.co[1] for p in fcu.keyframe_points} for fcu in action.fcurves}
     else:
         clean_orig_data = {}
@@ -265,7 +305,24 @@ def bake_action_iter(
     # Apply transformations to action
 
     # pose
-    if do_pose:
+    if do_pose and do_bulk:
+        for pbone, matrices, bbones in zip(pbones, pose_matrices, pose_bbones):
+            if do_constraint_clear:
+                while pbone.constraints:
+                    pbone.constraints.remove(pbone.constraints[0])
+
+            name = pbone.name
+            for prop, channels in _bake_matrices_to_channels(matrices, pbone.rotation_mode):
+                data_path = pbone.path_from_id(prop)
+                for index, values in enumerate(channels):
+                    _bake_fcurve_write(action, data_path, index, name, frames, values, do_clean)
+
+            # Bendy Bones
+            if bbones is not None:
+                for bb_prop, values in zip(BBONE_PROPS, bbones):
+                    _bake_fcurve_write(action, pbone.path_from_id(bb_prop), 0, name, frames, values, do_clean)
+
+    elif do_pose:
         for name, pbone in obj.pose.bones.items():
             if only_selected and not pbone.bone.select:
                 continue
@@ -318,7 +375,20 @@ def bake_action_iter(
                         pbone.keyframe_insert(bb_prop, index=-1, frame=f, group=name, options=options)
 
     # object. TODO. multiple objects
-    if do_object:
+    if do_object and do_bulk:
+        if do_constraint_clear:
+            while obj.constraints:
+                obj.constraints.remove(obj.constraints[0])
+
+        name = "Action Bake"  # XXX: placeholder
+        for prop, channels in _bake_matrices_to_channels(obj_matrices, obj.rotation_mode, obj=obj):
+            for index, values in enumerate(channels):
+                _bake_fcurve_write(action, prop, index, name, frames, values, do_clean)
+
+        if do_parents_clear:
+            obj.parent = None
+
+    elif do_object:
         if do_constraint_clear:
             while obj.constraints:
                 obj.constraints.remove(obj.constraints[0])
@@ -364,9 +434,9 @@ def bake_action_iter(
             obj.parent = None
 
     # -------------------------------------------------------------------------
-    # Clean
+    # Clean (done while writing F-Curves for bulk baking)
 
-    if do_clean:
+    if do_clean and not do_bulk:
         for fcu in action.fcurves:
             fcu_orig_data = clean_orig_data.get(fcu, set())
 
@@ -388,3 +458,192 @@ def bake_action_iter(
                     i += 1
 
     yield action
+
+
+def _bake_matrices_to_channels(matrices, rotation_mode, obj=None):
+    """
+    Decompose flat matrices into location, rotation & scale channels (one array per channel),
+    making rotations compatible with the previous frame.
+
+    When *obj* is passed, matrices are its basis matrices,
+    decomposed by setting them (to account for delta transforms).
+    """
+    from array import array
+    from mathutils import Matrix
+
+    frames_num = len(matrices) // 16
+    if rotation_mode == 'QUATERNION':
+        rotation_prop, rotation_len = "rotation_quaternion", 4
+    elif rotation_mode == 'AXIS_ANGLE':
+        rotation_prop, rotation_len = "rotation_axis_angle", 4
+    else:  # euler, XYZ, ZXY etc
+        rotation_prop, rotation_len = "rotation_euler", 3
+
+    location = [array('f', bytes(frames_num * 4)) for _ in range(3)]
+    rotation = [array('f', bytes(frames_num * 4)) for _ in range(rotation_len)]
+    scale = [array('f', bytes(frames_num * 4)) for _ in range(3)]
+
+    rotation_prev = None
+    for frame_index in range(frames_num):
+        i = frame_index * 16
+        matrix = Matrix((matrices[i:i + 4], matrices[i + 4:i + 8], matrices[i + 8:i + 12], matrices[i + 12:i + 16]))
+
+        if obj is not None:
+            obj.matrix_basis = matrix
+            loc = obj.location
+            size = obj.scale
+            if rotation_mode == 'QUATERNION':
+                rot = obj.rotation_quaternion.copy()
+            elif rotation_mode == 'AXIS_ANGLE':
+                rot = obj.rotation_axis_angle
+            else:
+                rot = obj.rotation_euler.copy()
+        else:
+            loc, quat, size = matrix.decompose()
+            if rotation_mode == 'QUATERNION':
+                rot = quat
+            elif rotation_mode == 'AXIS_ANGLE':
+                axis, angle = quat.to_axis_angle()
+                rot = (angle, *axis)
+            else:
+                rot = quat.to_euler(rotation_mode)
+
+        # Create compatible eulers, quats.
+        if rotation_len == 3 or rotation_mode == 'QUATERNION':
+            if rotation_prev is not None:
+                rot.make_compatible(rotation_prev)
+            rotation_prev = rot
+
+        for channels, values in ((location, loc), (rotation, rot), (scale, size)):
+            for channel, value in zip(channels, values):
+                channel[frame_index] = value
+
+    return (
+        ("location", location),
+        (rotation_prop, rotation),
+        ("scale", scale),
+    )
+
+
+# Settings of keyframes created by 'keyframe_points.add', used for baked keyframes.
+_KEYFRAME_ENUM_ATTRS = ("interpolation", "easing", "handle_left_type", "handle_right_type", "type")
+_KEYFRAME_ENUM_DEFAULTS = ('BEZIER', 'AUTO', 'AUTO_CLAMPED', 'AUTO_CLAMPED', 'KEYFRAME')
+_KEYFRAME_FLOAT_ATTRS = ("back", "amplitude", "period")
+_KEYFRAME_BOOL_ATTRS = ("select_control_point", "select_left_handle", "select_right_handle")
+
+
+def _bake_fcurve_write(action, data_path, index, group, frames, values, do_clean):
+    """
+    Write baked values on frames into an F-Curve (created when missing) at once.
+
+    Existing keyframes on frames which aren't baked are kept with all their settings,
+    baked keyframes use the settings of keyframes created by ``keyframe_points.add``.
+    """
+    from array import array
+
+    # Matches 'IS_EQF' used by 'INSERTKEY_NEEDED'.
+    FLT_EPSILON = 1.1920928955078125e-07
+
+    if not frames:
+        return
+
+    fcu = action.fcurves.find(data_path, index=index)
+    if fcu is None:
+        fcu = action.fcurves.new(data_path, index=index, action_group=group)
+    keyframe_points = fcu.keyframe_points
+    keyframes_num_orig = len(keyframe_points)
+
+    # Keyframes are (frame, value, index of the existing keyframe or -1 for baked ones).
+    # Keyframes 'INSERTKEY_NEEDED' keeps inserting them one by one:
+    # a keyframe which continues a run of equal values replaces the last one.
+    keyframes = []
+    for frame, value in zip(frames, values):
+        if (
+                len(keyframes) >= 2 and
+                abs(keyframes[-1][1] - value) < FLT_EPSILON and
+                abs(keyframes[-2][1] - keyframes[-1][1]) < FLT_EPSILON
+        ):
+            keyframes[-1] = (frame, value, -1)
+        else:
+            keyframes.append((frame, value, -1))
+
+    # Keep existing keyframes on frames which aren't baked.
+    values_orig = set()
+    if keyframes_num_orig:
+        co_orig = array('f', bytes(keyframes_num_orig * 2 * 4))
+        keyframe_points.foreach_get("co", co_orig)
+        values_orig.update(co_orig[1::2])
+        frames_set = set(frames)
+        keyframes_orig = [
+            (frame, value, i) for i, (frame, value) in enumerate(zip(co_orig[0::2], co_orig[1::2]))
+            if not (round(frame) in frames_set and abs(frame - round(frame)) < 0.01)
+        ]
+        if keyframes_orig:
+            keyframes.extend(keyframes_orig)
+            keyframes.sort(key=lambda keyframe: keyframe[0])
+
+    # Remove redundant keyframes, keeping the ones with values from before baking.
+    if do_clean and len(keyframes) > 2:
+        keyframes_clean = [keyframes[0]]
+        for i in range(1, len(keyframes) - 1):
+            val = keyframes[i][1]
+            if val not in values_orig:
+                val_prev = keyframes_clean[-1][1]
+                val_next = keyframes[i + 1][1]
+                if abs(val - val_prev) + abs(val - val_next) < 0.0001:
+                    continue
+            keyframes_clean.append(keyframes[i])
+        keyframes_clean.append(keyframes[-1])
+        keyframes = keyframes_clean
+
+    # Settings of existing keyframes, to write them back after reordering.
+    if keyframes_num_orig:
+        handles_orig = {}
+        for attr in ("handle_left", "handle_right"):
+            handles_orig[attr] = handle = array('f', bytes(keyframes_num_orig * 2 * 4))
+            keyframe_points.foreach_get(attr, handle)
+        settings_orig = {}
+        for attr in _KEYFRAME_FLOAT_ATTRS + _KEYFRAME_BOOL_ATTRS:
+            settings_orig[attr] = setting = array('f', bytes(keyframes_num_orig * 4))
+            keyframe_points.foreach_get(attr, setting)
+        enums_orig = [
+            tuple(getattr(keyframe, attr) for attr in _KEYFRAME_ENUM_ATTRS)
+            for keyframe in keyframe_points
+        ]
+
+    # Resize the keyframes array (removing from the end is cheap).
+    keyframes_num = len(keyframes)
+    if keyframes_num > keyframes_num_orig:
+        keyframe_points.add(keyframes_num - keyframes_num_orig)
+    else:
+        for _ in range(keyframes_num_orig - keyframes_num):
+            keyframe_points.remove(keyframe_points[-1], fast=True)
+
+    co = array('f', (x for keyframe in keyframes for x in keyframe[:2]))
+    keyframe_points.foreach_set("co", co)
+    if not keyframes_num_orig:
+        # Handles are recalculated by the update.
+        keyframe_points.foreach_set("handle_left", co)
+        keyframe_points.foreach_set("handle_right", co)
+    else:
+        # Only write settings which differ from the ones of the keyframe previously in this slot
+        # (keyframes added at the end use the default settings).
+        for i, (keyframe, (_frame, _value, i_orig)) in enumerate(zip(keyframe_points, keyframes)):
+            enums = _KEYFRAME_ENUM_DEFAULTS if i_orig == -1 else enums_orig[i_orig]
+            if enums != (enums_orig[i] if i < keyframes_num_orig else _KEYFRAME_ENUM_DEFAULTS):
+                for attr, value in zip(_KEYFRAME_ENUM_ATTRS, enums):
+                    setattr(keyframe, attr, value)
+
+        for attr, handle_orig in handles_orig.items():
+            handle = array('f', co)
+            for i, (_frame, _value, i_orig) in enumerate(keyframes):
+                if i_orig != -1:
+                    handle[i * 2:i * 2 + 2] = handle_orig[i_orig * 2:i_orig * 2 + 2]
+            keyframe_points.foreach_set(attr, handle)
+        for attr, setting_orig in settings_orig.items():
+            setting_default = 1.0 if attr in _KEYFRAME_BOOL_ATTRS else 0.0
+            keyframe_points.foreach_set(attr, array('f', (
+                setting_default if i_orig == -1 else setting_orig[i_orig]
+                for _frame, _value, i_orig in keyframes
+            )))
+    fcu.update()
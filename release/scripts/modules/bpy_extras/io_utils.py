@@ -31,7 +31,8 @@ __all__ = (
     "path_reference",
     "path_reference_copy",
     "path_reference_mode",
-    "unique_name"
+    "unique_name",
+    "UniqueNameAllocator",
 )
 
 import bpy
@@ -40,6 +41,7 @@ from bpy.props import (
     EnumProperty,
     StringProperty,
 )
+from collections import UserDict
 
 
 def _check_axis_conversion(op):
@@ -523,6 +525,81 @@ def path_reference_copy(copy_set, report=print):
                 traceback.print_exc()
 
 
+class UniqueNameAllocator(UserDict):
+    """
+    Dictionary of unique names (values) for their items (keys),
+    keeping track of the used names so allocating a new name doesn't depend
+    on the number of names already allocated.
+
+    This can be passed as the *name_dict* argument of :func:`unique_name`,
+    exporters naming many items should use it instead of a plain dictionary.
+
+    .. note::
+
+       Names are never released, removing items doesn't make their names available again.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._names = set()
+        # Next number to try for each (name, name_max, sep),
+        # all numbers below it are known to be used.
+        self._counts = {}
+        super().__init__(*args, **kwargs)
+
+    # All other methods adding items ('update', 'setdefault', ...) use this.
+    def __setitem__(self, key, name):
+        self.data[key] = name
+        self._names.add(name)
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def copy(self):
+        return self.__class__(self.data)
+
+    def allocate(self, key, name, name_max=-1, clean_func=None, sep="."):
+        """
+        Return the name of *key*, creating a unique one from *name* when *key* has none yet,
+        arguments match :func:`unique_name`.
+        """
+        name_new = self.get(key)
+        if name_new is not None:
+            return name_new
+
+        names = self._names
+        name_new = name_new_orig = (
+            name if clean_func is None
+            else clean_func(name)
+        )
+        if name_max != -1:
+            name_new = name_new[:name_max]
+
+        if name_new in names:
+            count_key = (name_new_orig, name_max, sep)
+            count = self._counts.get(count_key, 1)
+            while name_new in names:
+                if name_max == -1:
+                    name_new = "%s%s%03d" % (
+                        name_new_orig,
+                        sep,
+                        count,
+                    )
+                else:
+                    count_str = "%03d" % count
+                    name_new = "%.*s%s%s" % (
+                        name_max - (len(count_str) + 1),
+                        name_new_orig,
+                        sep,
+                        count_str,
+                    )
+                count += 1
+            self._counts[count_key] = count
+
+        self[key] = name_new
+        return name_new
+
+
 def unique_name(key, name, name_dict, name_max=-1, clean_func=None, sep="."):
     """
     Helper function for storing unique names which may have special characters
@@ -537,13 +614,17 @@ def unique_name(key, name, name_dict, name_max=-1, clean_func=None, sep="."):
     :arg name_dict: This is used to cache namespace to ensure no collisions
        occur, this should be an empty dict initially and only modified by this
        function.
-    :type name_dict: dict
+       Use a :class:`UniqueNameAllocator` when creating many names.
+    :type name_dict: dict or :class:`UniqueNameAllocator`
     :arg clean_func: Function to call on *name* before creating a unique value.
     :type clean_func: function
     :arg sep: Separator to use when between the name and a number when a
        duplicate name is found.
     :type sep: string
     """
+    if isinstance(name_dict, UniqueNameAllocator):
+        return name_dict.allocate(key, name, name_max=name_max, clean_func=clean_func, sep=sep)
+
     name_new = name_dict.get(key)
     if name_new is None:
         count = 1
@@ -552,6 +633,12 @@ def unique_name(key, name, name_dict, name_max=-1, clean_func=None, sep="."):
             name if clean_func is None
             else clean_func(name)
         )
+        if name_max != -1:
+            name_new = name_new[:name_max]
+
+        if name_new in name_dict_values:
+            # Avoid a linear search for every number tried.
+            name_dict_values = set(name_dict_values)
 
         if name_max == -1:
             while name_new in name_dict_values:
@@ -562,7 +649,6 @@ def unique_name(key, name, name_dict, name_max=-1, clean_func=None, sep="."):
                 )
                 count += 1
         else:
-            name_new = name_new[:name_max]
             while name_new in name_dict_values:
                 count_str = "%03d" % count
                 name_new = "%.*s%s%s" % (
@@ -23,30 +23,50 @@ __all__ = (
     "mesh_linked_triangles",
     "edge_face_count_dict",
     "edge_face_count",
+    "edge_face_count_array",
+    "edge_keys_array",
+    "loop_edge_keys_array",
+    "loop_triangle_edge_keys_array",
     "edge_loops_from_edges",
     "ngon_tessellate",
     "triangle_random_points",
 )
 
 
-def mesh_linked_uv_islands(mesh):
+def mesh_linked_uv_islands(mesh, *, use_island_index=False):
     """
     Splits the mesh into connected polygons, use this for separating cubes from
     other mesh elements within 1 mesh datablock.
 
     :arg mesh: the mesh used to group with.
     :type mesh: :class:`bpy.types.Mesh`
-    :return: lists of lists containing polygon indices
-    :rtype: list
+    :arg use_island_index: Return the island index of each polygon
+       instead of a list of polygon indices for each island.
+    :type use_island_index: bool
+    :return: lists of lists containing polygon indices,
+       or an array of island indices when *use_island_index* is enabled.
+    :rtype: list or :class:`array.array`
     """
-    uv_loops = [luv.uv[:] for luv in mesh.uv_layers.active.data]
-    poly_loops = [poly.loop_indices for poly in mesh.polygons]
+    from array import array
+
+    polygons = mesh.polygons
+    poly_len = len(polygons)
+    loop_len = len(mesh.loops)
+
+    uv_loops = array('f', [0.0]) * (loop_len * 2)
+    mesh.uv_layers.active.data.foreach_get("uv", uv_loops)
+    poly_loop_starts = array('i', [0]) * poly_len
+    poly_loop_totals = array('i', [0]) * poly_len
+    polygons.foreach_get("loop_start", poly_loop_starts)
+    polygons.foreach_get("loop_total", poly_loop_totals)
+
+    # Map each loop to the polygons sharing its UV coordinate.
     luv_hash = {}
     luv_hash_get = luv_hash.get
-    luv_hash_ls = [None] * len(uv_loops)
-    for pi, poly_indices in enumerate(poly_loops):
-        for li in poly_indices:
-            uv = uv_loops[li]
+    luv_hash_ls = [None] * loop_len
+    for pi, loop_start in enumerate(poly_loop_starts):
+        for li in range(loop_start, loop_start + poly_loop_totals[pi]):
+            uv = uv_loops[li * 2], uv_loops[li * 2 + 1]
             uv_hub = luv_hash_get(uv)
             if uv_hub is None:
                 uv_hub = luv_hash[uv] = [pi]
@@ -55,94 +75,190 @@ def mesh_linked_uv_islands(mesh):
             luv_hash_ls[li] = uv_hub
 
     poly_islands = []
+    poly_island_index = array('i', [-1]) * poly_len
+
+    for poly_index_init in range(poly_len):
+        if poly_island_index[poly_index_init] != -1:
+            continue
+
+        island_index = len(poly_islands)
+        island = [poly_index_init]
+        poly_island_index[poly_index_init] = island_index
+        poly_islands.append(island)
+
+        # Breadth first search, 'island' grows while iterating over it.
+        for poly_index in island:
+            loop_start = poly_loop_starts[poly_index]
+            loop_end = loop_start + poly_loop_totals[poly_index]
+            for li in range(loop_start, loop_end):
+                for poly_index_shared in luv_hash_ls[li]:
+                    if poly_island_index[poly_index_shared] == -1:
+                        poly_island_index[poly_index_shared] = island_index
+                        island.append(poly_index_shared)
+
+    if use_island_index:
+        return poly_island_index
+    return poly_islands
 
-    # 0 = none, 1 = added, 2 = searched
-    poly_tag = [0] * len(poly_loops)
-
-    while True:
-        poly_index = -1
-        for i in range(len(poly_loops)):
-            if poly_tag[i] == 0:
-                poly_index = i
-                break
-
-        if poly_index != -1:
-            island = [poly_index]
-            poly_tag[poly_index] = 1
-            poly_islands.append(island)
-        else:
-            break  # we're done
-
-        added = True
-        while added:
-            added = False
-            for poly_index in island[:]:
-                if poly_tag[poly_index] == 1:
-                    for li in poly_loops[poly_index]:
-                        for poly_index_shared in luv_hash_ls[li]:
-                            if poly_tag[poly_index_shared] == 0:
-                                added = True
-                                poly_tag[poly_index_shared] = 1
-                                island.append(poly_index_shared)
-                    poly_tag[poly_index] = 2
 
-    return poly_islands
+def _disjoint_set_find(parent, i):
+    # Find the root of 'i', halving the path on the way.
+    while parent[i] != i:
+        parent[i] = i = parent[parent[i]]
+    return i
 
 
-def mesh_linked_triangles(mesh):
+def mesh_linked_triangles(mesh, *, use_island_index=False):
     """
     Splits the mesh into connected triangles, use this for separating cubes from
     other mesh elements within 1 mesh datablock.
 
     :arg mesh: the mesh used to group with.
     :type mesh: :class:`bpy.types.Mesh`
-    :return: lists of lists containing triangles.
-    :rtype: list
+    :arg use_island_index: Return the group index of each triangle
+       instead of a list of triangles for each group.
+    :type use_island_index: bool
+    :return: lists of lists containing triangles,
+       or an array of group indices when *use_island_index* is enabled.
+    :rtype: list or :class:`array.array`
     """
+    from array import array
+
+    loop_triangles = mesh.loop_triangles
+    tri_len = len(loop_triangles)
+
+    tri_verts = array('i', [0]) * (tri_len * 3)
+    loop_triangles.foreach_get("vertices", tri_verts)
+
+    # Join the vertices of each triangle into connected sets.
+    vert_parent = array('i', range(len(mesh.vertices)))
+    for i in range(0, tri_len * 3, 3):
+        v0 = _disjoint_set_find(vert_parent, tri_verts[i])
+        for v in (tri_verts[i + 1], tri_verts[i + 2]):
+            v = _disjoint_set_find(vert_parent, v)
+            if v != v0:
+                # Join to the lowest index, so roots are stable.
+                if v < v0:
+                    v, v0 = v0, v
+                vert_parent[v] = v0
+
+    # Number groups in order of their first triangle.
+    tri_group_index = array('i', [0]) * tri_len
+    root_group_index = {}
+    for t in range(tri_len):
+        root = _disjoint_set_find(vert_parent, tri_verts[t * 3])
+        group_index = root_group_index.get(root)
+        if group_index is None:
+            group_index = root_group_index[root] = len(root_group_index)
+        tri_group_index[t] = group_index
+
+    if use_island_index:
+        return tri_group_index
+
+    tri_groups = [[] for _ in range(len(root_group_index))]
+    for t, group_index in zip(loop_triangles, tri_group_index):
+        tri_groups[group_index].append(t)
+    return tri_groups
+
+
+def _edge_keys_from_vertices(v1, v2):
+    """
+    Return a flat array of ordered vertex index pairs
+    from two arrays of vertex indices.
+    """
+    from array import array
+    edge_keys = array('i', [0]) * (len(v1) * 2)
+    edge_keys[0::2] = array('i', map(min, v1, v2))
+    edge_keys[1::2] = array('i', map(max, v1, v2))
+    return edge_keys
 
-    # Build vert face connectivity
-    vert_tris = [[] for i in range(len(mesh.vertices))]
-    for t in mesh.loop_triangles:
-        for v in t.vertices:
-            vert_tris[v].append(t)
 
-    # sort triangles into connectivity groups
-    tri_groups = [[t] for t in mesh.loop_triangles]
-    # map old, new tri location
-    tri_mapping = list(range(len(mesh.loop_triangles)))
+def edge_keys_array(mesh):
+    """
+    The same values as :class:`bpy.types.Mesh.edge_keys`,
+    without creating a tuple for each edge.
 
-    # Now clump triangles iteratively
-    ok = True
-    while ok:
-        ok = False
+    :return: flat array of ordered vertex index pairs for each edge.
+    :rtype: :class:`array.array`
+    """
+    from array import array
+    edge_verts = array('i', [0]) * (len(mesh.edges) * 2)
+    mesh.edges.foreach_get("vertices", edge_verts)
+    return _edge_keys_from_vertices(edge_verts[0::2], edge_verts[1::2])
 
-        for t in mesh.loop_triangles:
-            mapped_index = tri_mapping[t.index]
-            mapped_group = tri_groups[mapped_index]
 
-            for v in t.vertices:
-                for nxt_t in vert_tris[v]:
-                    if nxt_t != t:
-                        nxt_mapped_index = tri_mapping[nxt_t.index]
+def loop_edge_keys_array(mesh):
+    """
+    The same values as :class:`bpy.types.MeshPolygon.edge_keys`
+    for all polygons, without creating a tuple for each edge.
 
-                        # We are not a part of the same group
-                        if mapped_index != nxt_mapped_index:
-                            ok = True
+    :return: flat array of ordered vertex index pairs for each loop.
+    :rtype: :class:`array.array`
+    """
+    from array import array
+    polygons = mesh.polygons
+    loop_len = len(mesh.loops)
+    poly_len = len(polygons)
+
+    loop_verts = array('i', [0]) * loop_len
+    mesh.loops.foreach_get("vertex_index", loop_verts)
+    poly_loop_starts = array('i', [0]) * poly_len
+    poly_loop_totals = array('i', [0]) * poly_len
+    polygons.foreach_get("loop_start", poly_loop_starts)
+    polygons.foreach_get("loop_total", poly_loop_totals)
+
+    # The next loop in the polygon, wrapping the last loop to the first.
+    loop_next = array('i', range(1, loop_len + 1))
+    for loop_start, loop_total in zip(poly_loop_starts, poly_loop_totals):
+        loop_next[loop_start + loop_total - 1] = loop_start
+
+    return _edge_keys_from_vertices(
+        loop_verts,
+        array('i', map(loop_verts.__getitem__, loop_next)),
+    )
+
+
+def loop_triangle_edge_keys_array(mesh):
+    """
+    The same values as :class:`bpy.types.MeshLoopTriangle.edge_keys`
+    for all loop triangles, without creating a tuple for each edge.
 
-                            # Assign mapping to this group so they
-                            # all map to this group
-                            for grp_t in tri_groups[nxt_mapped_index]:
-                                tri_mapping[grp_t.index] = mapped_index
+    :return: flat array of ordered vertex index pairs,
+       three for each loop triangle.
+    :rtype: :class:`array.array`
+    """
+    from array import array
+    tri_verts = array('i', [0]) * (len(mesh.loop_triangles) * 3)
+    mesh.loop_triangles.foreach_get("vertices", tri_verts)
+
+    tri_verts_next = array('i', [0]) * len(tri_verts)
+    tri_verts_next[0::3] = tri_verts[1::3]
+    tri_verts_next[1::3] = tri_verts[2::3]
+    tri_verts_next[2::3] = tri_verts[0::3]
 
-                            # Move triangles into this group
-                            mapped_group.extend(tri_groups[nxt_mapped_index])
+    return _edge_keys_from_vertices(tri_verts, tri_verts_next)
 
-                            # remove reference to the list
-                            tri_groups[nxt_mapped_index] = None
 
-    # return all tri groups that are not null
-    # this is all the triangles that are connected in their own lists.
-    return [tg for tg in tri_groups if tg]
+def edge_face_count_array(mesh):
+    """
+    Count the faces using each edge, reading the edge of each loop.
+
+    Unlike :func:`edge_face_count`, edges sharing the same vertices
+    (only found in invalid meshes) are counted separately.
+
+    :return: face users for each item in mesh.edges.
+    :rtype: :class:`array.array`
+    """
+    from array import array
+    from collections import Counter
+
+    loop_edges = array('i', [0]) * len(mesh.loops)
+    mesh.loops.foreach_get("edge_index", loop_edges)
+
+    edge_face_count = array('i', [0]) * len(mesh.edges)
+    for edge_index, count in Counter(loop_edges).items():
+        edge_face_count[edge_index] = count
+    return edge_face_count
 
 
 def edge_face_count_dict(mesh):
@@ -151,17 +267,15 @@ def edge_face_count_dict(mesh):
        faces using each edge.
     :rtype: dict
     """
-
+    edge_keys = edge_keys_array(mesh)
     face_edge_count = {}
-    loops = mesh.loops
-    edges = mesh.edges
-    for poly in mesh.polygons:
-        for i in poly.loop_indices:
-            key = edges[loops[i].edge_index].key
-            try:
-                face_edge_count[key] += 1
-            except:
-                face_edge_count[key] = 1
+    face_edge_count_get = face_edge_count.get
+    for key, count in zip(
+            zip(edge_keys[0::2], edge_keys[1::2]),
+            edge_face_count_array(mesh),
+    ):
+        if count:
+            face_edge_count[key] = face_edge_count_get(key, 0) + count
 
     return face_edge_count
 
@@ -172,8 +286,9 @@ def edge_face_count(mesh):
     :rtype: list
     """
     edge_face_count = edge_face_count_dict(mesh)
-    get = dict.get
-    return [get(edge_face_count, ed.key, 0) for ed in mesh.edges]
+    get = edge_face_count.get
+    edge_keys = edge_keys_array(mesh)
+    return [get(key, 0) for key in zip(edge_keys[0::2], edge_keys[1::2])]
 
 
 def edge_loops_from_edges(mesh, edges=None):
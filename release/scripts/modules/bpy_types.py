@@ -113,19 +113,90 @@ class Collection(bpy_types.ID):
                      if self == obj.instance_collection)
 
 
+class _ObjectRelationsIndex:
+    """
+    Reverse lookup tables for object relationships,
+    built in a single pass over the blend-file data.
+
+    Used by :class:`Object` when enabled via
+    :func:`bpy.utils.object_relations_index_enable`.
+    """
+    __slots__ = (
+        "children",
+        "users_collection",
+        "users_scene",
+    )
+
+    def __init__(self, blend_data):
+        children = {}
+        for obj in blend_data.objects:
+            parent = obj.parent
+            if parent is not None:
+                children.setdefault(parent, []).append(obj)
+
+        # Keep the same order as the linear search:
+        # collections first, followed by the scenes master collections.
+        users_collection = {}
+        for collection in blend_data.collections:
+            for obj in collection.objects:
+                users_collection.setdefault(obj, []).append(collection)
+        for scene in blend_data.scenes:
+            collection = scene.collection
+            for obj in collection.objects:
+                users_collection.setdefault(obj, []).append(collection)
+
+        users_scene = {}
+        for scene in blend_data.scenes:
+            for obj in scene.objects:
+                users_scene.setdefault(obj, []).append(scene)
+
+        self.children = {
+            key: tuple(value) for key, value in children.items()
+        }
+        self.users_collection = {
+            key: tuple(value) for key, value in users_collection.items()
+        }
+        self.users_scene = {
+            key: tuple(value) for key, value in users_scene.items()
+        }
+
+
+# Only used when enabled, 'None' when the index needs to be (re)built.
+_object_relations_index_use = False
+_object_relations_index = None
+
+
+def _object_relations_index_get():
+    global _object_relations_index
+    if not _object_relations_index_use:
+        return None
+    if _object_relations_index is None:
+        import bpy
+        _object_relations_index = _ObjectRelationsIndex(bpy.data)
+    return _object_relations_index
+
+
 class Object(bpy_types.ID):
     __slots__ = ()
 
     @property
     def children(self):
-        """All the children of this object. Warning: takes O(len(bpy.data.objects)) time."""
+        """All the children of this object. Warning: takes O(len(bpy.data.objects)) time, unless the object relations index is enabled."""
+        index = _object_relations_index_get()
+        if index is not None:
+            return index.children.get(self, ())
+
         import bpy
         return tuple(child for child in bpy.data.objects
                      if child.parent == self)
 
     @property
     def users_collection(self):
-        """The collections this object is in. Warning: takes O(len(bpy.data.collections) + len(bpy.data.scenes)) time."""
+        """The collections this object is in. Warning: takes O(len(bpy.data.collections) + len(bpy.data.scenes)) time, unless the object relations index is enabled."""
+        index = _object_relations_index_get()
+        if index is not None:
+            return index.users_collection.get(self, ())
+
         import bpy
         return (
             tuple(
@@ -139,7 +210,11 @@ class Object(bpy_types.ID):
 
     @property
     def users_scene(self):
-        """The scenes this object is in. Warning: takes O(len(bpy.data.scenes) * len(bpy.data.objects)) time."""
+        """The scenes this object is in. Warning: takes O(len(bpy.data.scenes) * len(bpy.data.objects)) time, unless the object relations index is enabled."""
+        index = _object_relations_index_get()
+        if index is not None:
+            return index.users_scene.get(self, ())
+
         import bpy
         return tuple(scene for scene in bpy.data.scenes
                      if self in scene.objects[:])
@@ -297,12 +372,13 @@ class _GenericBone:
 
     @property
     def children_recursive(self):
-        """A list of all children from this bone. Warning: takes O(len(bones)**2) time."""
+        """A list of all children from this bone. Warning: takes O(len(bones)) time."""
+        depth_map = {self.name: 0}
         bones_children = []
         for bone in self._other_bones:
-            index = bone.parent_index(self)
-            if index:
-                bones_children.append((index, bone))
+            depth = _bone_depth_relative(bone, depth_map)
+            if depth > 0:
+                bones_children.append((depth, bone))
 
         # sort by distance to parent
         bones_children.sort(key=lambda bone_pair: bone_pair[0])
@@ -314,14 +390,15 @@ class _GenericBone:
         Returns a chain of children with the same base name as this bone.
         Only direct chains are supported, forks caused by multiple children
         with matching base names will terminate the function
-        and not be returned. Warning: takes O(len(bones)**2) time.
+        and not be returned. Warning: takes O(len(bones)) time.
         """
         basename = self.basename
         chain = []
+        children_map = self._children_map()
 
         child = self
         while True:
-            children = child.children
+            children = children_map.get(child.name, ())
             children_basename = []
 
             for child in children:
@@ -341,6 +418,18 @@ class _GenericBone:
 
         return chain
 
+    def _children_map(self):
+        """
+        Map bone names to a list of their direct children,
+        built in a single pass over the bones.
+        """
+        children_map = {}
+        for bone in self._other_bones:
+            parent = bone.parent
+            if parent:
+                children_map.setdefault(parent.name, []).append(bone)
+        return children_map
+
     @property
     def _other_bones(self):
         id_data = self.id_data
@@ -356,6 +445,34 @@ class _GenericBone:
         return bones
 
 
+def _bone_depth_relative(bone, depth_map):
+    """
+    Return the number of steps from *bone* up to the bone
+    stored with a depth of zero in *depth_map*, -1 when it's not a parent.
+
+    Depths found on the way are stored in *depth_map*,
+    so each bone is only visited once when called for all bones.
+    """
+    names = []
+    depth = -1
+    while bone:
+        name = bone.name
+        depth = depth_map.get(name)
+        if depth is not None:
+            break
+        names.append(name)
+        bone = bone.parent
+    else:
+        depth = -1
+
+    for name in reversed(names):
+        if depth != -1:
+            depth += 1
+        depth_map[name] = depth
+
+    return depth
+
+
 class PoseBone(StructRNA, _GenericBone, metaclass=StructMetaPropGroup):
     __slots__ = ()
 
@@ -421,6 +538,34 @@ def ord_ind(i1, i2):
     return i2, i1
 
 
+def _foreach_buffer(seq, typecode):
+    """
+    Return *seq* as a flat buffer of items matching
+    the :mod:`array` *typecode*, for use with ``foreach_set``.
+
+    Buffers of the right type are returned without copying their data,
+    other buffers and (nested) sequences are converted.
+    """
+    from array import array
+    try:
+        buf = memoryview(seq)
+    except TypeError:
+        if len(seq) and hasattr(seq[0], "__len__"):
+            from itertools import chain
+            seq = chain.from_iterable(seq)
+        return array(typecode, seq)
+
+    if buf.ndim != 1:
+        if buf.c_contiguous:
+            buf = buf.cast('B').cast(buf.format)
+        else:
+            buf = memoryview(buf.tobytes()).cast(buf.format)
+
+    if buf.format != typecode or not buf.c_contiguous:
+        return array(typecode, buf)
+    return buf
+
+
 class Mesh(bpy_types.ID):
     __slots__ = ()
 
@@ -487,6 +632,92 @@ class Mesh(bpy_types.ID):
                 calc_edges_loose=bool(edges),
             )
 
+    def from_buffers(self, vertices, faces=(), face_sizes=3, edges=()):
+        """
+        Make a mesh from flat arrays of vertices/faces/edges,
+        an alternative to :class:`Mesh.from_pydata` for large meshes
+        which avoids creating a Python object for each value.
+
+        Buffers (``array.array``, ``memoryview``, NumPy arrays... etc)
+        of 32 bit floats for coordinates and 32 bit signed integers for indices
+        are passed to ``foreach_set`` directly, other types are converted.
+
+        :arg vertices: X, Y, Z coordinates of all vertices,
+           flat or with a row per vertex.
+        :type vertices: buffer or sequence of floats
+        :arg faces: The vertex indices of all faces, one face after another.
+        :type faces: buffer or sequence of ints
+        :arg face_sizes:
+
+           The number of vertices in each face or a single number
+           when all faces have the same size, eg: 3 for triangles.
+
+        :type face_sizes: buffer or sequence of ints, or an int (at least 3)
+        :arg edges:
+
+           Pairs of vertex indices, flat or with a row per edge.
+
+           When empty, the edges are inferred from the polygons.
+
+        :type edges: buffer or sequence of ints
+
+        .. warning::
+
+           Invalid mesh data is **not** prevented,
+           see the warning for :class:`Mesh.from_pydata`.
+        """
+        from array import array
+        from itertools import accumulate, chain
+        from numbers import Integral
+
+        co = _foreach_buffer(vertices, 'f')
+        vertex_indices = _foreach_buffer(faces, 'i')
+        edge_indices = _foreach_buffer(edges, 'i')
+
+        loops_num = len(vertex_indices)
+
+        if isinstance(face_sizes, Integral):
+            # Also accepts NumPy integers.
+            face_sizes = int(face_sizes)
+            if face_sizes < 3:
+                raise ValueError("from_buffers: face size must be at least 3, not %d" % face_sizes)
+            if loops_num % face_sizes:
+                raise ValueError(
+                    "from_buffers: %d face indices can't be split "
+                    "into faces of size %d" % (loops_num, face_sizes)
+                )
+            faces_num = loops_num // face_sizes
+            loop_totals = array('i', (face_sizes,)) * faces_num
+            loop_starts = array('i', range(0, loops_num, face_sizes))
+        else:
+            loop_totals = _foreach_buffer(face_sizes, 'i')
+            faces_num = len(loop_totals)
+            loop_starts = array('i', chain((0,), accumulate(loop_totals)))
+            loops_total = loop_starts.pop()
+            if loops_total != loops_num:
+                raise ValueError(
+                    "from_buffers: face sizes add up to %d, "
+                    "expected %d face indices" % (loops_total, loops_num)
+                )
+
+        self.vertices.add(len(co) // 3)
+        self.edges.add(len(edge_indices) // 2)
+        self.loops.add(loops_num)
+        self.polygons.add(faces_num)
+
+        self.vertices.foreach_set("co", co)
+        self.edges.foreach_set("vertices", edge_indices)
+
+        self.polygons.foreach_set("loop_total", loop_totals)
+        self.polygons.foreach_set("loop_start", loop_starts)
+        self.polygons.foreach_set("vertices", vertex_indices)
+
+        if edge_indices or vertex_indices:
+            self.update(
+                calc_edges=bool(vertex_indices),
+                calc_edges_loose=bool(edge_indices),
+            )
+
     @property
     def edge_keys(self):
         return [ed.key for ed in self.edges]
@@ -543,7 +543,7 @@ def GetInfoOperatorRNA(bl_rna):
     return _GetInfoRNA(bl_rna, InfoOperatorRNA)
 
 
-def BuildRNAInfo():
+def _BuildRNAInfo():
 
     # needed on successive calls to prevent stale data access
     for cls in (InfoStructRNA, InfoFunctionRNA, InfoOperatorRNA, InfoPropertyRNA):
@@ -642,33 +642,37 @@ def BuildRNAInfo():
 
     del _bpy_types_iterator
 
-    structs.sort()  # not needed but speeds up sort below, setting items without an inheritance first
-
-    # Arrange so classes are always defined in the correct order
-    deps_ok = False
-    while deps_ok is False:
-        deps_ok = True
-        rna_done = set()
-
-        for i, (rna_base, identifier, rna_struct) in enumerate(structs):
-
-            rna_done.add(identifier)
-
-            if rna_base and rna_base not in rna_done:
-                deps_ok = False
-                data = structs.pop(i)
-                ok = False
-                while i < len(structs):
-                    if structs[i][1] == rna_base:
-                        structs.insert(i + 1, data)  # insert after the item we depend on.
-                        ok = True
-                        break
-                    i += 1
-
-                if not ok:
-                    print('Dependancy "%s" could not be found for "%s"' % (identifier, rna_base))
-
+    structs.sort()
+
+    # Arrange so classes are always defined in the correct order (bases before the structs using them),
+    # structs with a missing base are skipped.
+    structs_lookup = {item[1]: item for item in structs}
+    structs_ordered = []
+    structs_done = set()
+    structs_skip = set()
+    for item in structs:
+        # Add (not yet added) bases first, most base one first.
+        chain = []
+        chain_ok = True
+        while item is not None:
+            rna_base, identifier = item[:2]
+            if identifier in structs_done:
+                chain_ok = identifier not in structs_skip
                 break
+            structs_done.add(identifier)
+            chain.append(identifier)
+            item = None
+            if rna_base:
+                item = structs_lookup.get(rna_base)
+                if item is None:
+                    print('Dependancy "%s" could not be found for "%s"' % (identifier, rna_base))
+                    chain_ok = False
+        if chain_ok:
+            structs_ordered.extend(structs_lookup[identifier] for identifier in reversed(chain))
+        else:
+            structs_skip.update(chain)
+    structs = structs_ordered
+    del structs_lookup, structs_ordered, structs_done, structs_skip
 
     # Done ordering structs
 
@@ -797,6 +801,157 @@ def BuildRNAInfo():
     )
 
 
+# Increment when the layout of cached data changes.
+RNA_INFO_CACHE_VERSION = 1
+
+# Attributes referencing Blender data, which are not cached.
+_rna_info_cache_skip = {
+    InfoStructRNA: {"bl_rna", "py_class", "children"},
+    InfoPropertyRNA: {"bl_prop"},
+    InfoFunctionRNA: {"bl_func"},
+    InfoOperatorRNA: {"bl_op"},
+}
+
+
+def _rna_info_cache_key():
+    """
+    Data the cache depends on: Blender build and enabled add-ons.
+    """
+    return (
+        RNA_INFO_CACHE_VERSION,
+        bpy.app.version,
+        bpy.app.build_hash,
+        bpy.app.build_date,
+        bpy.app.build_time,
+        tuple(sorted(bpy.context.preferences.addons.keys())),
+    )
+
+
+def _rna_info_cache_write(filepath, key, lookups):
+    import pickle
+
+    infos = []
+    info_ids = {}
+    for lookup in lookups:
+        for info in lookup.values():
+            info_ids[id(info)] = len(infos)
+            infos.append(info)
+
+    # Functions are used as parent of their arguments.
+    functions = {id(info.bl_func): info for info in lookups[1].values()}
+    lookups_keys = [
+        [tuple(k if type(k) is str else functions.get(id(k), getattr(k, "identifier", "")) for k in key)
+         for key in lookup.keys()]
+        for lookup in lookups
+    ]
+
+    states = []
+    for info in infos:
+        cls = type(info)
+        skip = _rna_info_cache_skip[cls]
+        state = {attr: getattr(info, attr) for attr in cls.__slots__ if attr not in skip and hasattr(info, attr)}
+        if cls is InfoStructRNA:
+            py_class = info.py_class
+            state["py_class"] = (py_class.__module__, py_class.__qualname__) if py_class else None
+            state["children"] = [rna_struct.identifier for rna_struct in info.children]
+        states.append(state)
+
+    class InfoPickler(pickle.Pickler):
+        # Store references to other info as indices, so that the whole graph is not pickled recursively.
+        def persistent_id(self, obj):
+            return info_ids.get(id(obj))
+
+    with open(filepath, 'wb') as fh:
+        pickle.dump((key, [type(info).__name__ for info in infos]), fh, protocol=pickle.HIGHEST_PROTOCOL)
+        InfoPickler(fh, protocol=pickle.HIGHEST_PROTOCOL).dump((lookups_keys, states))
+
+
+def _rna_info_cache_read(filepath, key):
+    import pickle
+    import sys
+
+    with open(filepath, 'rb') as fh:
+        key_cache, infos_type = pickle.load(fh)
+        if key_cache != key:
+            return None
+
+        classes = {cls.__name__: cls for cls in _rna_info_cache_skip}
+        infos = [classes[cls_name].__new__(classes[cls_name]) for cls_name in infos_type]
+
+        class InfoUnpickler(pickle.Unpickler):
+            def persistent_load(self, pid):
+                return infos[pid]
+
+        lookups_keys, states = InfoUnpickler(fh).load()
+
+    for info, state in zip(infos, states):
+        cls = type(info)
+        for attr in _rna_info_cache_skip[cls]:
+            setattr(info, attr, None)
+        if cls is InfoStructRNA:
+            py_class = state.pop("py_class")
+            if py_class is not None:
+                module_name, qualname = py_class
+                py_class = sys.modules.get(module_name)
+                for attr in qualname.split("."):
+                    py_class = getattr(py_class, attr, None)
+            if py_class is None:
+                py_class = getattr(bpy.types, state["identifier"], None)
+            info.py_class = py_class
+            info.bl_rna = getattr(py_class, "bl_rna", None)
+        for attr, value in state.items():
+            setattr(info, attr, value)
+
+    # Nested structs are stored as RNA structs.
+    structs = {info.identifier: info for info in infos if type(info) is InfoStructRNA}
+    for info in structs.values():
+        info.children[:] = [
+            structs[identifier].bl_rna for identifier in info.children
+            if identifier in structs and structs[identifier].bl_rna is not None
+        ]
+
+    lookups = []
+    infos_iter = iter(infos)
+    for cls, lookup_keys in zip((InfoStructRNA, InfoFunctionRNA, InfoOperatorRNA, InfoPropertyRNA), lookups_keys):
+        cls.global_lookup.clear()
+        cls.global_lookup.update(zip(lookup_keys, infos_iter))
+        lookups.append(cls.global_lookup)
+    return tuple(lookups)
+
+
+def BuildRNAInfo(cache_filepath=None):
+    """
+    Return info on all RNA structs, functions, operators and properties, as dictionaries
+    (InfoStructRNA, InfoFunctionRNA, InfoOperatorRNA and InfoPropertyRNA lookups).
+
+    :arg cache_filepath: Optional file caching the info, it is loaded instead of walking ``bpy.types``
+       when it was written by the same Blender build with the same enabled add-ons (and written otherwise).
+       Note that the ``bl_prop``, ``bl_func`` and ``bl_op`` members of loaded info are None.
+    :type cache_filepath: string
+    """
+    if not cache_filepath:
+        return _BuildRNAInfo()
+
+    import os
+
+    key = _rna_info_cache_key()
+    if os.path.exists(cache_filepath):
+        try:
+            lookups = _rna_info_cache_read(cache_filepath, key)
+        except Exception as ex:
+            print("Unable to read RNA info cache %r: %s" % (cache_filepath, ex))
+            lookups = None
+        if lookups is not None:
+            return lookups
+
+    lookups = _BuildRNAInfo()
+    try:
+        _rna_info_cache_write(cache_filepath, key, lookups)
+    except Exception as ex:
+        print("Unable to write RNA info cache %r: %s" % (cache_filepath, ex))
+    return lookups
+
+
 def main():
     struct = BuildRNAInfo()[0]
     data = []
@@ -39,19 +39,24 @@ class Prefs(bpy.types.KeyConfigPreferences):
         split.column()
 
 
-blender_default = bpy.utils.execfile(os.path.join(DIRNAME, "keymap_data", "blender_default.py"))
+# Executed on demand, as generated data is cached (see 'keyconfig_data_from_file_cached').
+BLENDER_DEFAULT_FILEPATH = os.path.join(DIRNAME, "keymap_data", "blender_default.py")
 
 def load():
     from sys import platform
     from bpy import context
-    from bl_keymap_utils.io import keyconfig_init_from_data
+    from bl_keymap_utils.io import (
+        keyconfig_data_from_file_cached,
+        keyconfig_init_from_data,
+    )
 
     prefs = context.preferences
     kc = context.window_manager.keyconfigs.new(IDNAME)
     kc_prefs = kc.preferences
 
-    keyconfig_data = blender_default.generate_keymaps(
-        blender_default.Params(
+    keyconfig_data = keyconfig_data_from_file_cached(
+        BLENDER_DEFAULT_FILEPATH,
+        dict(
             select_mouse=kc_prefs.select_mouse,
             use_mouse_emulate_3_button=(
                 prefs.inputs.use_mouse_emulate_3_button and
@@ -12,18 +12,27 @@ def update_fn(_self, _context):
     load()
 
 
-industry_compatible = bpy.utils.execfile(os.path.join(DIRNAME, "keymap_data", "industry_compatible_data.py"))
+# Executed on demand, as generated data is cached (see 'keyconfig_data_from_file_cached').
+INDUSTRY_COMPATIBLE_FILEPATH = os.path.join(DIRNAME, "keymap_data", "industry_compatible_data.py")
+# Used by 'industry_compatible_data.generate_keymaps'.
+BLENDER_DEFAULT_FILEPATH = os.path.join(DIRNAME, "keymap_data", "blender_default.py")
 
 
 def load():
     from sys import platform
-    from bl_keymap_utils.io import keyconfig_init_from_data
+    from bl_keymap_utils.io import (
+        keyconfig_data_from_file_cached,
+        keyconfig_init_from_data,
+    )
 
     prefs = bpy.context.preferences
 
     kc = bpy.context.window_manager.keyconfigs.new(IDNAME)
-    params = industry_compatible.Params(use_mouse_emulate_3_button=prefs.inputs.use_mouse_emulate_3_button)
-    keyconfig_data = industry_compatible.generate_keymaps(params)
+    keyconfig_data = keyconfig_data_from_file_cached(
+        INDUSTRY_COMPATIBLE_FILEPATH,
+        dict(use_mouse_emulate_3_button=prefs.inputs.use_mouse_emulate_3_button),
+        filepaths_depends=(BLENDER_DEFAULT_FILEPATH,),
+    )
 
     if platform == 'darwin':
         from bl_keymap_utils.platform_helpers import keyconfig_data_oskey_from_ctrl_for_macos
@@ -19,6 +19,7 @@
 # <pep8 compliant>
 import bpy
 import os
+from math import hypot
 from bpy.types import Operator
 from bpy.props import FloatProperty
 from mathutils import (
@@ -105,6 +106,99 @@ def CLIP_track_view_selected(sc, track):
     return False
 
 
+def CLIP_tracks_marker_matrix(tracks, frame_start, frame_end):
+    """
+    Dense matrix of the marker positions of tracks over a frame range,
+    reading the markers of each track once.
+
+    Returns (co, valid) arrays with a row of ``frame_end - frame_start + 1``
+    frames per track: ``co`` stores (x, y) normalized marker positions,
+    ``valid`` is 1 where the track has a marker on the frame
+    (as found by ``track.markers.find_frame(frame)``).
+    """
+    from array import array
+
+    frames_num = frame_end - frame_start + 1
+    co = array('f', bytes(len(tracks) * frames_num * 2 * 4))
+    valid = array('B', bytes(len(tracks) * frames_num))
+
+    for track_index, track in enumerate(tracks):
+        markers = track.markers
+        markers_num = len(markers)
+        markers_frame = array('i', bytes(markers_num * 4))
+        markers_co = array('f', bytes(markers_num * 2 * 4))
+        markers.foreach_get("frame", markers_frame)
+        markers.foreach_get("co", markers_co)
+
+        row = track_index * frames_num - frame_start
+        for marker_index, frame in enumerate(markers_frame):
+            if frame_start <= frame <= frame_end:
+                index = row + frame
+                valid[index] = 1
+                co[index * 2] = markers_co[marker_index * 2]
+                co[index * 2 + 1] = markers_co[marker_index * 2 + 1]
+
+    return co, valid
+
+
+def CLIP_tracks_filter(clip, frame_start, frame_end, threshold):
+    """
+    Select the tracks with a marker velocity (in pixels) differing from
+    the average velocity of all tracks by more than *threshold* on a frame,
+    deselecting the other tracks with velocities in the frame range.
+
+    Returns the number of selected tracks.
+    """
+    width, height = clip.size[:]
+
+    tracks = clip.tracking.tracks[:]
+    # Include the frame before the range for the velocities of its first frame.
+    frames_num = frame_end - frame_start + 2
+    co, valid = CLIP_tracks_marker_matrix(tracks, frame_start - 1, frame_end)
+
+    # Velocities (in pixels) of tracks with markers in both a frame and the previous one.
+    velocities = [None] * len(tracks)
+    velocity_sum = [0.0] * (frames_num * 2)
+    velocity_num = [0] * frames_num
+    for track_index in range(len(tracks)):
+        row = track_index * frames_num
+        track_velocities = []
+        # Only check frames between the first and the last marker.
+        row_valid = valid[row:row + frames_num].tobytes()
+        for frame_index in range(max(row_valid.find(1), 0) + 1, row_valid.rfind(1) + 1):
+            index = row + frame_index
+            if valid[index] and valid[index - 1]:
+                velocity_x = (co[index * 2] - co[index * 2 - 2]) * width
+                velocity_y = (co[index * 2 + 1] - co[index * 2 - 1]) * height
+                track_velocities.append((frame_index, velocity_x, velocity_y))
+                velocity_sum[frame_index * 2] += velocity_x
+                velocity_sum[frame_index * 2 + 1] += velocity_y
+                velocity_num[frame_index] += 1
+        velocities[track_index] = track_velocities
+
+    # Find all tracks with markers that behave differently than the average,
+    # deselecting the other tracks with velocities.
+    tracks_to_clean = []
+    for track, track_velocities in zip(tracks, velocities):
+        if not track_velocities:
+            continue
+        is_clean = False
+        for frame_index, velocity_x, velocity_y in track_velocities:
+            num = velocity_num[frame_index]
+            distance = hypot(
+                velocity_sum[frame_index * 2] / num - velocity_x,
+                velocity_sum[frame_index * 2 + 1] / num - velocity_y,
+            )
+            if distance > threshold:
+                is_clean = True
+                break
+        track.select = is_clean
+        if is_clean:
+            tracks_to_clean.append(track)
+
+    return len(tracks_to_clean)
+
+
 def CLIP_default_settings_from_track(clip, track, framenr):
     settings = clip.tracking.settings
 
@@ -153,57 +247,12 @@ class CLIP_OT_filter_tracks(bpy.types.Operator):
 
     @staticmethod
     def _filter_values(context, threshold):
-
-        def get_marker_coordinates_in_pixels(clip_size, track, frame_number):
-            marker = track.markers.find_frame(frame_number)
-            return Vector((marker.co[0] * clip_size[0], marker.co[1] * clip_size[1]))
-
-        def marker_velocity(clip_size, track, frame):
-            marker_a = get_marker_coordinates_in_pixels(clip_size, track, frame)
-            marker_b = get_marker_coordinates_in_pixels(clip_size, track, frame - 1)
-            return marker_a - marker_b
-
         scene = context.scene
-        frame_start = scene.frame_start
-        frame_end = scene.frame_end
         clip = context.space_data.clip
-        clip_size = clip.size[:]
 
         bpy.ops.clip.clean_tracks(frames=10, action='DELETE_TRACK')
 
-        tracks_to_clean = set()
-
-        for frame in range(frame_start, frame_end + 1):
-
-            # Find tracks with markers in both this frame and the previous one.
-            relevant_tracks = [
-                track for track in clip.tracking.tracks
-                if (track.markers.find_frame(frame) and
-                    track.markers.find_frame(frame - 1))
-            ]
-
-            if not relevant_tracks:
-                continue
-
-            # Get average velocity and deselect track.
-            average_velocity = Vector((0.0, 0.0))
-            for track in relevant_tracks:
-                track.select = False
-                average_velocity += marker_velocity(clip_size, track, frame)
-            if len(relevant_tracks) >= 1:
-                average_velocity = average_velocity / len(relevant_tracks)
-
-            # Then find all markers that behave differently than the average.
-            for track in relevant_tracks:
-                track_velocity = marker_velocity(clip_size, track, frame)
-                distance = (average_velocity - track_velocity).length
-
-                if distance > threshold:
-                    tracks_to_clean.add(track)
-
-        for track in tracks_to_clean:
-            track.select = True
-        return len(tracks_to_clean)
+        return CLIP_tracks_filter(clip, scene.frame_start, scene.frame_end, threshold)
 
     @classmethod
     def poll(cls, context):
@@ -117,12 +117,14 @@ class BakeToKeyframes(Operator):
         return (obj and obj.rigid_body)
 
     def execute(self, context):
-        bake = []
-        objects = []
+        from array import array
+        from bpy_extras.anim_utils import _bake_fcurve_write
+
         scene = context.scene
         frame_orig = scene.frame_current
         frames_step = range(self.frame_start, self.frame_end + 1, self.step)
         frames_full = range(self.frame_start, self.frame_end + 1)
+        frames_num = len(frames_step)
 
         # filter objects selection
         for obj in context.selected_objects:
@@ -132,70 +134,107 @@ class BakeToKeyframes(Operator):
         objects = context.selected_objects
 
         if objects:
-            # store transformation data
-            # need to start at scene start frame so simulation is run from the beginning
+            # Per object: rotation data path & the values of its location
+            # and rotation channels for each baked frame.
+            bake = []
+            for obj in objects:
+                rot_mode = obj.rotation_mode
+                if rot_mode == 'QUATERNION':
+                    rot_path, rot_len = "rotation_quaternion", 4
+                elif rot_mode == 'AXIS_ANGLE':
+                    rot_path, rot_len = "rotation_axis_angle", 4
+                else:  # euler
+                    rot_path, rot_len = "rotation_euler", 3
+                channels = [
+                    array('f', bytes(frames_num * 4))
+                    for _ in range(3 + rot_len)
+                ]
+                bake.append((rot_path, channels))
+
+            # Convert world space transform to parent space,
+            # so parented objects don't get offset after baking.
+            parent_matrix_inverse = [
+                obj.matrix_parent_inverse.inverted() if obj.parent else None
+                for obj in objects
+            ]
+            rot_prev = [None] * len(objects)
+
+            # Step through the frames once, storing transformations of baked
+            # frames, need to start at scene start frame so simulation
+            # is run from the beginning.
             for f in frames_full:
                 scene.frame_set(f)
-                if f in frames_step:
-                    mat = {}
-                    for i, obj in enumerate(objects):
-                        mat[i] = obj.matrix_world.copy()
-                    bake.append(mat)
+                frame_index, frame_offset = divmod(
+                    f - self.frame_start, self.step,
+                )
+                if frame_offset != 0:
+                    continue
 
-            # apply transformations as keyframes
-            for i, f in enumerate(frames_step):
-                scene.frame_set(f)
                 for j, obj in enumerate(objects):
-                    mat = bake[i][j]
-                    # Convert world space transform to parent space, so parented objects don't get offset after baking.
+                    mat = obj.matrix_world
                     if obj.parent:
-                        mat = obj.matrix_parent_inverse.inverted() @ obj.parent.matrix_world.inverted() @ mat
-
-                    obj.location = mat.to_translation()
+                        mat = (
+                            parent_matrix_inverse[j] @
+                            obj.parent.matrix_world.inverted() @
+                            mat
+                        )
 
                     rot_mode = obj.rotation_mode
                     if rot_mode == 'QUATERNION':
-                        q1 = obj.rotation_quaternion
-                        q2 = mat.to_quaternion()
+                        rot = mat.to_quaternion()
                         # make quaternion compatible with the previous one
-                        if q1.dot(q2) < 0.0:
-                            obj.rotation_quaternion = -q2
-                        else:
-                            obj.rotation_quaternion = q2
+                        q_prev = rot_prev[j]
+                        if q_prev is None:
+                            q_prev = obj.rotation_quaternion
+                        if q_prev.dot(rot) < 0.0:
+                            rot.negate()
                     elif rot_mode == 'AXIS_ANGLE':
-                        # this is a little roundabout but there's no better way right now
-                        aa = mat.to_quaternion().to_axis_angle()
-                        obj.rotation_axis_angle = (aa[1], *aa[0])
+                        axis, angle = mat.to_quaternion().to_axis_angle()
+                        rot = (angle, *axis)
                     else:  # euler
-                        # make sure euler rotation is compatible to previous frame
-                        # NOTE: assume that on first frame, the starting rotation is appropriate
-                        obj.rotation_euler = mat.to_euler(rot_mode, obj.rotation_euler)
+                        # make sure euler rotation is compatible to previous
+                        # frame, assume that on first frame, the starting
+                        # rotation is appropriate
+                        eul_prev = rot_prev[j]
+                        if eul_prev is None:
+                            eul_prev = obj.rotation_euler
+                        rot = mat.to_euler(rot_mode, eul_prev)
+                    rot_prev[j] = rot
+
+                    channels = bake[j][1]
+                    for channel, value in zip(
+                            channels, (*mat.to_translation(), *rot),
+                    ):
+                        channel[frame_index] = value
 
-                bpy.ops.anim.keyframe_insert(type='BUILTIN_KSI_LocRot', confirm_success=False)
+            # apply transformations as keyframes
+            frames = list(frames_step)
+            for obj, (rot_path, channels) in zip(objects, bake):
+                anim_data = obj.animation_data_create()
+                action = anim_data.action
+                if action is None:
+                    action = bpy.data.actions.new(obj.name + "Action")
+                    action.id_root = 'OBJECT'
+                    anim_data.action = action
+                for data_path, index, values in (
+                        *(("location", i, channels[i]) for i in range(3)),
+                        *((rot_path, i, channels[3 + i])
+                          for i in range(len(channels) - 3)),
+                ):
+                    _bake_fcurve_write(
+                        action, data_path, index, "Object Transforms",
+                        frames, values, do_clean=True,
+                    )
+                    # Use linear interpolation for better visual results.
+                    # NOTE: enum properties don't support 'foreach_set'.
+                    fcu = action.fcurves.find(data_path, index=index)
+                    if fcu is not None:
+                        for keyframe in fcu.keyframe_points:
+                            keyframe.interpolation = 'LINEAR'
 
             # remove baked objects from simulation
             bpy.ops.rigidbody.objects_remove()
 
-            # clean up keyframes
-            for obj in objects:
-                action = obj.animation_data.action
-                for fcu in action.fcurves:
-                    keyframe_points = fcu.keyframe_points
-                    i = 1
-                    # remove unneeded keyframes
-                    while i < len(keyframe_points) - 1:
-                        val_prev = keyframe_points[i - 1].co[1]
-                        val_next = keyframe_points[i + 1].co[1]
-                        val = keyframe_points[i].co[1]
-
-                        if abs(val - val_prev) + abs(val - val_next) < 0.0001:
-                            keyframe_points.remove(keyframe_points[i])
-                        else:
-                            i += 1
-                    # use linear interpolation for better visual results
-                    for keyframe in keyframe_points:
-                        keyframe.interpolation = 'LINEAR'
-
             # return to the frame we started on
             scene.frame_set(frame_orig)
 
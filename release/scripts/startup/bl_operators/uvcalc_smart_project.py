@@ -25,6 +25,8 @@ from mathutils import (
 )
 import bpy
 from bpy.types import Operator
+from bpy_types import ord_ind
+from array import array
 
 DEG_TO_RAD = 0.017453292519943295  # pi/180.0
 # see bugs:
@@ -33,10 +35,9 @@ DEG_TO_RAD = 0.017453292519943295  # pi/180.0
 SMALL_NUM = 1e-12
 
 
-global USER_FILL_HOLES
-global USER_FILL_HOLES_QUALITY
-USER_FILL_HOLES = None
-USER_FILL_HOLES_QUALITY = None
+# Inverted matrices of 2D triangles used by 'pointInTri2D',
+# cleared after each projection.
+dict_matrix = {}
 
 
 def pointInTri2D(v, v1, v2, v3):
@@ -148,7 +149,7 @@ def island2Edge(island):
         for vIdx in range(len(f_uvkey)):
             unique_points[f_uvkey[vIdx]] = f.uv[vIdx]
 
-            if f.v[vIdx].index > f.v[vIdx - 1].index:
+            if f.v[vIdx] > f.v[vIdx - 1]:
                 i1 = vIdx - 1
                 i2 = vIdx
             else:
@@ -194,32 +195,142 @@ def pointInIsland(pt, island):
     return False
 
 
+class UvGrid:
+    """
+    Uniform grid of items with 2D bounds (edges, triangles or points),
+    used to only test the items near a point or box.
+    """
+    __slots__ = ("cell_size_inv", "cells")
+
+    def __init__(self, items_bounds, width, height):
+        from math import sqrt
+        # Roughly one item per cell.
+        cells_per_axis = max(1, int(sqrt(len(items_bounds))))
+        self.cell_size_inv = cells_per_axis / max(width, height, SMALL_NUM)
+        cells = self.cells = {}
+        for item, minx, miny, maxx, maxy in items_bounds:
+            for key in self._cell_keys(minx, miny, maxx, maxy):
+                cell = cells.get(key)
+                if cell is None:
+                    cells[key] = [item]
+                else:
+                    cell.append(item)
+
+    def _cell_keys(self, minx, miny, maxx, maxy):
+        from math import floor
+        inv = self.cell_size_inv
+        x_range = range(floor(minx * inv), floor(maxx * inv) + 1)
+        return [
+            (ix, iy)
+            for iy in range(floor(miny * inv), floor(maxy * inv) + 1)
+            for ix in x_range
+        ]
+
+    def query_point(self, x, y):
+        from math import floor
+        inv = self.cell_size_inv
+        return self.cells.get((floor(x * inv), floor(y * inv)), ())
+
+    def query_box(self, minx, miny, maxx, maxy):
+        cells_get = self.cells.get
+        keys = self._cell_keys(minx, miny, maxx, maxy)
+        if len(keys) == 1:
+            return cells_get(keys[0], ())
+        # Items may be in multiple cells.
+        items = {}
+        for key in keys:
+            for item in cells_get(key, ()):
+                items[id(item)] = item
+        return items.values()
+
+
+def islandGrids(island):
+    """
+    Return the (edges, triangles, points) grids for a decorated island,
+    building them when they're not yet cached.
+    """
+    grids = island[8]
+    if grids is not None:
+        return grids
+
+    w = island[4]
+    h = island[5]
+
+    edge_bounds = []
+    for ed in island[6]:
+        v1, v2 = ed[0], ed[1]
+        edge_bounds.append((
+            ed,
+            min(v1.x, v2.x), min(v1.y, v2.y),
+            max(v1.x, v2.x), max(v1.y, v2.y),
+        ))
+
+    # Use the same triangles as 'pointInIsland'.
+    tri_bounds = []
+    for f in island[0]:
+        f_uv = f.uv
+        tris_index = ((0, 1, 2), (0, 2, 3)) if len(f.v) == 4 else ((0, 1, 2),)
+        for i1, i2, i3 in tris_index:
+            uv1, uv2, uv3 = f_uv[i1], f_uv[i2], f_uv[i3]
+            tri = (
+                Vector((uv1.x, uv1.y, 0.0)),
+                Vector((uv2.x, uv2.y, 0.0)),
+                Vector((uv3.x, uv3.y, 0.0)),
+            )
+            tri_bounds.append((
+                tri,
+                min(uv1.x, uv2.x, uv3.x), min(uv1.y, uv2.y, uv3.y),
+                max(uv1.x, uv2.x, uv3.x), max(uv1.y, uv2.y, uv3.y),
+            ))
+
+    point_bounds = [(pv, pv.x, pv.y, pv.x, pv.y) for pv in island[7]]
+
+    grids = island[8] = (
+        UvGrid(edge_bounds, w, h),
+        UvGrid(tri_bounds, w, h),
+        UvGrid(point_bounds, w, h),
+    )
+    return grids
+
+
+def pointInTriGrid(pt, tri_grid):
+    for tri in tri_grid.query_point(pt.x, pt.y):
+        if pointInTri2D(pt, *tri):
+            return True
+    return False
+
+
 # box is (left,bottom, right, top)
 def islandIntersectUvIsland(source, target, SourceOffset):
     # Is 1 point in the box, inside the vertLoops
-    edgeLoopsSource = source[6]  # Pretend this is offset
-    edgeLoopsTarget = target[6]
+    edgeGridTarget, triGridTarget, pointGridTarget = islandGrids(target)
+    triGridSource = islandGrids(source)[1]
 
     # Edge intersect test
-    for ed in edgeLoopsSource:
-        for seg in edgeLoopsTarget:
-            i = geometry.intersect_line_line_2d(seg[0],
-                                                seg[1],
-                                                SourceOffset + ed[0],
-                                                SourceOffset + ed[1],
-                                                )
+    for ed in source[6]:
+        v1 = SourceOffset + ed[0]
+        v2 = SourceOffset + ed[1]
+        for seg in edgeGridTarget.query_box(
+                min(v1.x, v2.x), min(v1.y, v2.y),
+                max(v1.x, v2.x), max(v1.y, v2.y),
+        ):
+            i = geometry.intersect_line_line_2d(seg[0], seg[1], v1, v2)
             if i:
                 return 1  # LINE INTERSECTION
 
     # 1 test for source being totally inside target
     SourceOffset.resize_3d()
     for pv in source[7]:
-        if pointInIsland(pv + SourceOffset, target[0]):
+        if pointInTriGrid(pv + SourceOffset, triGridTarget):
             return 2  # SOURCE INSIDE TARGET
 
     # 2 test for a part of the target being totally inside the source.
-    for pv in target[7]:
-        if pointInIsland(pv - SourceOffset, source[0]):
+    # Only target points within the source bounds can be inside it.
+    for pv in pointGridTarget.query_box(
+            SourceOffset.x, SourceOffset.y,
+            SourceOffset.x + source[4], SourceOffset.y + source[5],
+    ):
+        if pointInTriGrid(pv - SourceOffset, triGridSource):
             return 3  # PART OF TARGET INSIDE SOURCE.
 
     return 0  # NO INTERSECTION
@@ -251,10 +362,7 @@ def optiRotateUvIsland(faces):
 
 
 # Takes an island list and tries to find concave, hollow areas to pack smaller islands into.
-def mergeUvIslands(islandList):
-    global USER_FILL_HOLES
-    global USER_FILL_HOLES_QUALITY
-
+def mergeUvIslands(islandList, fill_holes_quality=50):
     # Pack islands to bottom LHS
     # Sync with island
 
@@ -292,6 +400,7 @@ def mergeUvIslands(islandList):
             h,
             edges,
             uniqueEdgePoints,
+            None,  # Grids for intersection tests, see 'islandGrids'.
         ])
 
     # Sort by island bounding box area, smallest face area first.
@@ -305,17 +414,20 @@ def mergeUvIslands(islandList):
     # decoratedIslandListEfficSort.sort(lambda A, B: cmp(B[2], A[2]))
 
     decoratedIslandListEfficSort.sort(key=lambda A: -A[2])
+    # Efficiency only decreases as islands are merged, so once the initial
+    # efficiency is too low to fit the source, all following islands can be skipped.
+    efficSortInitial = [A[2] for A in decoratedIslandListEfficSort]
 
     # ================================================== THESE CAN BE TWEAKED.
     # This is a quality value for the number of tests.
     # from 1 to 4, generic quality value is from 1 to 100
-    USER_STEP_QUALITY = ((USER_FILL_HOLES_QUALITY - 1) / 25.0) + 1
+    USER_STEP_QUALITY = ((fill_holes_quality - 1) / 25.0) + 1
 
     # If 100 will test as long as there is enough free space.
     # this is rarely enough, and testing takes a while, so lower quality speeds this up.
 
     # 1 means they have the same quality
-    USER_FREE_SPACE_TO_TEST_QUALITY = 1 + (((100 - USER_FILL_HOLES_QUALITY) / 100.0) * 5)
+    USER_FREE_SPACE_TO_TEST_QUALITY = 1 + (((100 - fill_holes_quality) / 100.0) * 5)
 
     # print 'USER_STEP_QUALITY', USER_STEP_QUALITY
     # print 'USER_FREE_SPACE_TO_TEST_QUALITY', USER_FREE_SPACE_TO_TEST_QUALITY
@@ -323,19 +435,16 @@ def mergeUvIslands(islandList):
     removedCount = 0
 
     areaIslandIdx = 0
-    ctrl = Window.Qual.CTRL
-    BREAK = False
-    while areaIslandIdx < len(decoratedIslandListAreaSort) and not BREAK:
+    while areaIslandIdx < len(decoratedIslandListAreaSort):
         sourceIsland = decoratedIslandListAreaSort[areaIslandIdx]
         # Already packed?
         if not sourceIsland[0]:
             areaIslandIdx += 1
         else:
             efficIslandIdx = 0
-            while efficIslandIdx < len(decoratedIslandListEfficSort) and not BREAK:
+            while efficIslandIdx < len(decoratedIslandListEfficSort):
 
-                if Window.GetKeyQualifiers() & ctrl:
-                    BREAK = True
+                if efficSortInitial[efficIslandIdx] <= (sourceIsland[1] * USER_FREE_SPACE_TO_TEST_QUALITY):
                     break
 
                 # Now we have 2 islands, if the efficiency of the islands lowers there's an
@@ -455,6 +564,9 @@ def mergeUvIslands(islandList):
 
                                 del sourceIsland[7][:]
 
+                                # Rebuild on next use.
+                                targetIsland[8] = None
+
                                 # Decrement the efficiency
                                 targetIsland[1] += sourceIsland[1]  # Increment totFaceArea
                                 targetIsland[2] -= sourceIsland[1]  # Decrement efficiency
@@ -487,10 +599,15 @@ def mergeUvIslands(islandList):
 def getUvIslands(faceGroups, me):
 
     # Get seams so we don't cross over seams
-    edge_seams = {}  # should be a set
-    for ed in me.edges:
-        if ed.use_seam:
-            edge_seams[ed.key] = None  # dummy var- use sets!
+    edges_len = len(me.edges)
+    edge_verts = array('i', [0]) * (edges_len * 2)
+    edge_use_seam = array('b', [False]) * edges_len
+    me.edges.foreach_get("vertices", edge_verts)
+    me.edges.foreach_get("use_seam", edge_use_seam)
+    edge_seams = {
+        ord_ind(edge_verts[i * 2], edge_verts[i * 2 + 1])
+        for i in range(edges_len) if edge_use_seam[i]
+    }
     # Done finding seams
 
     islandList = []
@@ -570,10 +687,11 @@ def getUvIslands(faceGroups, me):
     return islandList
 
 
-def packIslands(islandList):
-    if USER_FILL_HOLES:
-        # XXX  Window.DrawProgressBar(0.1, 'Merging Islands (Ctrl: skip merge)...')
-        mergeUvIslands(islandList)  # Modify in place
+def packIslands(islandList, settings):
+    if settings.fill_holes:
+        mergeUvIslands(islandList, settings.fill_holes_quality)  # Modify in place
+
+    island_margin = settings.island_margin
 
     # Now we have UV islands, we need to pack them.
 
@@ -592,11 +710,11 @@ def packIslands(islandList):
 
         w, h = maxx - minx, maxy - miny
 
-        if USER_ISLAND_MARGIN:
-            minx -= USER_ISLAND_MARGIN * w / 2
-            miny -= USER_ISLAND_MARGIN * h / 2
-            maxx += USER_ISLAND_MARGIN * w / 2
-            maxy += USER_ISLAND_MARGIN * h / 2
+        if island_margin:
+            minx -= island_margin * w / 2
+            miny -= island_margin * h / 2
+            maxx += island_margin * w / 2
+            maxy += island_margin * h / 2
 
             # recalc width and height
             w, h = maxx - minx, maxy - miny
@@ -639,7 +757,7 @@ def packIslands(islandList):
     # Having these here avoids divide by 0
     if islandIdx:
 
-        if USER_STRETCH_ASPECT:
+        if settings.stretch_to_bounds:
             # Maximize to uv area?? Will write a normalize function.
             xfactor = 1.0 / packWidth
             yfactor = 1.0 / packHeight
@@ -666,40 +784,327 @@ def VectoQuat(vec):
 
 
 class thickface:
-    __slost__ = "v", "uv", "no", "area", "edge_keys"
+    __slots__ = "v", "uv", "no", "area", "edge_keys", "loop_start"
+
+    def __init__(self, vertices, no, area, loop_start):
+        # Vertex indices.
+        self.v = vertices
+        # UV's are written back to the mesh once they're packed.
+        self.uv = [Vector((0.0, 0.0)) for _ in vertices]
+
+        self.no = no
+        self.area = area
+        self.loop_start = loop_start
+        self.edge_keys = [
+            ord_ind(vertices[i - 1], vertices[i])
+            for i in range(len(vertices))
+        ]
 
-    def __init__(self, face, uv_layer, mesh_verts):
-        self.v = [mesh_verts[i] for i in face.vertices]
-        self.uv = [uv_layer[i].uv for i in face.loop_indices]
 
-        self.no = face.normal.copy()
-        self.area = face.area
-        self.edge_keys = face.edge_keys
+class SmartProjectSettings:
+    """
+    Settings for :func:`smart_project_meshes`.
+    """
+    __slots__ = (
+        "projection_limit",
+        "user_area_weight",
+        "island_margin",
+        "stretch_to_bounds",
+        "only_selected_faces",
+        "share_space",
+        "fill_holes",
+        "fill_holes_quality",
+    )
 
+    def __init__(
+            self, *,
+            projection_limit=66.0,
+            user_area_weight=0.0,
+            island_margin=0.0,
+            stretch_to_bounds=True,
+            only_selected_faces=False,
+            share_space=True,
+            fill_holes=False,
+            fill_holes_quality=50,
+    ):
+        # Angle limit in degrees.
+        self.projection_limit = projection_limit
+        self.user_area_weight = user_area_weight
+        self.island_margin = island_margin
+        self.stretch_to_bounds = stretch_to_bounds
+        self.only_selected_faces = only_selected_faces
+        # Pack the islands of all meshes into the same UV space.
+        self.share_space = share_space
+        # Pack smaller islands into the free space of larger islands.
+        self.fill_holes = fill_holes
+        # 1 to 100, higher tests more positions.
+        self.fill_holes_quality = fill_holes_quality
+
+
+def projectionVecsFromNormals(face_nos, face_weights, settings):
+    """
+    Pick projection vectors for faces with normals *face_nos*
+    (flat X, Y, Z values), sorted by area (largest first).
+
+    Faces are added to the first projection within half the angle limit,
+    new projections are made from the face most different
+    to all existing projections, until all faces are within the angle limit.
+
+    :arg face_weights: Weight of each face for averaging projections.
+    :return: A list of normalized (X, Y, Z) tuples.
+    """
+    from math import cos, sqrt
+
+    limit = cos(settings.projection_limit * DEG_TO_RAD)
+    limit_half = cos((settings.projection_limit / 2) * DEG_TO_RAD)
+
+    projectVecs = []
+
+    # Face indices not yet used for a projection.
+    tempMeshFaces = list(range(len(face_weights)))
+    # The closest projection of each face (as a dot product).
+    face_angle_best = [-1.0] * len(face_weights)
+
+    newProjectVec = face_nos[0:3]
+    newProjectMeshFaces = []
+
+    # This while only gathers projection vecs, faces are assigned later on.
+    while True:
+        # add all the faces that are close.
+        # Use half the angle limit so we don't overweight faces towards this
+        # normal and hog all the faces.
+        px, py, pz = newProjectVec
+        face_is_close = [
+            (face_nos[i * 3] * px + face_nos[i * 3 + 1] * py + face_nos[i * 3 + 2] * pz) > limit_half
+            for i in tempMeshFaces
+        ]
+        newProjectMeshFaces.extend(
+            i for i, is_close in zip(reversed(tempMeshFaces), reversed(face_is_close)) if is_close
+        )
+        tempMeshFaces = [i for i, is_close in zip(tempMeshFaces, face_is_close) if not is_close]
+
+        # Add the average of all these faces normals as a projectionVec
+        ax = ay = az = 0.0
+        for i in newProjectMeshFaces:
+            weight = face_weights[i]
+            ax += face_nos[i * 3] * weight
+            ay += face_nos[i * 3 + 1] * weight
+            az += face_nos[i * 3 + 2] * weight
+
+        if ax != 0 or ay != 0 or az != 0:  # Avoid NAN
+            length = sqrt(ax * ax + ay * ay + az * az)
+            px, py, pz = ax / length, ay / length, az / length
+            projectVecs.append((px, py, pz))
+
+            # Update the closest angle of each face to any projection.
+            for i in tempMeshFaces:
+                angle = face_nos[i * 3] * px + face_nos[i * 3 + 1] * py + face_nos[i * 3 + 2] * pz
+                if face_angle_best[i] < angle:
+                    face_angle_best[i] = angle
+
+        # Get the next vec!
+        # Pick the face that's most different to all existing angles :)
+        mostUniqueAngle = 1.0  # 1.0 is 0d. no difference.
+        mostUniqueIndex = 0  # dummy
+
+        for fIdx in range(len(tempMeshFaces) - 1, -1, -1):
+            angleDifference = face_angle_best[tempMeshFaces[fIdx]]
+            if angleDifference < mostUniqueAngle:
+                # We have a new most different angle
+                mostUniqueIndex = fIdx
+                mostUniqueAngle = angleDifference
+
+        if mostUniqueAngle < limit:
+            # Now weight the vector to all its faces, will give a more direct projection
+            # if the face its self was not representative of the normal from surrounding faces.
+            i = tempMeshFaces.pop(mostUniqueIndex)
+            newProjectVec = face_nos[i * 3:i * 3 + 3]
+            newProjectMeshFaces = [i]
+
+        elif projectVecs or not tempMeshFaces:
+            break
+
+    return projectVecs
+
+
+class MeshProjection:
+    """
+    The faces and UV islands of a mesh, projected and ready to be packed,
+    see :func:`mesh_projection_calc`.
+    """
+    __slots__ = ("mesh", "faces", "islands")
+
+    def __init__(self, mesh, faces, islands):
+        self.mesh = mesh
+        # All faces that have UV's written, including zero area faces.
+        self.faces = faces
+        self.islands = islands
+
+    def uvs_write(self):
+        me = self.mesh
+        uv_layer = me.uv_layers.active.data
+        uvs = array('f', [0.0]) * (len(me.loops) * 2)
+        uv_layer.foreach_get("uv", uvs)
+        for f in self.faces:
+            i = f.loop_start * 2
+            for uv in f.uv:
+                uvs[i] = uv.x
+                uvs[i + 1] = uv.y
+                i += 2
+        uv_layer.foreach_set("uv", uvs)
+
+
+def mesh_projection_calc(me, settings):
+    """
+    Project the faces of a mesh and split them into UV islands.
+    Mesh data is read in bulk, only the faces being projected
+    are stored as :class:`thickface`.
+
+    :return: The projection or None when there are no faces to project,
+       the UV's of zero area faces are written in this case too.
+    :rtype: :class:`MeshProjection`
+    """
+    if not me.uv_layers:  # Mesh has no UV Coords, don't bother.
+        me.uv_layers.new()
+
+    polygons = me.polygons
+    polys_len = len(polygons)
+
+    vert_cos = array('f', [0.0]) * (len(me.vertices) * 3)
+    me.vertices.foreach_get("co", vert_cos)
+    loop_verts = array('i', [0]) * len(me.loops)
+    me.loops.foreach_get("vertex_index", loop_verts)
+
+    poly_nos = array('f', [0.0]) * (polys_len * 3)
+    poly_areas = array('f', [0.0]) * polys_len
+    poly_loop_starts = array('i', [0]) * polys_len
+    poly_loop_totals = array('i', [0]) * polys_len
+    polygons.foreach_get("normal", poly_nos)
+    polygons.foreach_get("area", poly_areas)
+    polygons.foreach_get("loop_start", poly_loop_starts)
+    polygons.foreach_get("loop_total", poly_loop_totals)
+
+    if settings.only_selected_faces:
+        poly_select = array('b', [False]) * polys_len
+        polygons.foreach_get("select", poly_select)
+        poly_indices = [i for i in range(polys_len) if poly_select[i]]
+    else:
+        poly_indices = list(range(polys_len))
 
-def main_consts():
-    from math import radians
+    # Biggest first.
+    poly_indices.sort(key=lambda i: -poly_areas[i])
 
-    global ROTMAT_2D_POS_90D
-    global ROTMAT_2D_POS_45D
-    global RotMatStepRotation
+    meshFaces = [
+        thickface(
+            loop_verts[poly_loop_starts[i]:poly_loop_starts[i] + poly_loop_totals[i]],
+            Vector(poly_nos[i * 3:i * 3 + 3]),
+            poly_areas[i],
+            poly_loop_starts[i],
+        )
+        for i in poly_indices
+    ]
+    # Zero area faces have their UV's left at (0, 0).
+    faces_all = meshFaces[:]
+
+    # remove all zero area faces
+    while meshFaces and meshFaces[-1].area <= SMALL_NUM:
+        meshFaces.pop()
+
+    if not meshFaces:
+        # Write the (0, 0) UV's of the zero area faces.
+        MeshProjection(me, faces_all, []).uvs_write()
+        return None
+
+    # Generate a projection list from face normals, this is meant to be smart :)
+    user_area_weight = settings.user_area_weight
+    face_nos = array('d')
+    for f in meshFaces:
+        face_nos.extend(f.no)
+    projectVecs = projectionVecsFromNormals(
+        face_nos,
+        [(f.area * user_area_weight) + (1.0 - user_area_weight) for f in meshFaces],
+        settings,
+    )
 
-    ROTMAT_2D_POS_90D = Matrix.Rotation(radians(90.0), 2)
-    ROTMAT_2D_POS_45D = Matrix.Rotation(radians(45.0), 2)
+    # If there are only zero area faces then its possible
+    # there are no projectionVecs
+    if not projectVecs:
+        print("Smart Projection: no projection vectors for %r, 0 area faces can cause this" % me.name)
+        MeshProjection(me, faces_all[len(meshFaces):], []).uvs_write()
+        return None
 
-    RotMatStepRotation = []
-    rot_angle = 22.5  # 45.0/2
-    while rot_angle > 0.1:
-        RotMatStepRotation.append([
-            Matrix.Rotation(radians(+rot_angle), 2),
-            Matrix.Rotation(radians(-rot_angle), 2),
-        ])
+    faceProjectionGroupList = [[] for i in range(len(projectVecs))]
 
-        rot_angle = rot_angle / 2.0
+    # MAP and Arrange # We know there are 3 or 4 faces here
 
+    for fIdx in range(len(meshFaces) - 1, -1, -1):
+        fx, fy, fz = face_nos[fIdx * 3:fIdx * 3 + 3]
+        i = len(projectVecs)
 
-global ob
-ob = None
+        # Initialize first
+        px, py, pz = projectVecs[0]
+        bestAng = fx * px + fy * py + fz * pz
+        bestAngIdx = 0
+
+        # Cycle through the remaining, first already done
+        while i - 1:
+            i -= 1
+
+            px, py, pz = projectVecs[i]
+            newAng = fx * px + fy * py + fz * pz
+            if newAng > bestAng:  # Reverse logic for dotvecs
+                bestAng = newAng
+                bestAngIdx = i
+
+        # Store the area for later use.
+        faceProjectionGroupList[bestAngIdx].append(meshFaces[fIdx])
+
+    # Now faceProjectionGroupList is full of faces that face match the project Vecs list
+    for i in range(len(projectVecs)):
+        # Account for projectVecs having no faces.
+        if not faceProjectionGroupList[i]:
+            continue
+
+        # Make a projection matrix from a unit length vector.
+        (mx_x, mx_y, mx_z), (my_x, my_y, my_z) = VectoQuat(Vector(projectVecs[i])).to_matrix()[0:2]
+
+        # Get the faces UV's from the projected vertex.
+        for f in faceProjectionGroupList[i]:
+            for uv, v in zip(f.uv, f.v):
+                x, y, z = vert_cos[v * 3:v * 3 + 3]
+                uv.x = mx_x * x + mx_y * y + mx_z * z
+                uv.y = my_x * x + my_y * y + my_z * z
+
+    return MeshProjection(me, faces_all, getUvIslands(faceProjectionGroupList, me))
+
+
+def smart_project_meshes(meshes, settings):
+    """
+    Unwrap meshes, packing the islands of all meshes
+    in a single pass when ``settings.share_space`` is enabled.
+
+    :arg meshes: Meshes to unwrap, each mesh should only be passed once.
+    :type meshes: sequence of :class:`bpy.types.Mesh`
+    :arg settings: The projection settings.
+    :type settings: :class:`SmartProjectSettings`
+    """
+    projections = []
+    for me in meshes:
+        projection = mesh_projection_calc(me, settings)
+        if projection is None:
+            continue
+        if not settings.share_space:
+            packIslands(projection.islands, settings)
+        projections.append(projection)
+
+    # We want to pack all in 1 go, so pack now
+    if settings.share_space:
+        packIslands([island for projection in projections for island in projection.islands], settings)
+
+    for projection in projections:
+        projection.uvs_write()
+
+    dict_matrix.clear()
 
 
 def main(context,
@@ -709,35 +1114,8 @@ def main(context,
          use_aspect,
          stretch_to_bounds,
          ):
-    global USER_FILL_HOLES
-    global USER_FILL_HOLES_QUALITY
-    global USER_STRETCH_ASPECT
-    global USER_ISLAND_MARGIN
-
-    from math import cos
     import time
 
-    global dict_matrix
-    dict_matrix = {}
-
-    # Constants:
-    # Takes a list of faces that make up a UV island and rotate
-    # until they optimally fit inside a square.
-    global ROTMAT_2D_POS_90D
-    global ROTMAT_2D_POS_45D
-    global RotMatStepRotation
-    main_consts()
-
-    # Create the variables.
-    USER_PROJECTION_LIMIT = projection_limit
-    USER_ONLY_SELECTED_FACES = True
-    USER_SHARE_SPACE = 1  # Only for hole filling.
-    USER_STRETCH_ASPECT = stretch_to_bounds
-    USER_ISLAND_MARGIN = island_margin  # Only for hole filling.
-    USER_FILL_HOLES = 0
-    USER_FILL_HOLES_QUALITY = 50  # Only for hole filling.
-    USER_VIEW_INIT = 0  # Only for hole filling.
-
     is_editmode = (context.mode == 'EDIT_MESH')
     if is_editmode:
         obList = context.objects_in_mode_unique_data
@@ -747,217 +1125,37 @@ def main(context,
             if ob.type == 'MESH' and ob.data.library is None
         ]
 
-    if not is_editmode:
-        USER_ONLY_SELECTED_FACES = False
-
     if not obList:
         raise Exception("error, no selected mesh objects")
 
-    # Convert from being button types
-    USER_PROJECTION_LIMIT_CONVERTED = cos(USER_PROJECTION_LIMIT * DEG_TO_RAD)
-    USER_PROJECTION_LIMIT_HALF_CONVERTED = cos((USER_PROJECTION_LIMIT / 2) * DEG_TO_RAD)
+    settings = SmartProjectSettings(
+        projection_limit=projection_limit,
+        user_area_weight=user_area_weight,
+        island_margin=island_margin,
+        stretch_to_bounds=stretch_to_bounds,
+        only_selected_faces=is_editmode,
+    )
 
     # Toggle Edit mode
     if is_editmode:
         bpy.ops.object.mode_set(mode='OBJECT')
-    # Assume face select mode! an annoying hack to toggle face select mode because Mesh doesn't like faceSelectMode.
 
-    if USER_SHARE_SPACE:
-        # Sort by data name so we get consistent results
-        obList.sort(key=lambda ob: ob.data.name)
-        collected_islandList = []
+    # Sort by data name so we get consistent results
+    obList.sort(key=lambda ob: ob.data.name)
 
     time1 = time.time()
 
-    # Tag as False so we don't operate on the same mesh twice.
-    for me in bpy.data.meshes:
-        me.tag = False
-
+    # Don't operate on the same mesh twice.
+    meshes = []
+    meshes_set = set()
     for ob in obList:
         me = ob.data
-
-        if me.tag or me.library:
+        if me in meshes_set or me.library:
             continue
+        meshes_set.add(me)
+        meshes.append(me)
 
-        # Tag as used
-        me.tag = True
-
-        if not me.uv_layers:  # Mesh has no UV Coords, don't bother.
-            me.uv_layers.new()
-
-        uv_layer = me.uv_layers.active.data
-        me_verts = list(me.vertices)
-
-        if USER_ONLY_SELECTED_FACES:
-            meshFaces = [thickface(f, uv_layer, me_verts) for i, f in enumerate(me.polygons) if f.select]
-        else:
-            meshFaces = [thickface(f, uv_layer, me_verts) for i, f in enumerate(me.polygons)]
-
-        # =======
-        # Generate a projection list from face normals, this is meant to be smart :)
-
-        # make a list of face props that are in sync with meshFaces
-        # Make a Face List that is sorted by area.
-        # meshFaces = []
-
-        # meshFaces.sort( lambda a, b: cmp(b.area , a.area) ) # Biggest first.
-        meshFaces.sort(key=lambda a: -a.area)
-
-        # remove all zero area faces
-        while meshFaces and meshFaces[-1].area <= SMALL_NUM:
-            # Set their UV's to 0,0
-            for uv in meshFaces[-1].uv:
-                uv.zero()
-            meshFaces.pop()
-
-        if not meshFaces:
-            continue
-
-        # Smallest first is slightly more efficient,
-        # but if the user cancels early then its better we work on the larger data.
-
-        # Generate Projection Vecs
-        # 0d is   1.0
-        # 180 IS -0.59846
-
-        # Initialize projectVecs
-        if USER_VIEW_INIT:
-            # Generate Projection
-
-            # We add to this along the way
-            projectVecs = [Vector(Window.GetViewVector()) @ ob.matrix_world.inverted().to_3x3()]
-        else:
-            projectVecs = []
-
-        newProjectVec = meshFaces[0].no
-        newProjectMeshFaces = []  # Popping stuffs it up.
-
-        # Pretend that the most unique angle is ages away to start the loop off
-        mostUniqueAngle = -1.0
-
-        # This is popped
-        tempMeshFaces = meshFaces[:]
-
-        # This while only gathers projection vecs, faces are assigned later on.
-        while 1:
-            # If there's none there then start with the largest face
-
-            # add all the faces that are close.
-            for fIdx in range(len(tempMeshFaces) - 1, -1, -1):
-                # Use half the angle limit so we don't overweight faces towards this
-                # normal and hog all the faces.
-                if newProjectVec.dot(tempMeshFaces[fIdx].no) > USER_PROJECTION_LIMIT_HALF_CONVERTED:
-                    newProjectMeshFaces.append(tempMeshFaces.pop(fIdx))
-
-            # Add the average of all these faces normals as a projectionVec
-            averageVec = Vector((0.0, 0.0, 0.0))
-            if user_area_weight == 0.0:
-                for fprop in newProjectMeshFaces:
-                    averageVec += fprop.no
-            elif user_area_weight == 1.0:
-                for fprop in newProjectMeshFaces:
-                    averageVec += fprop.no * fprop.area
-            else:
-                for fprop in newProjectMeshFaces:
-                    averageVec += fprop.no * ((fprop.area * user_area_weight) + (1.0 - user_area_weight))
-
-            if averageVec.x != 0 or averageVec.y != 0 or averageVec.z != 0:  # Avoid NAN
-                projectVecs.append(averageVec.normalized())
-
-            # Get the next vec!
-            # Pick the face that's most different to all existing angles :)
-            mostUniqueAngle = 1.0  # 1.0 is 0d. no difference.
-            mostUniqueIndex = 0  # dummy
-
-            for fIdx in range(len(tempMeshFaces) - 1, -1, -1):
-                angleDifference = -1.0  # 180d difference.
-
-                # Get the closest vec angle we are to.
-                for p in projectVecs:
-                    temp_angle_diff = p.dot(tempMeshFaces[fIdx].no)
-
-                    if angleDifference < temp_angle_diff:
-                        angleDifference = temp_angle_diff
-
-                if angleDifference < mostUniqueAngle:
-                    # We have a new most different angle
-                    mostUniqueIndex = fIdx
-                    mostUniqueAngle = angleDifference
-
-            if mostUniqueAngle < USER_PROJECTION_LIMIT_CONVERTED:
-                # print 'adding', mostUniqueAngle, USER_PROJECTION_LIMIT, len(newProjectMeshFaces)
-                # Now weight the vector to all its faces, will give a more direct projection
-                # if the face its self was not representative of the normal from surrounding faces.
-
-                newProjectVec = tempMeshFaces[mostUniqueIndex].no
-                newProjectMeshFaces = [tempMeshFaces.pop(mostUniqueIndex)]
-
-            else:
-                if len(projectVecs) >= 1:  # Must have at least 2 projections
-                    break
-
-        # If there are only zero area faces then its possible
-        # there are no projectionVecs
-        if not len(projectVecs):
-            Draw.PupMenu('error, no projection vecs where generated, 0 area faces can cause this.')
-            return
-
-        faceProjectionGroupList = [[] for i in range(len(projectVecs))]
-
-        # MAP and Arrange # We know there are 3 or 4 faces here
-
-        for fIdx in range(len(meshFaces) - 1, -1, -1):
-            fvec = meshFaces[fIdx].no
-            i = len(projectVecs)
-
-            # Initialize first
-            bestAng = fvec.dot(projectVecs[0])
-            bestAngIdx = 0
-
-            # Cycle through the remaining, first already done
-            while i - 1:
-                i -= 1
-
-                newAng = fvec.dot(projectVecs[i])
-                if newAng > bestAng:  # Reverse logic for dotvecs
-                    bestAng = newAng
-                    bestAngIdx = i
-
-            # Store the area for later use.
-            faceProjectionGroupList[bestAngIdx].append(meshFaces[fIdx])
-
-        # Cull faceProjectionGroupList,
-
-        # Now faceProjectionGroupList is full of faces that face match the project Vecs list
-        for i in range(len(projectVecs)):
-            # Account for projectVecs having no faces.
-            if not faceProjectionGroupList[i]:
-                continue
-
-            # Make a projection matrix from a unit length vector.
-            MatQuat = VectoQuat(projectVecs[i])
-
-            # Get the faces UV's from the projected vertex.
-            for f in faceProjectionGroupList[i]:
-                f_uv = f.uv
-                for j, v in enumerate(f.v):
-                    f_uv[j][:] = (MatQuat @ v.co).xy
-
-        if USER_SHARE_SPACE:
-            # Should we collect and pack later?
-            islandList = getUvIslands(faceProjectionGroupList, me)
-            collected_islandList.extend(islandList)
-
-        else:
-            # Should we pack the islands for this 1 object?
-            islandList = getUvIslands(faceProjectionGroupList, me)
-            packIslands(islandList)
-
-        # update the mesh here if we need to.
-
-    # We want to pack all in 1 go, so pack now
-    if USER_SHARE_SPACE:
-        packIslands(collected_islandList)
+    smart_project_meshes(meshes, settings)
 
     print("Smart Projection time: %.2f" % (time.time() - time1))
 
@@ -986,8 +1184,6 @@ def main(context,
                     l[uv_act].uv[0] *= aspect[0]
                     l[uv_act].uv[1] *= aspect[1]
 
-    dict_matrix.clear()
-
 
 from bpy.props import FloatProperty, BoolProperty
 
@@ -32,10 +32,41 @@ def get_vcolor_layer_data(me):
     return lay.data
 
 
+def vertex_connectivity(me):
+    """
+    Return the connected vertices of each vertex (via edges)
+    as compressed sparse rows: the neighbors of vertex ``i`` are
+    ``con_verts[con_start[i]:con_start[i + 1]]``, in order of the edges.
+    """
+    from array import array
+    from collections import Counter
+    from itertools import accumulate, chain
+
+    verts_len = len(me.vertices)
+    edge_verts = array("i", [0]) * (len(me.edges) * 2)
+    me.edges.foreach_get("vertices", edge_verts)
+
+    con_count = array("i", [0]) * verts_len
+    for i, count in Counter(edge_verts).items():
+        con_count[i] = count
+    con_start = array("i", chain((0,), accumulate(con_count)))
+
+    con_verts = array("i", [0]) * len(edge_verts)
+    con_fill = con_start[:-1]
+    for i in range(0, len(edge_verts), 2):
+        v0 = edge_verts[i]
+        v1 = edge_verts[i + 1]
+        con_verts[con_fill[v0]] = v1
+        con_fill[v0] += 1
+        con_verts[con_fill[v1]] = v0
+        con_fill[v1] += 1
+
+    return con_start, con_verts
+
+
 def applyVertexDirt(me, blur_iterations, blur_strength, clamp_dirt, clamp_clean, dirt_only):
-    from mathutils import Vector
-    from math import acos
-    import array
+    from math import acos, sqrt
+    from array import array
 
     # We simulate the accumulation of dirt in the creases of geometric surfaces
     # by comparing the vertex normal to the average direction of all vertices
@@ -51,37 +82,52 @@ def applyVertexDirt(me, blur_iterations, blur_strength, clamp_dirt, clamp_clean,
     #
     # Original code and method by Keith "Wahooney" Boshoff.
 
-    vert_tone = array.array("f", [0.0]) * len(me.vertices)
-
-    # create lookup table for each vertex's connected vertices (via edges)
-    con = [[] for i in range(len(me.vertices))]
+    verts_len = len(me.vertices)
+    vert_tone = array("f", [0.0]) * verts_len
 
-    # add connected verts
-    for e in me.edges:
-        con[e.vertices[0]].append(e.vertices[1])
-        con[e.vertices[1]].append(e.vertices[0])
+    vert_cos = array("f", [0.0]) * (verts_len * 3)
+    vert_nos = array("f", [0.0]) * (verts_len * 3)
+    me.vertices.foreach_get("co", vert_cos)
+    me.vertices.foreach_get("normal", vert_nos)
 
-    for i, v in enumerate(me.vertices):
-        vec = Vector()
-        no = v.normal
-        co = v.co
+    # lookup table for each vertex's connected vertices (via edges)
+    con_start, con_verts = vertex_connectivity(me)
 
-        # get the direction of the vectors between the vertex and it's connected vertices
-        for c in con[i]:
-            vec += (me.vertices[c].co - co).normalized()
+    for i in range(verts_len):
+        c_start = con_start[i]
+        c_end = con_start[i + 1]
 
         # average the vector by dividing by the number of connected verts
-        tot_con = len(con[i])
+        tot_con = c_end - c_start
 
         if tot_con == 0:
             continue
 
-        vec /= tot_con
+        i3 = i * 3
+        co_x, co_y, co_z = vert_cos[i3:i3 + 3]
+
+        # get the direction of the vectors between the vertex and it's connected vertices
+        vec_x = vec_y = vec_z = 0.0
+        for c in con_verts[c_start:c_end]:
+            c3 = c * 3
+            d_x = vert_cos[c3] - co_x
+            d_y = vert_cos[c3 + 1] - co_y
+            d_z = vert_cos[c3 + 2] - co_z
+            d_len = sqrt(d_x * d_x + d_y * d_y + d_z * d_z)
+            if d_len != 0.0:
+                vec_x += d_x / d_len
+                vec_y += d_y / d_len
+                vec_z += d_z / d_len
 
         # angle is the acos() of the dot product between normal and connected verts.
         # > 90 degrees: convex
         # < 90 degrees: concave
-        ang = acos(no.dot(vec))
+        dot = (
+            vert_nos[i3] * vec_x +
+            vert_nos[i3 + 1] * vec_y +
+            vert_nos[i3 + 2] * vec_z
+        ) / tot_con
+        ang = acos(min(max(dot, -1.0), 1.0))
 
         # enforce min/max
         ang = max(clamp_dirt, ang)
@@ -92,17 +138,28 @@ def applyVertexDirt(me, blur_iterations, blur_strength, clamp_dirt, clamp_clean,
         vert_tone[i] = ang
 
     # blur tones
+    if blur_iterations:
+        # each vertex is the weighted average of itself and its connected verts
+        vert_tone_div = [
+            (con_start[j + 1] - con_start[j]) * blur_strength + 1.0
+            for j in range(verts_len)
+        ]
+        con_slices = [
+            con_verts[con_start[j]:con_start[j + 1]]
+            for j in range(verts_len)
+        ]
+
     for i in range(blur_iterations):
         # backup the original tones
-        orig_vert_tone = vert_tone[:]
+        orig_vert_tone = vert_tone
+        orig_vert_tone_get = orig_vert_tone.__getitem__
 
         # use connected verts look up for blurring
-        for j, c in enumerate(con):
-            for v in c:
-                vert_tone[j] += blur_strength * orig_vert_tone[v]
-
-            vert_tone[j] /= len(c) * blur_strength + 1
-        del orig_vert_tone
+        vert_tone = array("f", [
+            (tone + blur_strength * sum(map(orig_vert_tone_get, c))) / div
+            for tone, c, div in zip(orig_vert_tone, con_slices, vert_tone_div)
+        ])
+        del orig_vert_tone, orig_vert_tone_get
 
     min_tone = min(vert_tone)
     max_tone = max(vert_tone)
@@ -119,22 +176,43 @@ def applyVertexDirt(me, blur_iterations, blur_strength, clamp_dirt, clamp_clean,
     if not active_col_layer:
         return {'CANCELLED'}
 
-    use_paint_mask = me.use_paint_mask
-    for i, p in enumerate(me.polygons):
-        if not use_paint_mask or p.select:
-            for loop_index in p.loop_indices:
-                loop = me.loops[loop_index]
-                v = loop.vertex_index
-                col = active_col_layer[loop_index].color
-                tone = vert_tone[v]
-                tone = (tone - min_tone) * tone_range
-
-                if dirt_only:
-                    tone = min(tone, 0.5) * 2.0
-
-                col[0] = tone * col[0]
-                col[1] = tone * col[1]
-                col[2] = tone * col[2]
+    # final tone for each vertex
+    if dirt_only:
+        vert_tone = [min((tone - min_tone) * tone_range, 0.5) * 2.0 for tone in vert_tone]
+    else:
+        vert_tone = [(tone - min_tone) * tone_range for tone in vert_tone]
+
+    loops_len = len(me.loops)
+    loop_verts = array("i", [0]) * loops_len
+    me.loops.foreach_get("vertex_index", loop_verts)
+    loop_cols = array("f", [0.0]) * (loops_len * 4)
+    active_col_layer.foreach_get("color", loop_cols)
+
+    if me.use_paint_mask:
+        polys_len = len(me.polygons)
+        poly_select = array("b", [False]) * polys_len
+        poly_loop_starts = array("i", [0]) * polys_len
+        poly_loop_totals = array("i", [0]) * polys_len
+        me.polygons.foreach_get("select", poly_select)
+        me.polygons.foreach_get("loop_start", poly_loop_starts)
+        me.polygons.foreach_get("loop_total", poly_loop_totals)
+        loop_indices = [
+            loop_index
+            for select, loop_start, loop_total in zip(poly_select, poly_loop_starts, poly_loop_totals)
+            if select
+            for loop_index in range(loop_start, loop_start + loop_total)
+        ]
+    else:
+        loop_indices = range(loops_len)
+
+    for loop_index in loop_indices:
+        tone = vert_tone[loop_verts[loop_index]]
+        i4 = loop_index * 4
+        loop_cols[i4] *= tone
+        loop_cols[i4 + 1] *= tone
+        loop_cols[i4 + 2] *= tone
+
+    active_col_layer.foreach_set("color", loop_cols)
     me.update()
     return {'FINISHED'}
 
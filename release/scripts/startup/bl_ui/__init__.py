@@ -95,22 +95,146 @@ _modules = [
     "properties_workspace",
 ]
 
+# Modules (from '_modules') which are only imported & registered
+# once an editor of one of their space types is drawn.
+#
+# Only used when the "BLENDER_UI_LAZY_REGISTER" environment variable is set,
+# since scripts may access the classes of these modules before then,
+# scripts that need them should call 'lazy_register_ensure' first.
+_modules_lazy = {
+    "properties_particle": {'PROPERTIES'},
+    "properties_physics_cloth": {'PROPERTIES'},
+    "properties_physics_common": {'PROPERTIES'},
+    "properties_physics_dynamicpaint": {'PROPERTIES'},
+    "properties_physics_field": {'PROPERTIES'},
+    "properties_physics_rigidbody": {'PROPERTIES'},
+    "properties_physics_rigidbody_constraint": {'PROPERTIES'},
+    "properties_physics_fluid": {'PROPERTIES'},
+    "properties_physics_softbody": {'PROPERTIES'},
+
+    # The mask display popover is also used by the image editor.
+    "space_clip": {'CLIP_EDITOR', 'IMAGE_EDITOR'},
+    "space_console": {'CONSOLE'},
+    "space_nla": {'NLA_EDITOR'},
+    "space_node": {'NODE_EDITOR'},
+    "space_sequencer": {'SEQUENCE_EDITOR'},
+    "space_text": {'TEXT_EDITOR'},
+}
+
 import bpy
 
 if bpy.app.build_options.freestyle:
     _modules.append("properties_freestyle")
 
-__import__(name=__name__, fromlist=_modules)
-_namespace = globals()
-_modules_loaded = [_namespace[name] for name in _modules]
-del _namespace
 
+def _modules_import(module_names):
+    use_profile = bpy.app.debug_python_profile
+    if use_profile:
+        import time
+        from bpy.utils import _profile_report
 
-def register():
+    modules = []
+    for name in module_names:
+        if use_profile:
+            t = time.perf_counter()
+        __import__(name=__name__, fromlist=(name,))
+        modules.append(globals()[name])
+        if use_profile:
+            _profile_report("import", modules[-1].__name__, t)
+    return modules
+
+
+def _modules_register(modules):
     from bpy.utils import register_class
-    for mod in _modules_loaded:
+    use_profile = bpy.app.debug_python_profile
+    if use_profile:
+        import time
+        from bpy.utils import _profile_report
+
+    for mod in modules:
+        if use_profile:
+            t = time.perf_counter()
         for cls in mod.classes:
             register_class(cls)
+        if use_profile:
+            _profile_report("register", mod.__name__, t)
+
+
+def _use_lazy_register():
+    import os
+    return os.environ.get("BLENDER_UI_LAZY_REGISTER", "0") not in {"", "0"}
+
+
+# Names of lazy modules which have not been imported yet.
+_modules_lazy_pending = {name for name in _modules if name in _modules_lazy} if _use_lazy_register() else set()
+_modules_loaded = _modules_import([name for name in _modules if name not in _modules_lazy_pending])
+
+# Headers (one for each space type with lazy modules pending) which load the modules when drawn.
+_lazy_headers = {}
+
+
+def _lazy_header_create(space_type):
+    def lazy_register_ensure_timer():
+        lazy_register_ensure(space_type)
+
+    def draw(_self, _context):
+        # Classes can't be registered while drawing, defer until after.
+        if not bpy.app.timers.is_registered(lazy_register_ensure_timer):
+            bpy.app.timers.register(lazy_register_ensure_timer, first_interval=0.0)
+
+    return type(
+        "UI_HT_lazy_" + space_type.lower(),
+        (bpy.types.Header,),
+        {"bl_space_type": space_type, "draw": draw},
+    )
+
+
+def _lazy_headers_update():
+    from bpy.utils import (
+        register_class,
+        unregister_class,
+    )
+    space_types = {
+        space_type
+        for name in _modules_lazy_pending
+        for space_type in _modules_lazy[name]
+    }
+    for space_type in tuple(_lazy_headers.keys()):
+        if space_type not in space_types:
+            unregister_class(_lazy_headers.pop(space_type))
+    for space_type in sorted(space_types - _lazy_headers.keys()):
+        cls = _lazy_headers[space_type] = _lazy_header_create(space_type)
+        register_class(cls)
+
+
+def lazy_register_ensure(space_type=None):
+    """
+    Import & register the modules which are registered lazily
+    (see the "BLENDER_UI_LAZY_REGISTER" environment variable).
+
+    :arg space_type: Only load the modules used by this space type,
+       when None, load all modules.
+    :type space_type: string
+    :return: The newly loaded modules.
+    :rtype: list
+    """
+    module_names = [
+        name for name in _modules
+        if name in _modules_lazy_pending and (space_type is None or space_type in _modules_lazy[name])
+    ]
+    if not module_names:
+        return []
+    _modules_lazy_pending.difference_update(module_names)
+    modules = _modules_import(module_names)
+    _modules_loaded.extend(modules)
+    _modules_register(modules)
+    _lazy_headers_update()
+    return modules
+
+
+def register():
+    _modules_register(_modules_loaded)
+    _lazy_headers_update()
 
     # space_userprefs.py
     from bpy.props import (
@@ -163,6 +287,9 @@ def register():
 
 def unregister():
     from bpy.utils import unregister_class
+    for cls in _lazy_headers.values():
+        unregister_class(cls)
+    _lazy_headers.clear()
     for mod in reversed(_modules_loaded):
         for cls in reversed(mod.classes):
             if cls.is_registered:
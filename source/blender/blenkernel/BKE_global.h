@@ -153,7 +153,8 @@ enum {
   G_DEBUG_GPU_SHADERS = (1 << 18),           /* GLSL shaders */
   G_DEBUG_GPU_FORCE_WORKAROUNDS = (1 << 19), /* force gpu workarounds bypassing detections. */
 
-  G_DEBUG_GHOST = (1 << 20), /* Debug GHOST module. */
+  G_DEBUG_GHOST = (1 << 20),          /* Debug GHOST module. */
+  G_DEBUG_PYTHON_PROFILE = (1 << 21), /* python startup import & register timing */
 };
 
 #define G_DEBUG_ALL \
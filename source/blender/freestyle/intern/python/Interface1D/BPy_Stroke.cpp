@@ -236,6 +236,46 @@ static PyObject *Stroke_remove_vertex(BPy_Stroke *self, PyObject *args, PyObject
   Py_RETURN_NONE;
 }
 
+PyDoc_STRVAR(Stroke_remove_vertices_doc,
+             ".. method:: remove_vertices(vertices)\n"
+             "\n"
+             "   Removes the StrokeVertex objects given as argument from the Stroke.\n"
+             "   Faster than removing the vertices one by one, since the vertices are\n"
+             "   removed in a single pass.  The length and curvilinear abscissa are\n"
+             "   updated consequently.\n"
+             "\n"
+             "   :arg vertices: the StrokeVertex objects to remove from the Stroke.\n"
+             "   :type vertices: sequence of :class:`StrokeVertex`");
+
+static PyObject *Stroke_remove_vertices(BPy_Stroke *self, PyObject *args, PyObject *kwds)
+{
+  static const char *kwlist[] = {"vertices", NULL};
+  PyObject *py_seq = 0;
+
+  if (!PyArg_ParseTupleAndKeywords(args, kwds, "O", (char **)kwlist, &py_seq)) {
+    return NULL;
+  }
+  PyObject *py_seq_fast = PySequence_Fast(py_seq, "argument must be a sequence of StrokeVertex");
+  if (!py_seq_fast) {
+    return NULL;
+  }
+  Py_ssize_t len = PySequence_Fast_GET_SIZE(py_seq_fast);
+  PyObject **items = PySequence_Fast_ITEMS(py_seq_fast);
+  vector<StrokeVertex *> vertices;
+  vertices.reserve(len);
+  for (Py_ssize_t i = 0; i < len; i++) {
+    if (!BPy_StrokeVertex_Check(items[i]) || !((BPy_StrokeVertex *)items[i])->sv) {
+      Py_DECREF(py_seq_fast);
+      PyErr_SetString(PyExc_TypeError, "argument must be a sequence of StrokeVertex");
+      return NULL;
+    }
+    vertices.push_back(((BPy_StrokeVertex *)items[i])->sv);
+  }
+  Py_DECREF(py_seq_fast);
+  self->s->RemoveVertices(vertices);
+  Py_RETURN_NONE;
+}
+
 PyDoc_STRVAR(Stroke_remove_all_vertices_doc,
              ".. method:: remove_all_vertices()\n"
              "\n"
@@ -340,6 +380,10 @@ static PyMethodDef BPy_Stroke_methods[] = {
      (PyCFunction)Stroke_remove_vertex,
      METH_VARARGS | METH_KEYWORDS,
      Stroke_remove_vertex_doc},
+    {"remove_vertices",
+     (PyCFunction)Stroke_remove_vertices,
+     METH_VARARGS | METH_KEYWORDS,
+     Stroke_remove_vertices_doc},
     {"insert_vertex",
      (PyCFunction)Stroke_insert_vertex,
      METH_VARARGS | METH_KEYWORDS,
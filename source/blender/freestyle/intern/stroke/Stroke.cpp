@@ -19,6 +19,8 @@
  * \brief Classes to define a stroke
  */
 
+#include <set>
+
 #include "Stroke.h"
 #include "StrokeIterators.h"
 #include "StrokeAdvancedIterators.h"
@@ -727,6 +729,28 @@ void Stroke::RemoveVertex(StrokeVertex *iVertex)
   UpdateLength();
 }
 
+void Stroke::RemoveVertices(const std::vector<StrokeVertex *> &iVertices)
+{
+  if (iVertices.empty()) {
+    return;
+  }
+  std::set<StrokeVertex *> vertices(iVertices.begin(), iVertices.end());
+  // keep the other vertices in order, moving them to the front of the container
+  vertex_container::iterator it = _Vertices.begin(), itend = _Vertices.end();
+  vertex_container::iterator itkeep = it;
+  for (; it != itend; ++it) {
+    if (vertices.count(*it)) {
+      delete (*it);
+    }
+    else {
+      *itkeep = *it;
+      ++itkeep;
+    }
+  }
+  _Vertices.erase(itkeep, itend);
+  UpdateLength();
+}
+
 void Stroke::InsertVertex(StrokeVertex *iVertex, StrokeInternal::StrokeVertexIterator next)
 {
   vertex_container::iterator itnext = next.getIt();
@@ -615,6 +615,13 @@ class Stroke : public Interface1D {
    */
   void RemoveVertex(StrokeVertex *iVertex);
 
+  /*! Removes the stroke vertices iVertices
+   *  from the stroke, in a single pass over the stroke.
+   *  The length and curvilinear abscissa are updated
+   *  consequently.
+   */
+  void RemoveVertices(const std::vector<StrokeVertex *> &iVertices);
+
   /*! Inserts the stroke vertex iVertex in the stroke before next.
    *  The length, curvilinear abscissa are updated consequently.
    *  \param iVertex:
@@ -432,6 +432,11 @@ static PyGetSetDef bpy_app_getsets[] = {
      bpy_app_debug_set,
      bpy_app_debug_doc,
      (void *)G_DEBUG_PYTHON},
+    {"debug_python_profile",
+     bpy_app_debug_get,
+     bpy_app_debug_set,
+     bpy_app_debug_doc,
+     (void *)G_DEBUG_PYTHON_PROFILE},
     {"debug_events",
      bpy_app_debug_get,
      bpy_app_debug_set,
@@ -591,6 +591,7 @@ static int arg_handle_print_help(int UNUSED(argc), const char **UNUSED(argv), vo
   BLI_argsPrintArgDoc(ba, "--debug-memory");
   BLI_argsPrintArgDoc(ba, "--debug-jobs");
   BLI_argsPrintArgDoc(ba, "--debug-python");
+  BLI_argsPrintArgDoc(ba, "--debug-python-profile");
   BLI_argsPrintArgDoc(ba, "--debug-depsgraph");
   BLI_argsPrintArgDoc(ba, "--debug-depsgraph-eval");
   BLI_argsPrintArgDoc(ba, "--debug-depsgraph-build");
@@ -671,6 +672,7 @@ static int arg_handle_print_help(int UNUSED(argc), const char **UNUSED(argv), vo
   printf("  $BLENDER_USER_DATAFILES   Directory for user data files (icons, translations, ..).\n");
   printf("  $BLENDER_SYSTEM_DATAFILES Directory for system wide data files.\n");
   printf("  $BLENDER_SYSTEM_PYTHON    Directory for system Python libraries.\n");
+  printf("  $BLENDER_UI_LAZY_REGISTER Register editor specific interface scripts on first draw.\n");
 #  ifdef WIN32
   printf("  $TEMP                     Store temporary files here.\n");
 #  else
@@ -930,6 +932,10 @@ static const char arg_handle_debug_mode_generic_set_doc_freestyle[] =
 static const char arg_handle_debug_mode_generic_set_doc_python[] =
     "\n\t"
     "Enable debug messages for Python.";
+static const char arg_handle_debug_mode_generic_set_doc_python_profile[] =
+    "\n\t"
+    "Enable time profiling for Python startup scripts,\n"
+    "\tprinting the import & register time of each module as a line of JSON.";
 static const char arg_handle_debug_mode_generic_set_doc_events[] =
     "\n\t"
     "Enable debug messages for the event system.";
@@ -2077,6 +2083,12 @@ void main_args_setup(bContext *C, bArgs *ba)
               "--debug-python",
               CB_EX(arg_handle_debug_mode_generic_set, python),
               (void *)G_DEBUG_PYTHON);
+  BLI_argsAdd(ba,
+              1,
+              NULL,
+              "--debug-python-profile",
+              CB_EX(arg_handle_debug_mode_generic_set, python_profile),
+              (void *)G_DEBUG_PYTHON_PROFILE);
   BLI_argsAdd(ba,
               1,
               NULL,
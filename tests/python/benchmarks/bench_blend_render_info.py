@@ -0,0 +1,105 @@
+# Apache License, Version 2.0
+
+# ./blender.bin --background -noaudio --factory-startup --python tests/python/benchmarks/bench_blend_render_info.py -- --files 2000
+#
+# Times reading the render info of many blend files,
+# pass '--directory' to read existing files instead of generated ones.
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import bench_utils
+
+import bpy
+import blend_render_info
+
+
+def read_blend_rend_chunk_reference(path):
+    # The previous implementation.
+    import struct
+
+    blendfile = open(path, "rb")
+
+    head = blendfile.read(7)
+
+    if head[0:2] == b'\x1f\x8b':  # gzip magic
+        import gzip
+        blendfile.seek(0)
+        blendfile = gzip.open(blendfile, "rb")
+        head = blendfile.read(7)
+
+    if head != b'BLENDER':
+        blendfile.close()
+        return []
+
+    is_64_bit = (blendfile.read(1) == b'-')
+    is_big_endian = (blendfile.read(1) == b'V')
+    blendfile.read(3)
+
+    scenes = []
+
+    sizeof_bhead = 24 if is_64_bit else 20
+
+    while blendfile.read(4) == b'REND':
+        blendfile.read(sizeof_bhead - 4)
+        start_frame, end_frame = struct.unpack('>2i' if is_big_endian else '<2i', blendfile.read(8))
+        scene_name = blendfile.read(64)
+        scene_name = str(scene_name[:scene_name.index(b'\0')], "utf8")
+        scenes.append((start_frame, end_frame, scene_name))
+
+    blendfile.close()
+
+    return scenes
+
+
+def blend_files_create(directory, files_num):
+    bpy.ops.wm.read_factory_settings()
+    filepath = os.path.join(directory, "uncompressed.blend")
+    filepath_compressed = os.path.join(directory, "compressed.blend")
+    bpy.ops.wm.save_as_mainfile(filepath=filepath, check_existing=False, copy=True, compress=False)
+    bpy.ops.wm.save_as_mainfile(filepath=filepath_compressed, check_existing=False, copy=True, compress=True)
+    directory_files = os.path.join(directory, "files")
+    os.makedirs(directory_files)
+    for i in range(files_num):
+        shutil.copyfile(
+            filepath_compressed if i % 2 else filepath,
+            os.path.join(directory_files, "%.6d.blend" % i),
+        )
+    return directory_files
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Benchmark reading the render info of blend files.")
+    parser.add_argument("--files", type=int, default=2000, help="Number of files to generate")
+    parser.add_argument("--directory", default=None, help="Read the blend files in this directory instead")
+    parser.add_argument("--jobs", type=int, default=None, help="Number of processes for the parallel reader")
+    args = parser.parse_args(bench_utils.argv_from_blender())
+
+    tempdir = tempfile.mkdtemp()
+    try:
+        directory = args.directory or blend_files_create(tempdir, args.files)
+        paths = blend_render_info.blend_paths_from_args([directory])
+
+        result_reference, t_reference = bench_utils.timeit(
+            lambda: {path: read_blend_rend_chunk_reference(path) for path in paths})
+        result, t_new = bench_utils.timeit(
+            lambda: {path: blend_render_info.read_blend_rend_chunk(path) for path in paths})
+        result_parallel, t_parallel = bench_utils.timeit(
+            lambda: blend_render_info.read_blend_rend_chunks(paths, jobs=args.jobs))
+
+        if not (result == result_parallel == result_reference):
+            print("Error: results differ from the previous implementation")
+        bench_utils.report("read_blend_rend_chunk (%d files):" % len(paths), [
+            ("read_blend_rend_chunks", t_parallel),
+            ("read_blend_rend_chunk", t_new),
+            ("previous", t_reference),
+        ])
+    finally:
+        shutil.rmtree(tempdir)
+
+
+if __name__ == '__main__':
+    main()
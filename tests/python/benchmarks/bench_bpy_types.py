@@ -0,0 +1,55 @@
+# Apache License, Version 2.0
+
+# ./blender.bin --background -noaudio --factory-startup --python tests/python/benchmarks/bench_bpy_types.py -- --bones 2000
+#
+# Times 'Bone.children_recursive' on synthetic deep (a single chain) and wide (8 children per bone) rigs.
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import bench_utils
+
+
+def bone_children_recursive_reference(bone):
+    # The previous implementation.
+    bones_children = []
+    for other in bone._other_bones:
+        index = other.parent_index(bone)
+        if index:
+            bones_children.append((index, other))
+    bones_children.sort(key=lambda bone_pair: bone_pair[0])
+    return [other for index, other in bones_children]
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Benchmark recursive bone children.")
+    parser.add_argument("--bones", type=int, default=2000, help="Number of bones in each rig")
+    parser.add_argument("--queries", type=int, default=20, help="Number of bones to query in each rig")
+    args = parser.parse_args(bench_utils.argv_from_blender())
+
+    test_bpy_types = bench_utils.test_module_import("bl_pyapi_bpy_types")
+
+    for name, parent_fn in (
+            ("Deep", test_bpy_types.parent_deep),
+            ("Wide", test_bpy_types.parent_wide),
+    ):
+        obj = test_bpy_types.armature_create(name, parent_fn, args.bones)
+        bones = obj.data.bones[:args.queries]
+
+        result, t_new = bench_utils.timeit(
+            lambda: [[child.name for child in bone.children_recursive] for bone in bones])
+        result_reference, t_reference = bench_utils.timeit(
+            lambda: [[child.name for child in bone_children_recursive_reference(bone)] for bone in bones])
+
+        if result != result_reference:
+            print("Error: results differ from the previous implementation")
+        bench_utils.report("children_recursive (%s rig, %d bones, %d queries):" % (
+            name.lower(), args.bones, len(bones)), [
+            ("children_recursive", t_new),
+            ("previous", t_reference),
+        ])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+# Apache License, Version 2.0
+
+# ./blender.bin --background -noaudio --factory-startup --python tests/python/benchmarks/bench_freestyle_utils.py -- --points 100000
+#
+# Times the Douglas-Peucker simplification of Freestyle strokes.
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import bench_utils
+
+from array import array
+from freestyle import utils
+
+
+def simplify_reference(points, tolerance):
+    # The previous implementation.
+    from itertools import compress
+
+    def getSquareSegmentDistance(p, p1, p2):
+        x, y = p1
+        dx, dy = (p2 - p1)
+        if dx or dy:
+            t = ((p.x - x) * dx + (p.y - y) * dy) / (dx * dx + dy * dy)
+            if t > 1:
+                x, y = p2
+            elif t > 0:
+                x += dx * t
+                y += dy * t
+        dx, dy = p.x - x, p.y - y
+        return dx * dx + dy * dy
+
+    tolerance = tolerance * tolerance
+    length = len(points)
+    markers = [0] * length
+    first = 0
+    last = length - 1
+    first_stack = []
+    last_stack = []
+    markers[first] = 1
+    markers[last] = 1
+    while last:
+        max_sqdist = 0
+        for i in range(first, last):
+            sqdist = getSquareSegmentDistance(points[i], points[first], points[last])
+            if sqdist > max_sqdist:
+                index = i
+                max_sqdist = sqdist
+        if max_sqdist > tolerance:
+            markers[index] = 1
+            first_stack.append(first)
+            last_stack.append(index)
+            first_stack.append(index)
+            last_stack.append(last)
+        first = first_stack.pop() if first_stack else None
+        last = last_stack.pop() if last_stack else None
+    return tuple(compress(points, markers))
+
+
+def main():
+    import argparse
+    import random
+    parser = argparse.ArgumentParser(description="Benchmark simplifying points.")
+    parser.add_argument("--points", type=int, default=100000, help="Number of points")
+    parser.add_argument("--tolerance", type=float, default=1.0, help="Simplification tolerance")
+    args = parser.parse_args(bench_utils.argv_from_blender())
+
+    test_freestyle_utils = bench_utils.test_module_import("bl_freestyle_utils")
+    points = test_freestyle_utils.points_random(random.Random(0), args.points, 1.0)
+
+    result, t_new = bench_utils.timeit(lambda: utils.simplify(points, args.tolerance))
+    result_reference, t_reference = bench_utils.timeit(lambda: simplify_reference(points, args.tolerance))
+    if result != result_reference:
+        print("Error: results differ from the previous implementation")
+    bench_utils.report("simplify (%d points):" % len(points), [
+        ("simplify", t_new),
+        ("previous", t_reference),
+    ])
+
+    # The same points, split into strokes of 100 points.
+    coords = array('d', [value for point in points for value in point])
+    offsets = array('i', range(0, len(points), 100))
+    offsets.append(len(points))
+    _, t_batch = bench_utils.timeit(lambda: utils.simplify_batch(coords, offsets, args.tolerance))
+    _, t_reference = bench_utils.timeit(lambda: [
+        simplify_reference(points[start:end], args.tolerance)
+        for start, end in zip(offsets, offsets[1:])
+    ])
+    bench_utils.report("simplify_batch (%d strokes):" % (len(offsets) - 1), [
+        ("simplify_batch", t_batch),
+        ("previous", t_reference),
+    ])
+
+
+if __name__ == '__main__':
+    main()
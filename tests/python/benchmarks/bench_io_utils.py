@@ -0,0 +1,91 @@
+# Apache License, Version 2.0
+
+# ./blender.bin --background -noaudio --factory-startup --python tests/python/benchmarks/bench_io_utils.py -- --names 2000
+#
+# Times allocating unique names with heavy name collisions.
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import bench_utils
+
+from bpy_extras import io_utils
+
+
+def unique_name_reference(key, name, name_dict, name_max=-1, clean_func=None, sep="."):
+    # The previous implementation.
+    name_new = name_dict.get(key)
+    if name_new is None:
+        count = 1
+        name_dict_values = name_dict.values()
+        name_new = name_new_orig = (
+            name if clean_func is None
+            else clean_func(name)
+        )
+
+        if name_max == -1:
+            while name_new in name_dict_values:
+                name_new = "%s%s%03d" % (
+                    name_new_orig,
+                    sep,
+                    count,
+                )
+                count += 1
+        else:
+            name_new = name_new[:name_max]
+            while name_new in name_dict_values:
+                count_str = "%03d" % count
+                name_new = "%.*s%s%s" % (
+                    name_max - (len(count_str) + 1),
+                    name_new_orig,
+                    sep,
+                    count_str,
+                )
+                count += 1
+
+        name_dict[key] = name_new
+
+    return name_new
+
+
+def names_unique(unique_name_fn, name_dict, names, **kwargs):
+    for key, name in enumerate(names):
+        unique_name_fn(key, name, name_dict, **kwargs)
+    return name_dict
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Benchmark allocating unique names.")
+    parser.add_argument("--names", type=int, default=2000, help="Number of names to allocate")
+    parser.add_argument("--repeat", type=int, default=1, help="Number of times to run each implementation")
+    args = parser.parse_args(bench_utils.argv_from_blender())
+
+    test_io_utils = bench_utils.test_module_import("bl_io_utils")
+    names = test_io_utils.names_colliding(args.names)
+
+    for kwargs in ({}, {"name_max": 63}):
+        result_allocator, t_allocator = bench_utils.timeit(
+            lambda: names_unique(io_utils.unique_name, io_utils.UniqueNameAllocator(), names, **kwargs),
+            repeat=args.repeat,
+        )
+        result_dict, t_dict = bench_utils.timeit(
+            lambda: names_unique(io_utils.unique_name, {}, names, **kwargs),
+            repeat=args.repeat,
+        )
+        result_reference, t_reference = bench_utils.timeit(
+            lambda: names_unique(unique_name_reference, {}, names, **kwargs),
+            repeat=args.repeat,
+        )
+
+        if not (dict(result_allocator) == result_dict == result_reference):
+            print("Error: results differ from the previous implementation")
+        bench_utils.report("unique_name (%d names, %r):" % (len(names), kwargs), [
+            ("UniqueNameAllocator", t_allocator),
+            ("dict", t_dict),
+            ("previous", t_reference),
+        ])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+# Apache License, Version 2.0
+
+# ./blender.bin --background -noaudio --factory-startup --python tests/python/benchmarks/bench_mesh_utils.py -- --islands 100 --island-size 100
+#
+# Times 'mesh_linked_uv_islands' and 'mesh_linked_triangles',
+# the default mesh has 1M faces (100 islands of 100x100 quads).
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import bench_utils
+
+import bpy
+from bpy_extras import mesh_utils
+
+
+def mesh_linked_uv_islands_reference(mesh):
+    # The previous implementation.
+    uv_loops = [luv.uv[:] for luv in mesh.uv_layers.active.data]
+    poly_loops = [poly.loop_indices for poly in mesh.polygons]
+    luv_hash = {}
+    luv_hash_ls = [None] * len(uv_loops)
+    for pi, poly_indices in enumerate(poly_loops):
+        for li in poly_indices:
+            uv_hub = luv_hash.setdefault(uv_loops[li], [])
+            uv_hub.append(pi)
+            luv_hash_ls[li] = uv_hub
+
+    poly_islands = []
+    poly_tag = [0] * len(poly_loops)
+    while True:
+        poly_index = -1
+        for i in range(len(poly_loops)):
+            if poly_tag[i] == 0:
+                poly_index = i
+                break
+        if poly_index == -1:
+            break
+        island = [poly_index]
+        poly_tag[poly_index] = 1
+        poly_islands.append(island)
+        added = True
+        while added:
+            added = False
+            for poly_index in island[:]:
+                if poly_tag[poly_index] == 1:
+                    for li in poly_loops[poly_index]:
+                        for poly_index_shared in luv_hash_ls[li]:
+                            if poly_tag[poly_index_shared] == 0:
+                                added = True
+                                poly_tag[poly_index_shared] = 1
+                                island.append(poly_index_shared)
+                    poly_tag[poly_index] = 2
+    return poly_islands
+
+
+def mesh_linked_triangles_reference(mesh):
+    # The previous implementation.
+    vert_tris = [[] for i in range(len(mesh.vertices))]
+    for t in mesh.loop_triangles:
+        for v in t.vertices:
+            vert_tris[v].append(t)
+
+    tri_groups = [[t] for t in mesh.loop_triangles]
+    tri_mapping = list(range(len(mesh.loop_triangles)))
+
+    ok = True
+    while ok:
+        ok = False
+        for t in mesh.loop_triangles:
+            mapped_index = tri_mapping[t.index]
+            mapped_group = tri_groups[mapped_index]
+            for v in t.vertices:
+                for nxt_t in vert_tris[v]:
+                    if nxt_t != t:
+                        nxt_mapped_index = tri_mapping[nxt_t.index]
+                        if mapped_index != nxt_mapped_index:
+                            ok = True
+                            for grp_t in tri_groups[nxt_mapped_index]:
+                                tri_mapping[grp_t.index] = mapped_index
+                            mapped_group.extend(tri_groups[nxt_mapped_index])
+                            tri_groups[nxt_mapped_index] = None
+    return [tg for tg in tri_groups if tg]
+
+
+def tri_groups_as_indices(tri_groups):
+    # Group order differs between implementations.
+    return sorted(sorted(t.index for t in tri_group) for tri_group in tri_groups)
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Benchmark finding linked UV islands and triangles.")
+    parser.add_argument("--islands", type=int, default=100, help="Number of islands")
+    parser.add_argument("--island-size", type=int, default=100, help="Number of quads along each island side")
+    args = parser.parse_args(bench_utils.argv_from_blender())
+
+    test_mesh_utils = bench_utils.test_module_import("bl_mesh_utils")
+    me = test_mesh_utils.mesh_islands_create(args.islands, args.island_size)
+    title_mesh = "(%d faces, %d islands)" % (len(me.polygons), args.islands)
+
+    result, t_new = bench_utils.timeit(lambda: mesh_utils.mesh_linked_uv_islands(me))
+    result_reference, t_reference = bench_utils.timeit(lambda: mesh_linked_uv_islands_reference(me))
+    if result != result_reference:
+        print("Error: results differ from the previous implementation")
+    bench_utils.report("mesh_linked_uv_islands %s:" % title_mesh, [
+        ("mesh_linked_uv_islands", t_new),
+        ("previous", t_reference),
+    ])
+
+    result, t_new = bench_utils.timeit(lambda: mesh_utils.mesh_linked_triangles(me))
+    result_reference, t_reference = bench_utils.timeit(lambda: mesh_linked_triangles_reference(me))
+    if tri_groups_as_indices(result) != tri_groups_as_indices(result_reference):
+        print("Error: results differ from the previous implementation")
+    bench_utils.report("mesh_linked_triangles %s:" % title_mesh, [
+        ("mesh_linked_triangles", t_new),
+        ("previous", t_reference),
+    ])
+
+    bpy.data.meshes.remove(me)
+
+
+if __name__ == '__main__':
+    main()
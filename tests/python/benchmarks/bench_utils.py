@@ -0,0 +1,58 @@
+# Apache License, Version 2.0
+
+"""
+Shared utilities for the benchmarks in this directory.
+
+Benchmarks are standalone scripts (not run by CTest) timing an implementation
+against the previous one, e.g:
+
+   ./blender.bin --background -noaudio --factory-startup \
+       --python tests/python/benchmarks/bench_mesh_utils.py -- --help
+"""
+
+import os
+import sys
+import time
+
+TESTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def argv_from_blender():
+    """Return the arguments passed after ``--``."""
+    return sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+
+
+def test_module_import(name):
+    """Import a test module (from ``tests/python``) to reuse the data it generates."""
+    import importlib
+    if TESTS_DIR not in sys.path:
+        sys.path.append(TESTS_DIR)
+    return importlib.import_module(name)
+
+
+def timeit(fn, repeat=1):
+    """
+    Call *fn* (without arguments) *repeat* times.
+
+    :return: The result of the last call and the best time in seconds.
+    :rtype: tuple
+    """
+    time_best = None
+    for _ in range(repeat):
+        t = time.perf_counter()
+        result = fn()
+        t = time.perf_counter() - t
+        if time_best is None or t < time_best:
+            time_best = t
+    return result, time_best
+
+
+def report(title, timings):
+    """
+    Print *timings*, a list of ``(label, seconds)`` pairs,
+    with the speedup of each item relative to the last one (the previous implementation).
+    """
+    time_reference = timings[-1][1]
+    print(title)
+    for label, t in timings:
+        print("  %-24s %10.4f s  x%.2f" % (label, t, time_reference / t if t else float("inf")))
@@ -0,0 +1,218 @@
+# Apache License, Version 2.0
+
+# ./blender.bin --background -noaudio --factory-startup --python tests/python/benchmarks/bench_uvcalc_smart_project.py -- --frames 50
+#
+# Times smart UV project: merging islands into the holes of other islands,
+# then projecting generated meshes.
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import bench_utils
+
+import bpy
+from mathutils import Vector, geometry
+from bl_operators import uvcalc_smart_project
+
+
+# The previous implementation of 'mergeUvIslands',
+# testing every edge & point of both islands for each position.
+
+def islandIntersectUvIsland_reference(source, target, SourceOffset):
+    pointInIsland = uvcalc_smart_project.pointInIsland
+
+    # Edge intersect test
+    for ed in source[6]:
+        for seg in target[6]:
+            i = geometry.intersect_line_line_2d(seg[0], seg[1], SourceOffset + ed[0], SourceOffset + ed[1])
+            if i:
+                return 1  # LINE INTERSECTION
+
+    # 1 test for source being totally inside target
+    SourceOffset.resize_3d()
+    for pv in source[7]:
+        if pointInIsland(pv + SourceOffset, target[0]):
+            return 2  # SOURCE INSIDE TARGET
+
+    # 2 test for a part of the target being totally inside the source.
+    for pv in target[7]:
+        if pointInIsland(pv - SourceOffset, source[0]):
+            return 3  # PART OF TARGET INSIDE SOURCE.
+
+    return 0  # NO INTERSECTION
+
+
+def mergeUvIslands_reference(islandList, fill_holes_quality):
+    decoratedIslandList = []
+
+    islandIdx = len(islandList)
+    while islandIdx:
+        islandIdx -= 1
+        minx, miny, maxx, maxy = uvcalc_smart_project.boundsIsland(islandList[islandIdx])
+        w, h = maxx - minx, maxy - miny
+
+        totFaceArea = 0
+        offset = Vector((minx, miny))
+        for f in islandList[islandIdx]:
+            for uv in f.uv:
+                uv -= offset
+            totFaceArea += f.area
+
+        islandBoundsArea = w * h
+        efficiency = abs(islandBoundsArea - totFaceArea)
+
+        edges, uniqueEdgePoints = uvcalc_smart_project.island2Edge(islandList[islandIdx])
+
+        decoratedIslandList.append([
+            islandList[islandIdx],
+            totFaceArea,
+            efficiency,
+            islandBoundsArea,
+            w,
+            h,
+            edges,
+            uniqueEdgePoints,
+        ])
+
+    decoratedIslandListAreaSort = decoratedIslandList[:]
+    decoratedIslandListAreaSort.sort(key=lambda A: A[3])
+    decoratedIslandListEfficSort = decoratedIslandList[:]
+    decoratedIslandListEfficSort.sort(key=lambda A: -A[2])
+
+    USER_STEP_QUALITY = ((fill_holes_quality - 1) / 25.0) + 1
+    USER_FREE_SPACE_TO_TEST_QUALITY = 1 + (((100 - fill_holes_quality) / 100.0) * 5)
+
+    for sourceIsland in decoratedIslandListAreaSort:
+        for targetIsland in decoratedIslandListEfficSort:
+            if sourceIsland[0] == targetIsland[0] or not targetIsland[0] or not sourceIsland[0]:
+                continue
+            if not (
+                    targetIsland[2] > (sourceIsland[1] * USER_FREE_SPACE_TO_TEST_QUALITY) and
+                    targetIsland[4] > sourceIsland[4] and
+                    targetIsland[5] > sourceIsland[5]
+            ):
+                continue
+
+            blockTestXUnit = targetIsland[4] / sourceIsland[4]
+            blockTestYUnit = targetIsland[5] / sourceIsland[5]
+
+            testWidth = targetIsland[4] - sourceIsland[4]
+            testHeight = targetIsland[5] - sourceIsland[5]
+
+            xIncrement = (testWidth / (blockTestXUnit * ((USER_STEP_QUALITY / 50) + 0.1)))
+            yIncrement = (testHeight / (blockTestYUnit * ((USER_STEP_QUALITY / 50) + 0.1)))
+
+            if xIncrement < sourceIsland[4] / 3:
+                xIncrement = sourceIsland[4]
+            if yIncrement < sourceIsland[5] / 3:
+                yIncrement = sourceIsland[5]
+
+            boxLeft = 0
+            boxBottom = 0
+
+            while boxBottom <= testHeight:
+                Intersect = islandIntersectUvIsland_reference(
+                    sourceIsland, targetIsland, Vector((boxLeft, boxBottom)))
+
+                if Intersect == 2:  # Source inside target
+                    boxLeft += sourceIsland[4]
+                elif Intersect == 0:  # No intersection, place it.
+                    targetIsland[0].extend(sourceIsland[0])
+                    offset = Vector((boxLeft, boxBottom))
+                    for f in sourceIsland[0]:
+                        for uv in f.uv:
+                            uv += offset
+                    del sourceIsland[0][:]
+
+                    targetIsland[6].extend([(e[0] + offset, e[1] + offset, e[2]) for e in sourceIsland[6]])
+                    del sourceIsland[6][:]
+                    targetIsland[6].sort(key=lambda A: A[2])
+
+                    targetIsland[7].extend(sourceIsland[7])
+                    offset = Vector((boxLeft, boxBottom, 0.0))
+                    for p in sourceIsland[7]:
+                        p += offset
+                    del sourceIsland[7][:]
+
+                    targetIsland[1] += sourceIsland[1]
+                    targetIsland[2] -= sourceIsland[1]
+                    sourceIsland[2] = 0
+                    break
+
+                if boxLeft > testWidth:
+                    boxBottom += yIncrement
+                    boxLeft = 0.0
+                else:
+                    boxLeft += xIncrement
+
+    islandList[:] = [island for island in islandList if island]
+
+
+def island_list_create(me, islands):
+    test_smart_project = bench_utils.test_module_import("bl_operators_uvcalc_smart_project")
+    polygons = me.polygons
+    return [
+        [test_smart_project.thickface_from_polygon(me, polygons[i]) for i in island]
+        for island in islands
+    ]
+
+
+def island_list_as_tuples(island_list):
+    return [[(f.loop_start, [uv.to_tuple(5) for uv in f.uv]) for f in island] for island in island_list]
+
+
+def bench_merge(frames_num, quads_num):
+    test_smart_project = bench_utils.test_module_import("bl_operators_uvcalc_smart_project")
+    me, islands = test_smart_project.mesh_frames_and_quads_create(frames_num, quads_num)
+
+    def merge(merge_fn):
+        island_list = island_list_create(me, islands)
+        uvcalc_smart_project.dict_matrix.clear()
+        merge_fn(island_list, fill_holes_quality=50)
+        return island_list_as_tuples(island_list)
+
+    result, t_new = bench_utils.timeit(lambda: merge(uvcalc_smart_project.mergeUvIslands))
+    result_reference, t_reference = bench_utils.timeit(lambda: merge(mergeUvIslands_reference))
+    if result != result_reference:
+        print("Error: results differ from the previous implementation")
+    bench_utils.report("mergeUvIslands (%d frames, %d quads):" % (frames_num, quads_num), [
+        ("mergeUvIslands", t_new),
+        ("previous", t_reference),
+    ])
+    bpy.data.meshes.remove(me)
+
+
+def bench_smart_project(subdivisions):
+    bpy.ops.mesh.primitive_uv_sphere_add(segments=subdivisions, ring_count=subdivisions // 2)
+    obj_sphere = bpy.context.active_object
+    bpy.ops.mesh.primitive_monkey_add()
+    obj_monkey = bpy.context.active_object
+    bpy.ops.object.modifier_add(type='SUBSURF')
+    obj_monkey.modifiers[-1].levels = 2
+    bpy.ops.object.modifier_apply(modifier=obj_monkey.modifiers[-1].name)
+
+    meshes = [obj_sphere.data, obj_monkey.data]
+    settings = uvcalc_smart_project.SmartProjectSettings(island_margin=0.02, fill_holes=True)
+    _, t = bench_utils.timeit(lambda: uvcalc_smart_project.smart_project_meshes(meshes, settings))
+    bench_utils.report("smart_project_meshes (%d faces):" % sum(len(me.polygons) for me in meshes), [
+        ("smart_project_meshes", t),
+    ])
+
+    for obj in (obj_sphere, obj_monkey):
+        bpy.data.objects.remove(obj)
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Benchmark smart UV project.")
+    parser.add_argument("--frames", type=int, default=50, help="Number of islands with holes to merge into")
+    parser.add_argument("--quads", type=int, default=500, help="Number of islands to merge")
+    parser.add_argument("--subdivisions", type=int, default=256, help="Number of segments of the generated sphere")
+    args = parser.parse_args(bench_utils.argv_from_blender())
+
+    bench_merge(args.frames, args.quads)
+    bench_smart_project(args.subdivisions)
+
+
+if __name__ == '__main__':
+    main()
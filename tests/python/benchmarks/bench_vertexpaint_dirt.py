@@ -0,0 +1,116 @@
+# Apache License, Version 2.0
+
+# ./blender.bin --background -noaudio --factory-startup --python tests/python/benchmarks/bench_vertexpaint_dirt.py -- --subdivisions 300
+#
+# Times applying vertex dirt to a noisy grid.
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import bench_utils
+
+import bpy
+from bl_operators.vertexpaint_dirt import applyVertexDirt
+
+
+def apply_vertex_dirt_reference(me, blur_iterations, blur_strength, clamp_dirt, clamp_clean, dirt_only):
+    # The previous implementation.
+    from mathutils import Vector
+    from math import acos
+    import array
+
+    vert_tone = array.array("f", [0.0]) * len(me.vertices)
+    con = [[] for i in range(len(me.vertices))]
+    for e in me.edges:
+        con[e.vertices[0]].append(e.vertices[1])
+        con[e.vertices[1]].append(e.vertices[0])
+
+    for i, v in enumerate(me.vertices):
+        vec = Vector()
+        no = v.normal
+        co = v.co
+        for c in con[i]:
+            vec += (me.vertices[c].co - co).normalized()
+        tot_con = len(con[i])
+        if tot_con == 0:
+            continue
+        vec /= tot_con
+        ang = acos(no.dot(vec))
+        ang = max(clamp_dirt, ang)
+        if not dirt_only:
+            ang = min(clamp_clean, ang)
+        vert_tone[i] = ang
+
+    for i in range(blur_iterations):
+        orig_vert_tone = vert_tone[:]
+        for j, c in enumerate(con):
+            for v in c:
+                vert_tone[j] += blur_strength * orig_vert_tone[v]
+            vert_tone[j] /= len(c) * blur_strength + 1
+
+    min_tone = min(vert_tone)
+    max_tone = max(vert_tone)
+    tone_range = max_tone - min_tone
+    if tone_range < 0.0001:
+        tone_range = 0.0
+    else:
+        tone_range = 1.0 / tone_range
+
+    active_col_layer = me.vertex_colors.active.data
+    use_paint_mask = me.use_paint_mask
+    for p in me.polygons:
+        if not use_paint_mask or p.select:
+            for loop_index in p.loop_indices:
+                v = me.loops[loop_index].vertex_index
+                col = active_col_layer[loop_index].color
+                tone = (vert_tone[v] - min_tone) * tone_range
+                if dirt_only:
+                    tone = min(tone, 0.5) * 2.0
+                col[0] = tone * col[0]
+                col[1] = tone * col[1]
+                col[2] = tone * col[2]
+
+
+def colors_apply(me_orig, fn, args):
+    me = me_orig.copy()
+    me.vertex_colors.new().active = True
+    fn(me, *args)
+    colors = [value for col in me.vertex_colors.active.data for value in col.color]
+    bpy.data.meshes.remove(me)
+    return colors
+
+
+def main():
+    import argparse
+    from math import pi
+    parser = argparse.ArgumentParser(description="Benchmark applying vertex dirt.")
+    parser.add_argument("--subdivisions", type=int, default=300, help="Number of grid subdivisions on each axis")
+    parser.add_argument("--blur-iterations", type=int, default=4, help="Number of blur iterations")
+    args = parser.parse_args(bench_utils.argv_from_blender())
+
+    bpy.ops.mesh.primitive_grid_add(x_subdivisions=args.subdivisions, y_subdivisions=args.subdivisions)
+    obj = bpy.context.active_object
+    me = obj.data
+    # Some variation, so there are both creases and convex areas.
+    for v in me.vertices:
+        v.co.z = ((v.index * 7919) % 13) * 0.01
+    me.update()
+
+    dirt_args = (args.blur_iterations, 1.0, 0.0, pi, False)
+    colors, t_new = bench_utils.timeit(lambda: colors_apply(me, applyVertexDirt, dirt_args))
+    colors_reference, t_reference = bench_utils.timeit(
+        lambda: colors_apply(me, apply_vertex_dirt_reference, dirt_args))
+
+    # Only differences from single/double precision math are expected.
+    if any(abs(a - b) > 1e-5 for a, b in zip(colors, colors_reference)):
+        print("Error: results differ from the previous implementation")
+    bench_utils.report("applyVertexDirt (%d vertices):" % len(me.vertices), [
+        ("applyVertexDirt", t_new),
+        ("previous", t_reference),
+    ])
+
+    bpy.data.objects.remove(obj)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+# Apache License, Version 2.0
+
+# ./blender.bin --background -noaudio --python tests/python/bl_anim_utils.py -- --verbose
+import bpy
+import unittest
+
+from bpy_extras import anim_utils
+
+
+def armature_animated_create(name, bones_num, frame_end):
+    """
+    Create an armature object with a chain of bones using all rotation modes,
+    animated with drivers so baking has new values on every frame.
+    """
+    arm = bpy.data.armatures.new(name)
+    obj = bpy.data.objects.new(name, arm)
+    bpy.context.scene.collection.objects.link(obj)
+    bpy.context.view_layer.objects.active = obj
+    bpy.ops.object.mode_set(mode='EDIT')
+    ebone_parent = None
+    for i in range(bones_num):
+        ebone = arm.edit_bones.new("Bone.%.3d" % i)
+        ebone.head.z = i
+        ebone.tail.z = i + 1
+        ebone.parent = ebone_parent
+        ebone.bbone_segments = 4 if i % 5 == 0 else 1
+        ebone_parent = ebone
+    bpy.ops.object.mode_set(mode='OBJECT')
+
+    rotation_modes = ('QUATERNION', 'AXIS_ANGLE', 'XYZ', 'ZXY')
+    for i, pbone in enumerate(obj.pose.bones):
+        pbone.rotation_mode = rotation_modes[i % len(rotation_modes)]
+        for prop, axis, expression in (
+                ("location", 0, "sin(frame * 0.1 + %d)" % i),
+                ("scale", 1, "1.0 + 0.5 * sin(frame * 0.05)"),
+                ("bbone_curveinx", 0, "sin(frame * 0.2)"),
+                # Keep some channels constant for part of the range.
+                ("location", 2, "max(0.0, frame - %d) * 0.1" % (frame_end // 2)),
+        ):
+            fcu = pbone.driver_add(prop) if prop.startswith("bbone_") else pbone.driver_add(prop, axis)
+            fcu.driver.expression = expression
+    obj.pose.bones[0].constraints.new('DAMPED_TRACK').target = obj
+    obj.rotation_mode = 'XYZ'
+    fcu = obj.driver_add("rotation_euler", 2)
+    fcu.driver.expression = "frame * 0.2"
+    return obj
+
+
+class TestBakeAction(unittest.TestCase):
+
+    def setUp(self):
+        bpy.ops.wm.read_factory_settings(use_empty=True)
+        self.frame_end = 30
+        self.objects = [armature_animated_create("Rig.%d" % i, 12, self.frame_end) for i in range(2)]
+
+    def _bake(self, do_bulk, do_clean, actions=None):
+        return anim_utils.bake_action_objects(
+            [(obj, action) for obj, action in zip(self.objects, actions or [None] * len(self.objects))],
+            frames=range(1, self.frame_end + 1),
+            do_pose=True,
+            do_object=True,
+            do_visual_keying=True,
+            do_clean=do_clean,
+            do_bulk=do_bulk,
+        )
+
+    def _test_bake(self, do_clean, actions_init=None):
+        def actions_copy():
+            if actions_init is None:
+                return None
+            return [action.copy() for action in actions_init]
+
+        actions_reference = self._bake(False, do_clean, actions_copy())
+        actions = self._bake(True, do_clean, actions_copy())
+
+        for action, action_reference in zip(actions, actions_reference):
+            fcurves = {(fcu.data_path, fcu.array_index): fcu for fcu in action.fcurves}
+            fcurves_reference = {(fcu.data_path, fcu.array_index): fcu for fcu in action_reference.fcurves}
+            self.assertEqual(fcurves.keys(), fcurves_reference.keys())
+            for key, fcu in fcurves.items():
+                fcu_reference = fcurves_reference[key]
+                self.assertEqual(getattr(fcu.group, "name", None), getattr(fcu_reference.group, "name", None))
+                # At most one keyframe per frame, besides the 3 existing keys outside the baked range.
+                self.assertLessEqual(len(fcu.keyframe_points), self.frame_end + 3)
+                for frame in range(1, self.frame_end + 1):
+                    self.assertAlmostEqual(fcu.evaluate(frame), fcu_reference.evaluate(frame), places=4)
+        return actions
+
+    def test_bake(self):
+        self._test_bake(do_clean=False)
+
+    def test_bake_clean(self):
+        self._test_bake(do_clean=True)
+
+    def test_bake_existing(self):
+        # Keys outside of the baked range, with non-default settings, must be kept unchanged.
+        actions_init = []
+        keyframe_settings = {}
+        for obj in self.objects:
+            action = bpy.data.actions.new(obj.name)
+            for data_path, index in (
+                    ('pose.bones["Bone.000"].location', 0),
+                    ('pose.bones["Bone.001"].scale', 1),
+                    ("rotation_euler", 2),
+            ):
+                fcu = action.fcurves.new(data_path, index=index)
+                for frame, value in ((-10.0, 2.0), (-5.0, -1.0), (10.0, 0.5), (self.frame_end + 10.0, 3.0)):
+                    keyframe = fcu.keyframe_points.insert(frame, value)
+                    keyframe.interpolation = 'LINEAR' if frame < 0.0 else 'CONSTANT'
+                    keyframe.easing = 'EASE_IN'
+                    keyframe.type = 'BREAKDOWN'
+                    keyframe.handle_left_type = keyframe.handle_right_type = 'FREE'
+                    keyframe.handle_left = (frame - 1.0, value + 2.0)
+                    keyframe.handle_right = (frame + 3.0, value - 1.0)
+                    keyframe.period = 2.5
+            actions_init.append(action)
+
+            for fcu in action.fcurves:
+                for keyframe in fcu.keyframe_points:
+                    keyframe_settings[action.name, fcu.data_path, fcu.array_index, keyframe.co[0]] = (
+                        keyframe.interpolation, keyframe.easing, keyframe.type,
+                        keyframe.handle_left_type, keyframe.handle_right_type,
+                        keyframe.handle_left[:], keyframe.handle_right[:], keyframe.period,
+                    )
+
+        for do_clean in (False, True):
+            actions = self._test_bake(do_clean, actions_init)
+            for action, action_init in zip(actions, actions_init):
+                for fcu in action.fcurves:
+                    for keyframe in fcu.keyframe_points:
+                        settings = keyframe_settings.get(
+                            (action_init.name, fcu.data_path, fcu.array_index, keyframe.co[0]),
+                        )
+                        if 1.0 <= keyframe.co[0] <= self.frame_end:
+                            # Baked keyframe (the key on frame 10 is replaced).
+                            self.assertEqual(keyframe.interpolation, 'BEZIER')
+                            self.assertEqual(keyframe.easing, 'AUTO')
+                            self.assertEqual(keyframe.type, 'KEYFRAME')
+                            self.assertEqual(keyframe.handle_left_type, 'AUTO_CLAMPED')
+                        else:
+                            self.assertIsNotNone(settings)
+                            self.assertEqual((
+                                keyframe.interpolation, keyframe.easing, keyframe.type,
+                                keyframe.handle_left_type, keyframe.handle_right_type,
+                                keyframe.handle_left[:], keyframe.handle_right[:], keyframe.period,
+                            ), settings)
+
+
+if __name__ == '__main__':
+    import sys
+    sys.argv = [__file__] + (sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else [])
+    unittest.main()
@@ -0,0 +1,133 @@
+# Apache License, Version 2.0
+
+# ./blender.bin --background -noaudio --python tests/python/bl_blend_render_info.py -- --verbose
+import bpy
+import os
+import shutil
+import tempfile
+import unittest
+
+import blend_render_info
+
+
+class TestBlendRenderInfo(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tempdir = tempfile.mkdtemp()
+
+        bpy.ops.wm.read_factory_settings()
+        scene = bpy.context.scene
+        scene.name = "Main"
+        scene.frame_start = 10
+        scene.frame_end = 120
+        scene_other = bpy.data.scenes.new("Other")
+        scene_other.frame_start = -5
+        scene_other.frame_end = 5
+
+        cls.scenes = [(-5, 5, "Other"), (10, 120, "Main")]
+        cls.filepath = os.path.join(cls.tempdir, "uncompressed.blend")
+        cls.filepath_compressed = os.path.join(cls.tempdir, "compressed.blend")
+        bpy.ops.wm.save_as_mainfile(filepath=cls.filepath, check_existing=False, copy=True, compress=False)
+        bpy.ops.wm.save_as_mainfile(filepath=cls.filepath_compressed, check_existing=False, copy=True, compress=True)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tempdir)
+
+    def test_read_blend_rend_chunk(self):
+        for filepath in (self.filepath, self.filepath_compressed):
+            scenes = blend_render_info.read_blend_rend_chunk(filepath)
+            self.assertEqual(sorted(scenes), self.scenes)
+
+    def test_blocks(self):
+        for filepath in (self.filepath, self.filepath_compressed):
+            blocks = list(blend_render_info.blend_blocks_iter(filepath, codes={b'SC\0\0'}))
+            self.assertEqual(len([block for block in blocks if block[0] == b'REND']), len(self.scenes))
+            for code, _sdna_index, _count, data in blocks:
+                self.assertEqual(data is not None, code == b'SC\0\0')
+            self.assertIn(b'DNA1', [block[0] for block in blocks])
+
+    def test_read_blend_rend_chunks(self):
+        directory = os.path.join(self.tempdir, "batch")
+        os.makedirs(directory, exist_ok=True)
+
+        files_num = 20
+        for i in range(files_num):
+            shutil.copyfile(
+                self.filepath_compressed if i % 2 else self.filepath,
+                os.path.join(directory, "%.4d.blend" % i),
+            )
+
+        paths = blend_render_info.blend_paths_from_args([directory])
+        self.assertEqual(len(paths), files_num)
+
+        result = {path: blend_render_info.read_blend_rend_chunk(path) for path in paths}
+        result_parallel = blend_render_info.read_blend_rend_chunks(paths)
+
+        self.assertEqual([sorted(scenes) for scenes in result.values()], [self.scenes] * files_num)
+        self.assertEqual(result_parallel, result)
+
+    def _truncated_files(self):
+        """
+        Return ``(filepath, scenes_num)`` pairs for copies of the test file
+        truncated at different offsets, with the number of scenes before the offset
+        (None when unknown, compressed data is read in large chunks).
+        """
+        with blend_render_info.BlendFileHandle(self.filepath) as blend:
+            sizeof_bhead = 24 if blend.is_64_bit else 20
+        # File header, then the REND blocks (a BHead and 'RenderInfo' data of 72 bytes).
+        sizeof_rend = sizeof_bhead + 72
+        with open(self.filepath, "rb") as fh:
+            data = fh.read()
+        with open(self.filepath_compressed, "rb") as fh:
+            data_compressed = fh.read()
+
+        files = []
+        for name, data_truncated, scenes_num in (
+                # Inside the data of the second REND block.
+                ("rend", data[:12 + sizeof_rend + sizeof_bhead + 10], 1),
+                # Inside the BHead & data of the block after the REND blocks.
+                ("bhead", data[:12 + sizeof_rend * 2 + 10], 2),
+                ("block", data[:12 + sizeof_rend * 2 + sizeof_bhead + 10], 2),
+                # Inside the last blocks, so skipping blocks reaches the end.
+                ("end", data[:len(data) - 100], 2),
+                # Compressed stream ending early.
+                ("compressed", data_compressed[:len(data_compressed) // 2], None),
+        ):
+            filepath = os.path.join(self.tempdir, "truncated_%s.blend" % name)
+            with open(filepath, "wb") as fh:
+                fh.write(data_truncated)
+            files.append((filepath, scenes_num))
+        return files
+
+    def test_truncated(self):
+        for filepath, scenes_num in self._truncated_files():
+            scenes = blend_render_info.read_blend_rend_chunk(filepath)
+            if scenes_num is not None:
+                self.assertEqual(len(scenes), scenes_num)
+            for scene in scenes:
+                self.assertIn(scene, self.scenes)
+            blocks = list(blend_render_info.blend_blocks_iter(filepath))
+            self.assertNotIn(b'ENDB', [block[0] for block in blocks])
+
+    def test_read_blend_rend_chunks_errors(self):
+        filepath_error = os.path.join(self.tempdir, "directory.blend")
+        os.makedirs(filepath_error, exist_ok=True)
+        files = self._truncated_files()
+        paths = [self.filepath, filepath_error] + [filepath for filepath, _scenes_num in files]
+        for jobs in (1, 2):
+            errors = {}
+            result = blend_render_info.read_blend_rend_chunks(paths, jobs=jobs, errors=errors)
+            self.assertEqual(list(errors.keys()), [filepath_error])
+            self.assertEqual(result[filepath_error], [])
+            self.assertEqual(sorted(result[self.filepath]), self.scenes)
+            for filepath, scenes_num in files:
+                if scenes_num is not None:
+                    self.assertEqual(len(result[filepath]), scenes_num)
+
+
+if __name__ == '__main__':
+    import sys
+    sys.argv = [__file__] + (sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else [])
+    unittest.main()
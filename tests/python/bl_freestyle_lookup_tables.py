@@ -0,0 +1,89 @@
+# Apache License, Version 2.0
+
+# ./blender.bin --background -noaudio --python tests/python/bl_freestyle_lookup_tables.py -- --verbose
+import bpy
+import unittest
+
+import parameter_editor
+from _freestyle import evaluateColorRamp
+
+# Maximum difference between the lookup tables and direct evaluation.
+TOLERANCE = 1e-3
+
+
+class TestLookupTables(unittest.TestCase):
+
+    def setUp(self):
+        self.linestyle = bpy.data.linestyles.new("Test")
+
+        color_modifier = self.linestyle.color_modifiers.new("Color", type='ALONG_STROKE')
+        ramp = color_modifier.color_ramp
+        ramp.interpolation = 'EASE'
+        ramp.elements.new(0.3).color = (1.0, 0.0, 0.0, 1.0)
+        self.ramp = ramp
+
+        alpha_modifier = self.linestyle.alpha_modifiers.new("Alpha", type='ALONG_STROKE')
+        alpha_modifier.mapping = 'CURVE'
+        alpha_modifier.curve.curves[0].points.new(0.25, 0.8)
+        alpha_modifier.curve.curves[0].points.new(0.6, 0.1)
+        self.curve = alpha_modifier.curve
+
+        # Samples, including values between the table samples and outside the table range.
+        self.samples = [i / 997 for i in range(998)] + [-0.5, 1.5]
+
+    def tearDown(self):
+        bpy.data.linestyles.remove(self.linestyle)
+
+    def _color_ramp_shader(self):
+        return parameter_editor.ColorAlongStrokeShader('MIX', 1.0, self.ramp)
+
+    def _curve_shader(self):
+        return parameter_editor.AlphaAlongStrokeShader('MIX', 1.0, 'CURVE', False, self.curve)
+
+    def test_color_ramp(self):
+        shader = self._color_ramp_shader()
+        values = [shader.evaluate(t) for t in self.samples]
+        values_direct = [evaluateColorRamp(self.ramp, t).xyz for t in self.samples]
+        for value, value_direct in zip(values, values_direct):
+            for a, b in zip(value, value_direct):
+                self.assertAlmostEqual(a, b, delta=TOLERANCE)
+
+    def test_curve(self):
+        shader = self._curve_shader()
+        values = [shader.evaluate(t) for t in self.samples]
+        values_direct = [shader.CURVE(t) for t in self.samples]
+        for value, value_direct in zip(values, values_direct):
+            self.assertAlmostEqual(value, value_direct, delta=TOLERANCE)
+
+    def test_invalidate(self):
+        self.assertEqual(self._color_ramp_shader().evaluate(0.0), (0.0, 0.0, 0.0))
+        self.ramp.elements[0].color = (0.0, 0.0, 1.0, 1.0)
+        self.assertEqual(self._color_ramp_shader().evaluate(0.0), (0.0, 0.0, 1.0))
+
+        value = self._curve_shader().evaluate(0.25)
+        self.curve.curves[0].points[1].location = (0.25, 0.4)
+        self.curve.update()
+        self.assertNotAlmostEqual(self._curve_shader().evaluate(0.25), value, delta=TOLERANCE)
+
+    def test_clear(self):
+        self._color_ramp_shader()
+        self._curve_shader()
+        self.assertNotEqual(parameter_editor._lookup_tables, {})
+        # Tables aren't kept between render jobs.
+        self.assertIn(parameter_editor._lookup_tables_clear, bpy.app.handlers.render_init)
+        parameter_editor._lookup_tables_clear(bpy.context.scene)
+        self.assertEqual(parameter_editor._lookup_tables, {})
+
+    def test_blend(self):
+        for blend_type in ('MIX', 'ADD', 'MULTIPLY', 'SUBTRACT', 'DIVIDE', 'DIFFERENCE', 'MINIMUM', 'MAXIMUM'):
+            shader = parameter_editor.AlphaAlongStrokeShader(blend_type, 0.5, 'LINEAR', False, None)
+            self.assertIsInstance(shader.blend(0.5, 0.25), float)
+        shader.influence = 1.0
+        self.assertEqual(shader.blend(0.5, 0.25), 0.5)
+        self.assertEqual(shader.blend(0.25, 0.5), 0.5)
+
+
+if __name__ == '__main__':
+    import sys
+    sys.argv = [__file__] + (sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else [])
+    unittest.main()
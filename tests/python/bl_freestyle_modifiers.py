@@ -0,0 +1,417 @@
+# Apache License, Version 2.0
+
+# ./blender.bin --background -noaudio --factory-startup --python tests/python/bl_freestyle_modifiers.py -- --verbose
+import bpy
+import unittest
+
+import parameter_editor
+from freestyle.functions import CurveMaterialF0D
+from freestyle.types import Interface0DIterator, Nature, Noise
+from freestyle.utils import (
+    angle_x_normal,
+    curvature_from_stroke_vertex,
+    iter_distance_from_object,
+    iter_material_value,
+    iter_t2d_along_stroke,
+)
+from _freestyle import blendRamp
+from mathutils import Vector
+from math import pi, radians
+
+# Maximum difference between the batched and the per-vertex modifiers,
+# the per-vertex modifiers round the attributes to floats after each modifier.
+TOLERANCE = 1e-4
+
+
+def blend_types(modifier_type):
+    return [item.identifier for item in modifier_type.bl_rna.properties["blend"].enum_items]
+
+
+COLOR_BLEND_TYPES = blend_types(bpy.types.LineStyleColorModifier_AlongStroke)
+SCALAR_BLEND_TYPES = blend_types(bpy.types.LineStyleAlphaModifier_AlongStroke)
+
+
+# -----------------------------------------------------------------------------
+# Per-vertex modifiers, applying each modifier to the stroke vertices directly
+# (as done before 'BatchedModifiersShader').
+
+def reference_blend(blend_type, fac, v1, v2):
+    facm = 1.0 - fac
+    if blend_type == 'MIX':
+        v1 = facm * v1 + fac * v2
+    elif blend_type == 'ADD':
+        v1 += fac * v2
+    elif blend_type == 'MULTIPLY':
+        v1 *= facm + fac * v2
+    elif blend_type == 'SUBTRACT':
+        v1 -= fac * v2
+    elif blend_type == 'DIVIDE':
+        v1 = facm * v1 + fac * v1 / v2 if v2 != 0.0 else v1
+    elif blend_type == 'DIFFERENCE':
+        v1 = facm * v1 + fac * abs(v1 - v2)
+    elif blend_type == 'MINIMUM':
+        v1 = min(fac * v2, v1)
+    elif blend_type == 'MAXIMUM':
+        v1 = max(fac * v2, v1)
+    else:
+        raise ValueError("unknown curve blend type: " + blend_type)
+    return v1
+
+
+def reference_set_thickness(modifier, svert, outer, inner):
+    fe = svert.fedge
+    nature = fe.nature
+    if (nature & Nature.BORDER):
+        if modifier.persp_camera:
+            point = -svert.point_3d.normalized()
+            dir = point.dot(fe.normal_left)
+        else:
+            dir = fe.normal_left.z
+        if dir < 0.0:  # the back side is visible
+            outer, inner = inner, outer
+    elif (nature & Nature.SILHOUETTE):
+        if fe.is_smooth:
+            outer, inner = inner, outer
+    else:
+        outer = inner = (outer + inner) / 2
+    svert.attribute.thickness = (outer, inner)
+
+
+def reference_blend_thickness(modifier, svert, v):
+    outer, inner = svert.attribute.thickness
+    v = reference_blend(modifier.blend_type, modifier.influence, outer + inner, v)
+    if modifier.position == 'CENTER':
+        outer = inner = v * 0.5
+    elif modifier.position == 'INSIDE':
+        outer, inner = 0, v
+    elif modifier.position == 'OUTSIDE':
+        outer, inner = v, 0
+    elif modifier.position == 'RELATIVE':
+        outer, inner = v * modifier.ratio, v - (v * modifier.ratio)
+    reference_set_thickness(modifier, svert, outer, inner)
+
+
+def reference_blend_thickness_asymmetric(modifier, svert, right, left):
+    old = svert.attribute.thickness
+    right, left = (
+        reference_blend(modifier.blend_type, modifier.influence, v1, v2)
+        for v1, v2 in zip(old, (right, left))
+    )
+    fe = svert.fedge
+    nature = fe.nature
+    if (nature & Nature.BORDER):
+        if modifier.persp_camera:
+            point = -svert.point_3d.normalized()
+            dir = point.dot(fe.normal_left)
+        else:
+            dir = fe.normal_left.z
+        if dir < 0.0:  # the back side is visible
+            right, left = left, right
+    elif (nature & Nature.SILHOUETTE):
+        if fe.is_smooth:
+            right, left = left, right
+    svert.attribute.thickness = (right, left)
+
+
+def reference_noise(modifier, stroke):
+    n1, n2 = modifier.noise1, modifier.noise2
+    initU1 = stroke.length_2d * modifier.seed + n1.rand(512) * modifier.seed
+    initU2 = stroke.length_2d * modifier.seed + n2.rand() * modifier.seed
+    return [
+        (n1.turbulence_smooth(modifier.scale * svert.curvilinear_abscissa + initU1, 2),
+         n2.turbulence_smooth(modifier.scale * svert.curvilinear_abscissa + initU2, 2))
+        for svert in stroke
+    ]
+
+
+def reference_params(modifier, stroke):
+    """
+    Returns the value passed to 'modifier.evaluate' for each stroke vertex,
+    None leaves the vertex unchanged.
+    """
+    name = type(modifier).__name__
+    if "AlongStroke" in name:
+        return list(iter_t2d_along_stroke(stroke))
+    elif "DistanceFromCamera" in name:
+        # The distance from the camera is the distance from the origin in the camera coordinates.
+        return [t for svert, t in iter_distance_from_object(stroke, Vector((0.0, 0.0, 0.0)), *modifier.range)]
+    elif "DistanceFromObject" in name:
+        return [t for svert, t in iter_distance_from_object(stroke, modifier.loc, *modifier.range)]
+    elif "Material" in name:
+        return [value for svert, value in iter_material_value(stroke, CurveMaterialF0D(), modifier.attribute)]
+    elif "Tangent" in name:
+        it = Interface0DIterator(stroke)
+        return [angle_x_normal(it) / pi for svert in it]
+    elif "CreaseAngle" in name:
+        return [
+            None if angle is None else modifier.angle.interpolate(angle)
+            for angle in map(parameter_editor.crease_angle, stroke)
+        ]
+    elif "Curvature3D" in name:
+        return [
+            0.0 if curvature is None else modifier.curvature.interpolate(abs(curvature))
+            for curvature in map(curvature_from_stroke_vertex, stroke)
+        ]
+    elif "Noise" in name:
+        return [abs(noiseval1 + noiseval2) for noiseval1, noiseval2 in reference_noise(modifier, stroke)]
+    raise TypeError("no reference for modifier: " + name)
+
+
+def reference_shade(modifiers, stroke):
+    for modifier in modifiers:
+        if isinstance(modifier, parameter_editor.BaseThicknessShader):
+            modifier.shade(stroke)
+        elif isinstance(modifier, parameter_editor.ThicknessNoiseShader):
+            for svert, (noiseval1, noiseval2) in zip(stroke, reference_noise(modifier, stroke)):
+                right, left = svert.attribute.thickness
+                left += noiseval1 * modifier.amplitude
+                right += noiseval2 * modifier.amplitude
+                if modifier.asymmetric:
+                    reference_blend_thickness_asymmetric(modifier, svert, right, left)
+                else:
+                    reference_blend_thickness(modifier, svert, right + left)
+        elif (
+                isinstance(modifier, parameter_editor.ColorMaterialShader) and
+                not modifier.use_ramp and modifier.attribute in {'LINE', 'DIFF', 'SPEC'}
+        ):
+            func = CurveMaterialF0D()
+            it = Interface0DIterator(stroke)
+            for svert in it:
+                material = func(it)
+                if modifier.attribute == 'LINE':
+                    b = material.line[0:3]
+                elif modifier.attribute == 'DIFF':
+                    b = material.diffuse[0:3]
+                else:
+                    b = material.specular[0:3]
+                svert.attribute.color = blendRamp(modifier.blend, svert.attribute.color, modifier.influence, b)
+        elif isinstance(modifier, parameter_editor.ColorRampModifier):
+            for svert, t in zip(stroke, reference_params(modifier, stroke)):
+                if t is not None:
+                    a = svert.attribute.color
+                    b = modifier.evaluate(t)
+                    svert.attribute.color = blendRamp(modifier.blend, a, modifier.influence, b)
+        elif isinstance(modifier, parameter_editor.ThicknessBlenderMixIn):
+            value = modifier.value if hasattr(modifier, "value") else modifier.thickness
+            for svert, t in zip(stroke, reference_params(modifier, stroke)):
+                if t is not None:
+                    b = value.min + modifier.evaluate(t) * value.delta
+                    reference_blend_thickness(modifier, svert, b)
+        else:
+            for svert, t in zip(stroke, reference_params(modifier, stroke)):
+                if t is not None:
+                    a = svert.attribute.alpha
+                    b = modifier.evaluate(t)
+                    svert.attribute.alpha = reference_blend(modifier.blend_type, modifier.influence, a, b)
+
+
+def noise_reset():
+    # The noise values depend on the previous strokes,
+    # start from the same state for both implementations.
+    parameter_editor.NoiseShader.noise1 = Noise(1)
+    parameter_editor.NoiseShader.noise2 = Noise(2)
+
+
+def stroke_attributes(stroke):
+    return [
+        (tuple(svert.attribute.color), svert.attribute.alpha, tuple(svert.attribute.thickness))
+        for svert in stroke
+    ]
+
+
+def stroke_attributes_set(stroke, attributes):
+    for svert, (color, alpha, thickness) in zip(stroke, attributes):
+        svert.attribute.color = color
+        svert.attribute.alpha = alpha
+        svert.attribute.thickness = thickness
+
+
+@unittest.skipUnless(bpy.app.build_options.cycles, "Cycles is needed to render the strokes")
+class TestBatchedModifiers(unittest.TestCase):
+
+    def setUp(self):
+        scene = bpy.context.scene
+        scene.render.engine = 'CYCLES'
+        scene.cycles.samples = 1
+        scene.render.resolution_x = 64
+        scene.render.resolution_y = 64
+        scene.render.resolution_percentage = 100
+        scene.render.use_freestyle = True
+
+        self.linestyle = bpy.context.view_layer.freestyle_settings.linesets[0].linestyle
+        self.linestyle.chaining = 'PLAIN'
+        self.linestyle.use_same_object = True
+        self.linestyle.thickness = 4.0
+        self.linestyle.thickness_position = 'RELATIVE'
+        self.linestyle.thickness_ratio = 0.3
+        self.linestyle.color = (0.2, 0.4, 0.6)
+        self.linestyle.alpha = 0.8
+
+        # A smooth object, for curved silhouettes & a target for the distance modifiers.
+        bpy.ops.mesh.primitive_uv_sphere_add(radius=0.6, location=(0.0, 0.0, 1.6))
+        bpy.ops.object.shade_smooth()
+        self.sphere = bpy.context.active_object
+
+        self.shade_orig = parameter_editor.BatchedModifiersShader.shade
+        self.use_batched_modifiers_orig = parameter_editor.use_batched_modifiers
+        self.noise_orig = parameter_editor.NoiseShader.noise1, parameter_editor.NoiseShader.noise2
+        parameter_editor.use_batched_modifiers = True
+
+    def tearDown(self):
+        parameter_editor.BatchedModifiersShader.shade = self.shade_orig
+        parameter_editor.use_batched_modifiers = self.use_batched_modifiers_orig
+        parameter_editor.NoiseShader.noise1, parameter_editor.NoiseShader.noise2 = self.noise_orig
+        self._modifiers_clear()
+        bpy.data.objects.remove(self.sphere)
+
+    def _modifiers_clear(self):
+        for modifiers in (
+                self.linestyle.color_modifiers,
+                self.linestyle.alpha_modifiers,
+                self.linestyle.thickness_modifiers,
+        ):
+            for modifier in modifiers[:]:
+                modifiers.remove(modifier)
+
+    def _modifiers_add(self, color_blend, scalar_blend):
+        linestyle = self.linestyle
+
+        # Vary the attributes along the stroke before blending.
+        modifier = linestyle.color_modifiers.new("Color Base", type='ALONG_STROKE')
+        modifier.color_ramp.elements[1].color = (1.0, 0.5, 0.0, 1.0)
+        modifier = linestyle.color_modifiers.new("Color", type='ALONG_STROKE')
+        modifier.blend = color_blend
+        modifier.influence = 0.7
+        modifier.color_ramp.elements[0].color = (0.0, 0.3, 0.9, 1.0)
+        modifier.color_ramp.elements.new(0.4).color = (0.8, 0.1, 0.2, 1.0)
+
+        modifier = linestyle.alpha_modifiers.new("Alpha Base", type='ALONG_STROKE')
+        modifier.invert = True
+        modifier = linestyle.alpha_modifiers.new("Alpha", type='ALONG_STROKE')
+        modifier.blend = scalar_blend
+        modifier.influence = 0.7
+        modifier.mapping = 'CURVE'
+        modifier.curve.curves[0].points.new(0.5, 0.2)
+        modifier.curve.update()
+
+        modifier = linestyle.thickness_modifiers.new("Thickness", type='ALONG_STROKE')
+        modifier.blend = scalar_blend
+        modifier.influence = 0.7
+        modifier.value_min = 1.0
+        modifier.value_max = 6.0
+
+    def _modifiers_add_type(self, modifier_type):
+        linestyle = self.linestyle
+        color_modifier = linestyle.color_modifiers.new("Color", type=modifier_type)
+        alpha_modifier = linestyle.alpha_modifiers.new("Alpha", type=modifier_type)
+        thickness_modifier = linestyle.thickness_modifiers.new("Thickness", type=modifier_type)
+        modifiers = (color_modifier, alpha_modifier, thickness_modifier)
+        for modifier in modifiers:
+            modifier.influence = 0.7
+        alpha_modifier.invert = True
+
+        if modifier_type in {'DISTANCE_FROM_CAMERA', 'DISTANCE_FROM_OBJECT'}:
+            for modifier in modifiers:
+                if modifier_type == 'DISTANCE_FROM_CAMERA':
+                    modifier.range_min = 9.0
+                    modifier.range_max = 13.0
+                else:
+                    modifier.target = self.sphere
+                    modifier.range_min = 0.5
+                    modifier.range_max = 3.0
+            thickness_modifier.value_min = 1.0
+            thickness_modifier.value_max = 6.0
+        elif modifier_type == 'MATERIAL':
+            color_modifier.material_attribute = 'DIFF'
+            color_modifier.use_ramp = False
+            modifier = linestyle.color_modifiers.new("Color Ramp", type=modifier_type)
+            modifier.material_attribute = 'DIFF_G'
+            modifier.use_ramp = True
+            alpha_modifier.material_attribute = 'SPEC'
+            thickness_modifier.material_attribute = 'ALPHA'
+            thickness_modifier.value_min = 1.0
+            thickness_modifier.value_max = 6.0
+        elif modifier_type == 'CREASE_ANGLE':
+            for modifier in modifiers:
+                modifier.angle_min = radians(60.0)
+                modifier.angle_max = radians(120.0)
+        elif modifier_type == 'CURVATURE_3D':
+            for modifier in modifiers:
+                modifier.curvature_min = 0.0
+                modifier.curvature_max = 3.0
+        elif modifier_type == 'NOISE':
+            for modifier in modifiers:
+                modifier.period = 5.0
+                modifier.seed = 7
+            color_modifier.amplitude = 0.5
+            alpha_modifier.amplitude = 0.5
+            thickness_modifier.amplitude = 2.0
+            thickness_modifier.use_asymmetric = True
+            modifier = linestyle.thickness_modifiers.new("Thickness Symmetric", type=modifier_type)
+            modifier.amplitude = 2.0
+            modifier.use_asymmetric = False
+
+        if modifier_type in {'TANGENT', 'CREASE_ANGLE', 'CURVATURE_3D'}:
+            thickness_modifier.thickness_min = 1.0
+            thickness_modifier.thickness_max = 6.0
+
+    def _render(self):
+        shade_orig = self.shade_orig
+        strokes = []
+
+        def shade(shader, stroke):
+            attributes = stroke_attributes(stroke)
+            noise_reset()
+            reference_shade(shader.modifiers, stroke)
+            attributes_reference = stroke_attributes(stroke)
+            stroke_attributes_set(stroke, attributes)
+            noise_reset()
+            shade_orig(shader, stroke)
+            strokes.append((attributes_reference, stroke_attributes(stroke)))
+
+        parameter_editor.BatchedModifiersShader.shade = shade
+        bpy.ops.render.render()
+        return strokes
+
+    def _compare(self, strokes):
+        self.assertNotEqual(strokes, [])
+        for attributes_reference, attributes in strokes:
+            self.assertEqual(len(attributes_reference), len(attributes))
+            for (color_ref, alpha_ref, thickness_ref), (color, alpha, thickness) in zip(
+                    attributes_reference, attributes,
+            ):
+                for a, b in zip(color_ref, color):
+                    self.assertAlmostEqual(a, b, delta=TOLERANCE)
+                self.assertAlmostEqual(alpha_ref, alpha, delta=TOLERANCE)
+                for a, b in zip(thickness_ref, thickness):
+                    self.assertAlmostEqual(a, b, delta=TOLERANCE)
+
+    def test_blend(self):
+        for i in range(max(len(COLOR_BLEND_TYPES), len(SCALAR_BLEND_TYPES))):
+            color_blend = COLOR_BLEND_TYPES[i % len(COLOR_BLEND_TYPES)]
+            scalar_blend = SCALAR_BLEND_TYPES[i % len(SCALAR_BLEND_TYPES)]
+            with self.subTest(color_blend=color_blend, scalar_blend=scalar_blend):
+                self._modifiers_clear()
+                self._modifiers_add(color_blend, scalar_blend)
+                self._compare(self._render())
+
+    def test_modifier_types(self):
+        for modifier_type in (
+                'DISTANCE_FROM_CAMERA',
+                'DISTANCE_FROM_OBJECT',
+                'MATERIAL',
+                'TANGENT',
+                'CREASE_ANGLE',
+                'CURVATURE_3D',
+                'NOISE',
+        ):
+            with self.subTest(modifier_type=modifier_type):
+                self._modifiers_clear()
+                self._modifiers_add_type(modifier_type)
+                self._compare(self._render())
+
+
+if __name__ == '__main__':
+    import sys
+    sys.argv = [__file__] + (sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else [])
+    unittest.main()
@@ -0,0 +1,89 @@
+# Apache License, Version 2.0
+
+# ./blender.bin --background -noaudio --factory-startup --python tests/python/bl_freestyle_profile.py -- --verbose
+import bpy
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import parameter_editor
+
+
+class TestProfile(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.profile_filepath_orig = parameter_editor.profile_filepath
+        parameter_editor.profile_filepath = os.path.join(self.tempdir, "profile_#.json")
+        parameter_editor._profile_frame_clear(bpy.context.scene)
+
+    def tearDown(self):
+        parameter_editor.profile_filepath = self.profile_filepath_orig
+        parameter_editor._profile_frame_clear(bpy.context.scene)
+        shutil.rmtree(self.tempdir)
+
+    def _profile(self, lineset_name):
+        profile = parameter_editor.LinesetProfile(bpy.context.scene, "ViewLayer", lineset_name)
+        profile.stage("selection")
+        profile.counts["chains"] = 3
+        shader = parameter_editor.BatchedModifiersShader([
+            parameter_editor.AlphaAlongStrokeShader('MIX', 1.0, 'LINEAR', False, None),
+        ])
+        shaders_list = profile.shaders_wrap([shader])
+        profile.stage("shaders_setup")
+        return profile, shaders_list
+
+    def _profile_read(self, frame):
+        with open(os.path.join(self.tempdir, "profile_%.4d.json" % frame), encoding="utf-8") as fh:
+            return json.load(fh)
+
+    def test_as_dict(self):
+        profile, shaders_list = self._profile("LineSet")
+        self.assertEqual(len(shaders_list), 1)
+        self.assertIsInstance(shaders_list[0], parameter_editor.ProfileShader)
+
+        profile_dict = profile.as_dict()
+        self.assertEqual(profile_dict["frame"], bpy.context.scene.frame_current)
+        self.assertEqual(profile_dict["layer"], "ViewLayer")
+        self.assertEqual(profile_dict["lineset"], "LineSet")
+        self.assertEqual(list(profile_dict["stages"]), ["selection", "shaders_setup"])
+        self.assertAlmostEqual(profile_dict["time"], sum(profile_dict["stages"].values()))
+        self.assertEqual(
+            [(shader["name"], shader["strokes"]) for shader in profile_dict["shaders"]],
+            [("BatchedModifiersShader", 0), ("BatchedModifiersShader/AlphaAlongStrokeShader", 0)],
+        )
+        self.assertEqual(profile_dict["counts"], {"chains": 3})
+        # Written as JSON.
+        json.dumps(profile_dict)
+
+    def test_profile_write(self):
+        scene = bpy.context.scene
+        frame = scene.frame_current
+
+        # All line sets of the frame are written to its file.
+        for lineset_name in ("LineSet", "LineSet 2"):
+            parameter_editor.profile_write(self._profile(lineset_name)[0])
+        self.assertEqual([item["lineset"] for item in self._profile_read(frame)], ["LineSet", "LineSet 2"])
+
+        # Rendering the frame again replaces the profiles of the previous render.
+        self.assertIn(parameter_editor._profile_frame_clear, bpy.app.handlers.render_pre)
+        parameter_editor._profile_frame_clear(scene)
+        parameter_editor.profile_write(self._profile("LineSet")[0])
+        self.assertEqual([item["lineset"] for item in self._profile_read(frame)], ["LineSet"])
+
+        # Another frame has its own file.
+        scene.frame_set(frame + 1)
+        try:
+            parameter_editor.profile_write(self._profile("LineSet")[0])
+        finally:
+            scene.frame_set(frame)
+        self.assertEqual([item["frame"] for item in self._profile_read(frame + 1)], [frame + 1])
+        self.assertEqual(len(self._profile_read(frame)), 1)
+
+
+if __name__ == '__main__':
+    import sys
+    sys.argv = [__file__] + (sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else [])
+    unittest.main()
@@ -0,0 +1,160 @@
+# Apache License, Version 2.0
+
+# ./blender.bin --background -noaudio --python tests/python/bl_freestyle_utils.py -- --verbose
+import unittest
+import random
+from array import array
+
+from mathutils import Vector
+from freestyle import utils
+from freestyle.types import Stroke, StrokeVertex
+
+
+def points_random(rng, points_num, noise):
+    x = y = 0.0
+    points = []
+    for _ in range(points_num):
+        x += rng.uniform(0.0, 2.0)
+        y += rng.gauss(0.0, noise)
+        points.append(Vector((x, y)))
+    return points
+
+
+def segment_sqdist(p, p1, p2):
+    # Square distance between a point and a segment.
+    (x, y), (x1, y1), (x2, y2) = p, p1, p2
+    dx, dy = x2 - x1, y2 - y1
+    t = 0.0
+    if dx or dy:
+        t = min(max(((x - x1) * dx + (y - y1) * dy) / (dx * dx + dy * dy), 0.0), 1.0)
+    dx, dy = x - (x1 + dx * t), y - (y1 + dy * t)
+    return dx * dx + dy * dy
+
+
+def stroke_from_points(points):
+    stroke = Stroke()
+    for point in points:
+        svert = StrokeVertex()
+        svert.point = point
+        stroke.insert_vertex(svert, stroke.stroke_vertices_end())
+    return stroke
+
+
+def polyline_length(points):
+    return sum((b - a).length for a, b in zip(points, points[1:]))
+
+
+# Points (exact in single precision), tolerance & the indices of the kept points.
+SIMPLIFY_CASES = (
+    ([(0, 0), (1, 0), (2, 0), (3, 0)], 0.1, [0, 3]),
+    ([(0, 0), (1, 1), (2, 0), (3, 1), (4, 0)], 0.5, [0, 1, 2, 3, 4]),
+    ([(0, 0), (1, 1), (2, 0), (3, 1), (4, 0)], 2.0, [0, 4]),
+    ([(0, 0), (1, 0.25), (2, -0.25), (3, 5), (4, 6.5), (5, 7), (6, 8.25), (7, 9), (8, 9), (9, 9)], 0.5,
+     [0, 2, 3, 4, 7, 9]),
+    ([(0, 0), (1, 0.25), (2, -0.25), (3, 5), (4, 6.5), (5, 7), (6, 8.25), (7, 9), (8, 9), (9, 9)], 0.2,
+     [0, 1, 2, 3, 4, 5, 7, 9]),
+    ([(0, 0), (0, 0), (0, 0)], 0.0, [0, 2]),
+    ([(0, 0), (2, 3), (0, 0)], 1.0, [0, 1, 2]),
+    ([(0, 0)], 1.0, [0]),
+)
+
+
+class TestSimplify(unittest.TestCase):
+
+    def test_simplify_known(self):
+        for points, tolerance, kept in SIMPLIFY_CASES:
+            points = [Vector(point) for point in points]
+            with self.subTest(points=points, tolerance=tolerance):
+                self.assertEqual(utils.simplify(points, tolerance), tuple(points[i] for i in kept))
+
+    def test_simplify(self):
+        rng = random.Random(0)
+        for points_num in (1, 2, 3, 10, 100, 1000):
+            for noise in (0.01, 1.0):
+                points = points_random(rng, points_num, noise)
+                coords = array('d', [value for point in points for value in point])
+                for tolerance in (0.0, 0.1, 1.0, 5.0):
+                    kept = utils.simplify_indices(coords, tolerance * tolerance)
+                    self.assertEqual(utils.simplify(points, tolerance), tuple(points[i] for i in kept))
+                    # The end points are kept.
+                    self.assertEqual(kept[0], 0)
+                    self.assertEqual(kept[-1], points_num - 1)
+                    self.assertEqual(kept, sorted(set(kept)))
+                    # Removed points are within tolerance of the segment replacing them.
+                    for first, last in zip(kept, kept[1:]):
+                        for i in range(first + 1, last):
+                            self.assertLessEqual(
+                                segment_sqdist(points[i], points[first], points[last]),
+                                (tolerance + 1e-3) ** 2,
+                            )
+
+    def test_simplify_batch(self):
+        rng = random.Random(1)
+        points_groups = [points_random(rng, rng.randint(1, 200), 1.0) for _ in range(50)]
+        coords = array('d', [value for points in points_groups for point in points for value in point])
+        offsets = array('i', [0])
+        for points in points_groups:
+            offsets.append(offsets[-1] + len(points))
+
+        coords_simplified, offsets_simplified = utils.simplify_batch(coords, offsets, 0.5)
+        for i, points in enumerate(points_groups):
+            self.assertEqual(
+                [point[:] for point in utils.simplify(points, 0.5)],
+                [
+                    tuple(coords_simplified[j * 2:j * 2 + 2])
+                    for j in range(offsets_simplified[i], offsets_simplified[i + 1])
+                ],
+            )
+
+
+class TestSimplifyStroke(unittest.TestCase):
+
+    def _test_stroke(self, points, tolerance, simplify_fn):
+        stroke = stroke_from_points(points)
+        # Use the points as stored in the stroke (single precision).
+        points = [svert.point.copy() for svert in stroke]
+        points_expected = [point[:] for point in utils.simplify(points, tolerance)]
+
+        simplify_fn(stroke, tolerance)
+        points_simplified = [svert.point[:] for svert in stroke]
+        self.assertEqual(points_simplified, points_expected)
+        self.assertEqual(len(stroke), len(points_expected))
+
+        # The length & curvilinear abscissa are those of the simplified stroke.
+        # Accumulated in single precision.
+        length = polyline_length([Vector(point) for point in points_simplified])
+        self.assertAlmostEqual(stroke.length_2d, length, delta=length * 1e-5 + 1e-5)
+        self.assertAlmostEqual(stroke[-1].curvilinear_abscissa, length, delta=length * 1e-5 + 1e-5)
+        self.assertEqual(stroke[0].curvilinear_abscissa, 0.0)
+        return points, points_simplified
+
+    def test_simplify_stroke(self):
+        rng = random.Random(3)
+        for points_num in (2, 10, 200):
+            for tolerance in (0.0, 0.1, 1.0, 5.0):
+                self._test_stroke(points_random(rng, points_num, 1.0), tolerance, utils.simplify_stroke)
+
+    def test_simplify_stroke_known(self):
+        for points, tolerance, kept in SIMPLIFY_CASES:
+            if len(points) < 2:
+                continue
+            points_orig, points_simplified = self._test_stroke(points, tolerance, utils.simplify_stroke)
+            self.assertEqual(points_simplified, [points_orig[i][:] for i in kept])
+
+    def test_simplification_shader(self):
+        import parameter_editor
+
+        def shade(stroke, tolerance):
+            parameter_editor.SimplificationShader(tolerance).shade(stroke)
+
+        points, points_simplified = self._test_stroke(
+            [(0, 0), (1, 0), (2, 0), (3, 0), (4, 0), (5, 1)], 0.5, shade,
+        )
+        # No vertex is left behind the last point.
+        self.assertEqual(points_simplified, [points[0][:], points[4][:], points[5][:]])
+
+
+if __name__ == '__main__':
+    import sys
+    sys.argv = [__file__] + (sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else [])
+    unittest.main()
@@ -0,0 +1,162 @@
+# Apache License, Version 2.0
+
+# ./blender.bin --background -noaudio --python tests/python/bl_i18n_utils_extract_messages.py -- --verbose
+import os
+import pickle
+import shutil
+import tempfile
+import types
+import unittest
+
+from bl_i18n_utils import bl_extract_messages
+from bl_i18n_utils import settings as settings_i18n
+
+SOURCE = r'''/* Messages of all kinds of keywords. */
+static void draw(bContext *C, ReportList *reports, uiLayout *layout)
+{
+  uiItemL(layout, IFACE_("Label"), ICON_NONE);
+  uiItemL(layout, CTX_IFACE_(BLT_I18NCONTEXT_ID_MESH, "Mesh"), ICON_NONE);
+  const char *tip = TIP_("Some tooltip");
+  BKE_report(reports, RPT_ERROR, "Cannot do "
+                                 "that");
+  BKE_reportf(reports, RPT_WARNING, "Value %d", 1);
+  uiItemL(layout, IFACE_(
+                      "Split "
+                      /* A comment. */
+                      "label"), ICON_NONE);
+  CTX_wm_operator_poll_msg_set(C, "Not in edit mode");
+  BLT_I18N_MSGID_MULTI_CTXT("New", BLT_I18NCONTEXT_ID_MESH, BLT_I18NCONTEXT_ID_CURVE);
+  uiItemL(layout, CTX_N_("Context", "Message"), ICON_NONE);
+  uiItemL(layout, N_("Label"), ICON_NONE);
+  uiItemL(layout, IFACE_(name), ICON_NONE);
+}
+'''
+
+# Messages of 'SOURCE' by keyword, then by position (lines are counted from zero).
+SOURCE_MESSAGES = [
+    ((None,), '"Label"', 3),
+    ((None,), '"Split "\n                      /* A comment. */\n                      "label"', 9),
+    ((None,), '"Some tooltip"', 5),
+    ((None,), '"Label"', 16),
+    (("BLT_I18NCONTEXT_ID_MESH",), '"Mesh"', 4),
+    (('"Context"',), '"Message"', 15),
+    ((None,), '"Cannot do "\n                                 "that"', 6),
+    ((None,), '"Value %d"', 8),
+    ((None,), '"Not in edit mode"', 13),
+    (("BLT_I18NCONTEXT_ID_MESH",), '"New"', 14),
+]
+
+
+def file_write(path, data):
+    with open(path, "w") as f:
+        f.write(data)
+
+
+class TestExtractSrcFileMessages(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def _extract(self, data):
+        path = os.path.join(self.tempdir, "source.c")
+        file_write(path, data)
+        return bl_extract_messages.extract_src_file_messages(
+            path, tuple(settings_i18n.PYGETTEXT_KEYWORDS), settings_i18n.PYGETTEXT_MAX_MULTI_CTXT,
+        )
+
+    def test_messages(self):
+        self.assertEqual(self._extract(SOURCE), SOURCE_MESSAGES)
+
+    def test_messages_none(self):
+        self.assertEqual(self._extract(""), [])
+        self.assertEqual(self._extract("static int IFACE_;\nint a = b(IFACE_);\n"), [])
+
+
+class TestDumpSrcMessages(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.source_dir = os.path.join(self.tempdir, "source")
+        os.makedirs(os.path.join(self.source_dir, "editors"))
+        file_write(os.path.join(self.source_dir, "draw.c"), SOURCE)
+        file_write(os.path.join(self.source_dir, "editors", "ops.h"), 'static const char *msg = N_("Header");\n')
+        # Not a source file.
+        file_write(os.path.join(self.source_dir, "notes.txt"), 'IFACE_("Notes")\n')
+
+        # A copy, so that the global settings aren't modified.
+        self.settings = types.SimpleNamespace(**settings_i18n.I18nSettings().__dict__)
+        self.settings.SOURCE_DIR = self.source_dir
+        self.settings.POTFILES_SOURCE_DIR = self.source_dir
+        self.settings.SRC_POTFILES = os.path.join(self.tempdir, "POTFILES.in")
+        self.settings.SRC_MESSAGES_CACHE = os.path.join(self.tempdir, "src_messages.cache")
+
+        # Record the files actually parsed.
+        self.extracted = []
+        extract_src_file_messages_orig = bl_extract_messages.extract_src_file_messages
+
+        def extract_src_file_messages(path, *args):
+            self.extracted.append(os.path.relpath(path, self.source_dir))
+            return extract_src_file_messages_orig(path, *args)
+
+        bl_extract_messages.extract_src_file_messages = extract_src_file_messages
+        self.addCleanup(setattr, bl_extract_messages, "extract_src_file_messages", extract_src_file_messages_orig)
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def _dump(self):
+        self.extracted.clear()
+        reports = bl_extract_messages._gen_reports(None)
+        bl_extract_messages.dump_src_messages({}, reports, self.settings)
+        return reports["src_messages"]
+
+    def test_cache(self):
+        files = ["draw.c", os.path.join("editors", "ops.h")]
+        src_messages = self._dump()
+        self.assertEqual(self.extracted, files)
+        self.assertEqual(len(src_messages), len(SOURCE_MESSAGES) + 1)
+        self.assertEqual(src_messages[-1], (self.settings.DEFAULT_CONTEXT, "Header", files[1] + ":0"))
+        with open(self.settings.SRC_MESSAGES_CACHE, "rb") as f:
+            self.assertEqual(sorted(pickle.load(f)), files)
+
+        # Nothing is parsed again when no file changed.
+        self.assertEqual(self._dump(), src_messages)
+        self.assertEqual(self.extracted, [])
+
+        # Only the modified file is parsed again.
+        file_write(os.path.join(self.source_dir, files[1]), 'static const char *msg = N_("Header 2");\n')
+        src_messages[-1] = (self.settings.DEFAULT_CONTEXT, "Header 2", files[1] + ":0")
+        self.assertEqual(self._dump(), src_messages)
+        self.assertEqual(self.extracted, files[1:])
+
+        # Removed files are removed from the cache.
+        os.remove(os.path.join(self.source_dir, files[1]))
+        file_write(os.path.join(self.source_dir, files[0]), SOURCE + 'static int a = TIP_("Tip");\n')
+        self.assertIn((self.settings.DEFAULT_CONTEXT, "Tip", files[0] + ":19"), self._dump())
+        self.assertEqual(self.extracted, files[:1])
+        with open(self.settings.SRC_MESSAGES_CACHE, "rb") as f:
+            self.assertEqual(sorted(pickle.load(f)), files[:1])
+
+    def test_cache_keywords(self):
+        # All files are parsed again when the keywords change.
+        src_messages = self._dump()
+        # Only the 'IFACE_' messages.
+        self.settings.PYGETTEXT_KEYWORDS = self.settings.PYGETTEXT_KEYWORDS[:1]
+        self.assertEqual(self._dump(), src_messages[:2])
+        self.assertEqual(len(self.extracted), 2)
+
+    def test_cache_invalid(self):
+        # An unreadable cache is ignored.
+        src_messages = self._dump()
+        file_write(self.settings.SRC_MESSAGES_CACHE, "Invalid")
+        self.assertEqual(self._dump(), src_messages)
+        self.assertEqual(len(self.extracted), 2)
+
+
+if __name__ == '__main__':
+    import sys
+    sys.argv = [__file__] + (sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else [])
+    unittest.main()
@@ -0,0 +1,149 @@
+# Apache License, Version 2.0
+
+# ./blender.bin --background -noaudio --python tests/python/bl_i18n_utils_similar_mo.py -- --verbose
+import unittest
+import gettext
+import io
+import os
+import random
+import struct
+import tempfile
+
+from bl_i18n_utils import utils
+
+WORDS = (
+    "the of object mesh render add remove set value color size scale factor use enable node input output "
+    "vertex edge face select all none invert active layer bake physics particles time frame"
+).split()
+
+
+def msgids_random(rng, msgids_num):
+    return list(dict.fromkeys(
+        " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 8))).capitalize()
+        for _ in range(msgids_num)
+    ))
+
+
+def msgid_mutate(rng, msgid):
+    msgid = list(msgid)
+    msgid[rng.randrange(len(msgid))] = rng.choice("abcxyz ")
+    return "".join(msgid)
+
+
+class TestSimilarMsgidIndex(unittest.TestCase):
+
+    def setUp(self):
+        rng = random.Random(0)
+        self.pool = tuple(msgids_random(rng, 1000))
+        self.msgids = msgids_random(rng, 100) + [msgid_mutate(rng, rng.choice(self.pool)) for _ in range(100)]
+        self.msgids += ["", "a", "Mesh", "xyz"]
+
+    def test_best_similar(self):
+        for use_similar in (0.5, 0.75, 0.9):
+            index = utils.SimilarMsgidIndex(self.pool)
+            result = [index.best_similar(msgid, use_similar) for msgid in self.msgids]
+            result_reference = [utils.get_best_similar((("", msgid), use_similar, self.pool))[1] for msgid in self.msgids]
+            self.assertEqual(result, result_reference)
+
+    def test_best_similar_empty(self):
+        index = utils.SimilarMsgidIndex(())
+        self.assertIsNone(index.best_similar("Mesh", 0.75))
+
+
+def mo_hash_lookup(data, key):
+    # Lookup of a key using the hash table of a mo file, the way GNU gettext does.
+    messages_num, keys_offset, _msgstrs_offset, hash_size, hash_offset = struct.unpack_from("<5I", data, 8)
+    hval = utils.mo_key_hash(key)
+    idx = hval % hash_size
+    incr = 1 + (hval % (hash_size - 2))
+    while True:
+        i = struct.unpack_from("<I", data, hash_offset + idx * 4)[0]
+        if i == 0:
+            return None
+        length, offset = struct.unpack_from("<2I", data, keys_offset + (i - 1) * 8)
+        if data[offset:offset + length] == key:
+            return i - 1
+        idx += incr
+        if idx >= hash_size:
+            idx -= hash_size
+
+
+class TestMO(unittest.TestCase):
+
+    def setUp(self):
+        settings = utils.settings
+        default_context = settings.DEFAULT_CONTEXT
+        rng = random.Random(0)
+        self.messages = utils.I18nMessages(uid="fr_FR")
+        header = "Project-Id-Version: Test\nContent-Type: text/plain; charset=UTF-8\n"
+        self.messages.msgs[settings.PO_HEADER_KEY] = utils.I18nMessage(
+            [default_context], [""], [header], [], False, False,
+        )
+        self.translated = {}
+        for i, msgid in enumerate(msgids_random(rng, 2000) + ["Élément", "Tab\tand\nnew line", "Sèvres"]):
+            msgctxt = rng.choice((default_context, default_context, "Operator", "ID_Object"))
+            msgstr = "" if i % 7 == 0 else "{} -> ❤ {}".format(msgid.upper(), i)
+            is_fuzzy = i % 11 == 0
+            is_commented = i % 13 == 0
+            key = (msgctxt, msgid)
+            self.messages.msgs[key] = utils.I18nMessage([msgctxt], [msgid], [msgstr], [], is_commented, is_fuzzy)
+            if msgstr and not (is_fuzzy or is_commented):
+                self.translated[key] = msgstr
+        self.data = io.BytesIO()
+        self.messages.write('MO', self.data)
+        self.data = self.data.getvalue()
+
+    def test_key_hash(self):
+        # Values from gettext's 'hash_string' (32 bit 'hashpjw').
+        for key, hval in (
+                (b"", 0),
+                (b"a", 97),
+                (b"Mesh", 343192),
+                (b"Operator\x04Add Cube", 56946549),
+                ("Élément".encode("utf-8"), 148961364),
+                # Carries into bit 32 on the last character.
+                (b"hemlezvsntkfgolteyafpeuregeqviyzevmaujdmfshujv", 22),
+        ):
+            self.assertEqual(utils.mo_key_hash(key), hval)
+
+    def test_gettext(self):
+        default_context = utils.settings.DEFAULT_CONTEXT
+        translations = gettext.GNUTranslations(io.BytesIO(self.data))
+        self.assertEqual(translations.info()["project-id-version"], "Test")
+        self.assertEqual(translations.charset(), "UTF-8")
+        # Header is the only message in the catalog besides translated ones.
+        self.assertEqual(len(translations._catalog), len(self.translated) + 1)
+        for (msgctxt, msgid), msgstr in self.translated.items():
+            if msgctxt == default_context:
+                self.assertEqual(translations.gettext(msgid), msgstr)
+            else:
+                self.assertEqual(translations.pgettext(msgctxt, msgid), msgstr)
+        for (msgctxt, msgid), msg in self.messages.msgs.items():
+            if (msgctxt, msgid) not in self.translated and msgid:
+                self.assertNotIn(msgid if msgctxt == default_context else msgctxt + "\x04" + msgid,
+                                 translations._catalog)
+
+    def test_hash_table(self):
+        keys = [key for key, _msgstr in self.messages.mo_messages()]
+        self.assertEqual(keys, sorted(keys))
+        for i, key in enumerate(keys):
+            self.assertEqual(mo_hash_lookup(self.data, key), i)
+        self.assertIsNone(mo_hash_lookup(self.data, b"Not a message"))
+
+    def test_write_to_mo(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            i18n = utils.I18n()
+            for uid in ("fr_FR", "de_DE", "es"):
+                self.messages.uid = uid
+                i18n.trans[uid] = self.messages
+                i18n.src[uid] = os.path.join(tmp_dir, uid + ".po")
+            i18n.write('MO')
+            for uid in ("fr_FR", "de_DE", "es"):
+                with open(os.path.join(tmp_dir, uid + ".mo"), 'rb') as f:
+                    self.assertEqual(f.read(), self.data)
+
+
+if __name__ == '__main__':
+    import sys
+    sys.argv = [__file__] + (sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else [])
+    unittest.main()
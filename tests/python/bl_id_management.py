@@ -178,6 +178,60 @@ class TestIdRename(TestHelper, unittest.TestCase):
         self.ensure_proper_order()
 
 
+class TestObjectRelationsIndex(unittest.TestCase):
+
+    def setUp(self):
+        bpy.data.batch_remove(bpy.data.objects)
+        bpy.data.batch_remove(bpy.data.collections)
+
+        scene = bpy.context.scene
+        collection_a = bpy.data.collections.new("A")
+        collection_b = bpy.data.collections.new("B")
+        scene.collection.children.link(collection_a)
+        scene.collection.children.link(collection_b)
+
+        self.objects = []
+        parent = None
+        for i in range(20):
+            obj = bpy.data.objects.new("Object.%.3d" % i, None)
+            if i % 3:
+                obj.parent = parent
+            else:
+                parent = obj
+            collection_a.objects.link(obj)
+            if i % 2:
+                collection_b.objects.link(obj)
+            if i % 5 == 0:
+                scene.collection.objects.link(obj)
+            self.objects.append(obj)
+
+        # Object that isn't used anywhere.
+        self.objects.append(bpy.data.objects.new("Orphan", None))
+
+    def tearDown(self):
+        bpy.utils.object_relations_index_enable(False)
+
+    def _relations(self):
+        return [
+            (obj.children, obj.users_collection, obj.users_scene)
+            for obj in self.objects
+        ]
+
+    def test_index_matches_search(self):
+        relations_search = self._relations()
+        bpy.utils.object_relations_index_enable()
+        relations_index = self._relations()
+        self.assertEqual(relations_search, relations_index)
+
+    def test_index_refresh(self):
+        bpy.utils.object_relations_index_enable()
+        obj_parent, obj_child = self.objects[-2:]
+        self.assertEqual(obj_parent.children, ())
+        obj_child.parent = obj_parent
+        bpy.utils.object_relations_index_refresh()
+        self.assertEqual(obj_parent.children, (obj_child,))
+
+
 if __name__ == '__main__':
     import sys
     sys.argv = [__file__] + (sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else [])
@@ -0,0 +1,96 @@
+# Apache License, Version 2.0
+
+# ./blender.bin --background -noaudio --python tests/python/bl_io_utils.py -- --verbose
+import unittest
+
+from bpy_extras import io_utils
+
+# Names including numbered duplicates of other names & empty names.
+NAMES = ["Cube", "Cube", "Cube.001", "Cube", "Material.Long.Name", "Material.Long.Name", "", "", "Cube.002"]
+
+
+def names_colliding(names_num):
+    """
+    Names sharing a few base names, including names which look like
+    numbered duplicates of other names.
+    """
+    bases = ("Cube", "Material", "Cube.001", "Material.Long.Name", "")
+    return [bases[i % len(bases)] for i in range(names_num)] + ["Cube.%03d" % i for i in range(0, names_num, 7)]
+
+
+class TestUniqueName(unittest.TestCase):
+
+    def _test_unique_name(self, names_expected, **kwargs):
+        for name_dict in ({}, io_utils.UniqueNameAllocator()):
+            names = [io_utils.unique_name(key, name, name_dict, **kwargs) for key, name in enumerate(NAMES)]
+            self.assertEqual(names, names_expected)
+            # Existing keys keep their name.
+            self.assertEqual(io_utils.unique_name(0, "Other", name_dict, **kwargs), names_expected[0])
+
+    def test_unique_name(self):
+        self._test_unique_name(
+            ['Cube', 'Cube.001', 'Cube.001.001', 'Cube.002',
+             'Material.Long.Name', 'Material.Long.Name.001', '', '.001', 'Cube.002.001'],
+        )
+
+    def test_unique_name_sep(self):
+        self._test_unique_name(
+            ['Cube', 'Cube_001', 'Cube.001', 'Cube_002',
+             'Material.Long.Name', 'Material.Long.Name_001', '', '_001', 'Cube.002'],
+            sep="_",
+        )
+
+    def test_unique_name_max(self):
+        self._test_unique_name(
+            ['Cube', 'Cube.001', 'Cube.002', 'Cube.003', 'Material', 'Mate.001', '', '.001', 'Cube.004'],
+            name_max=8,
+        )
+
+    def test_unique_name_clean_func(self):
+        self._test_unique_name(
+            ['Cube', 'Cube.001', 'Cube_001', 'Cube.002',
+             'Material_Long_Name', 'Material_Long_Name.001', '', '.001', 'Cube_002'],
+            clean_func=lambda name: name.replace(".", "_"),
+        )
+
+    def test_unique_name_colliding(self):
+        names = names_colliding(500)
+        for kwargs in ({}, {"sep": "_"}, {"name_max": 8}):
+            name_dict = {}
+            name_allocator = io_utils.UniqueNameAllocator()
+            # Reuse some keys, their name must not change.
+            keys = [i % (len(names) - 3) for i in range(len(names))]
+            for key, name in zip(keys, names):
+                io_utils.unique_name(key, name, name_dict, **kwargs)
+                io_utils.unique_name(key, name, name_allocator, **kwargs)
+            self.assertEqual(name_allocator, name_dict)
+            self.assertEqual(len(set(name_allocator.values())), len(name_allocator))
+            if "name_max" in kwargs:
+                self.assertLessEqual(max(len(name) for name in name_allocator.values()), kwargs["name_max"])
+
+    def test_unique_name_allocator_init(self):
+        name_dict = {"a": "Cube", "b": "Cube.001"}
+        name_allocator = io_utils.UniqueNameAllocator(name_dict)
+        self.assertEqual(io_utils.unique_name("c", "Cube", name_allocator), "Cube.002")
+        self.assertEqual(io_utils.unique_name("a", "Other", name_allocator), "Cube")
+
+    def test_unique_name_allocator_add(self):
+        # All ways of adding items make their names unavailable.
+        name_allocator = io_utils.UniqueNameAllocator()
+        name_allocator.update({"a": "Cube"})
+        name_allocator.update(b="Cube.001")
+        name_allocator.setdefault("c", "Cube.002")
+        name_allocator |= {"d": "Cube.003"}
+        name_allocator["e"] = "Cube.004"
+        self.assertEqual(name_allocator.allocate("f", "Cube"), "Cube.005")
+
+        name_allocator_copy = name_allocator.copy()
+        self.assertIsInstance(name_allocator_copy, io_utils.UniqueNameAllocator)
+        self.assertEqual(name_allocator_copy.allocate("g", "Cube"), "Cube.006")
+        self.assertEqual(name_allocator.allocate("h", "Cube"), "Cube.006")
+
+
+if __name__ == '__main__':
+    import sys
+    sys.argv = [__file__] + (sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else [])
+    unittest.main()
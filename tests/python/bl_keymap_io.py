@@ -0,0 +1,72 @@
+# Apache License, Version 2.0
+
+# ./blender.bin --background -noaudio --factory-startup --python tests/python/bl_keymap_io.py -- --verbose
+import bpy
+import os
+import unittest
+
+from bl_keymap_utils import io
+
+KEYMAP_DATA_DIR = os.path.join(
+    os.path.dirname(__file__), os.pardir, os.pardir,
+    "release", "scripts", "presets", "keyconfig", "keymap_data",
+)
+BLENDER_DEFAULT_FILEPATH = os.path.join(KEYMAP_DATA_DIR, "blender_default.py")
+
+
+class TestKeyconfigData(unittest.TestCase):
+
+    def test_data_cached(self):
+        params = {"select_mouse": 'LEFT', "spacebar_action": 'SEARCH'}
+        keyconfig_data = io.keyconfig_data_from_file_cached(BLENDER_DEFAULT_FILEPATH, params, use_disk_cache=False)
+        keyconfig_data_cached = io.keyconfig_data_from_file_cached(
+            BLENDER_DEFAULT_FILEPATH, params, use_disk_cache=False,
+        )
+
+        blender_default = bpy.utils.execfile(BLENDER_DEFAULT_FILEPATH)
+        keyconfig_data_reference = blender_default.generate_keymaps(blender_default.Params(**params))
+        self.assertEqual(keyconfig_data, keyconfig_data_reference)
+        self.assertEqual(keyconfig_data_cached, keyconfig_data_reference)
+
+        # Each call returns its own copy.
+        keyconfig_data_cached[0][2]["items"].clear()
+        self.assertEqual(
+            io.keyconfig_data_from_file_cached(BLENDER_DEFAULT_FILEPATH, params, use_disk_cache=False),
+            keyconfig_data_reference,
+        )
+
+        # Different parameters don't use the same data.
+        self.assertNotEqual(
+            io.keyconfig_data_from_file_cached(
+                BLENDER_DEFAULT_FILEPATH, {"select_mouse": 'RIGHT'}, use_disk_cache=False,
+            ),
+            keyconfig_data_reference,
+        )
+
+    def test_init_from_data(self):
+        keyconfig_data = io.keyconfig_data_from_file_cached(BLENDER_DEFAULT_FILEPATH, {}, use_disk_cache=False)
+        wm = bpy.context.window_manager
+        kc = wm.keyconfigs.new("TestKeyconfigData")
+        try:
+            io.keyconfig_init_from_data(kc, keyconfig_data)
+            for km_name, km_args, km_content in keyconfig_data:
+                km = kc.keymaps[km_name]
+                self.assertEqual(len(km.keymap_items), len(km_content["items"]))
+                if km_args.get("modal", False):
+                    continue
+                for kmi, (kmi_idname, _kmi_args, kmi_data) in zip(km.keymap_items, km_content["items"]):
+                    self.assertEqual(kmi.idname, kmi_idname)
+                    if kmi_data is None:
+                        continue
+                    for attr, value in kmi_data.get("properties", ()):
+                        # Skip nested properties & floats (stored with less precision).
+                        if type(value) in {bool, int, str}:
+                            self.assertEqual(getattr(kmi.properties, attr), value)
+        finally:
+            wm.keyconfigs.remove(kc)
+
+
+if __name__ == '__main__':
+    import sys
+    sys.argv = [__file__] + (sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else [])
+    unittest.main()
@@ -0,0 +1,127 @@
+# Apache License, Version 2.0
+
+# ./blender.bin --background -noaudio --python tests/python/bl_mesh_utils.py -- --verbose
+import bpy
+import unittest
+from array import array
+
+from bpy_extras import mesh_utils
+
+
+def mesh_islands_create(islands_num, island_size):
+    """
+    Create a mesh of separate grids of ``island_size * island_size`` quads,
+    each with its own UV island.
+    """
+    side = island_size + 1
+    co = array('f')
+    faces = array('i')
+    for island in range(islands_num):
+        offset = island * side * side
+        for y in range(side):
+            for x in range(side):
+                co.extend((x + island * side, y, 0.0))
+        for y in range(island_size):
+            for x in range(island_size):
+                v = offset + y * side + x
+                faces.extend((v, v + 1, v + side + 1, v + side))
+
+    me = bpy.data.meshes.new("Islands")
+    me.from_buffers(co, faces=faces, face_sizes=4)
+    uv_layer = me.uv_layers.new()
+    # Use the (unique) XY location as UV.
+    vert_indices = array('i', [0]) * len(me.loops)
+    me.loops.foreach_get("vertex_index", vert_indices)
+    uv_layer.data.foreach_set("uv", array('f', [
+        value for v in vert_indices for value in co[v * 3:v * 3 + 2]
+    ]))
+    me.calc_loop_triangles()
+    return me
+
+
+class TestMeshLinked(unittest.TestCase):
+
+    def setUp(self):
+        self.islands_num, self.island_size = 200, 3
+        self.mesh = mesh_islands_create(self.islands_num, self.island_size)
+
+    def tearDown(self):
+        bpy.data.meshes.remove(self.mesh)
+
+    def _island_polygons(self, island):
+        # Islands are created in order, from consecutive polygons.
+        polys_per_island = self.island_size * self.island_size
+        return list(range(island * polys_per_island, (island + 1) * polys_per_island))
+
+    def test_linked_uv_islands(self):
+        islands = mesh_utils.mesh_linked_uv_islands(self.mesh)
+        self.assertEqual(len(islands), self.islands_num)
+        for i, island in enumerate(islands):
+            self.assertEqual(sorted(island), self._island_polygons(i))
+            # Each island starts with its first polygon.
+            self.assertEqual(island[0], min(island))
+
+        island_index = mesh_utils.mesh_linked_uv_islands(self.mesh, use_island_index=True)
+        self.assertEqual(len(island_index), len(self.mesh.polygons))
+        for i, island in enumerate(islands):
+            for poly_index in island:
+                self.assertEqual(island_index[poly_index], i)
+
+    def test_linked_triangles(self):
+        tri_groups = mesh_utils.mesh_linked_triangles(self.mesh)
+        self.assertEqual(len(tri_groups), self.islands_num)
+        tris_per_island = self.island_size * self.island_size * 2
+        for i, tri_group in enumerate(tri_groups):
+            self.assertEqual(len(tri_group), tris_per_island)
+            self.assertEqual(sorted({tri.polygon_index for tri in tri_group}), self._island_polygons(i))
+
+        tri_group_index = mesh_utils.mesh_linked_triangles(self.mesh, use_island_index=True)
+        for i, tri_group in enumerate(tri_groups):
+            for tri in tri_group:
+                self.assertEqual(tri_group_index[tri.index], i)
+
+
+class TestMeshEdgeKeys(unittest.TestCase):
+
+    @staticmethod
+    def _pairs(values):
+        return list(zip(values[0::2], values[1::2]))
+
+    def setUp(self):
+        bpy.ops.mesh.primitive_monkey_add()
+        self.obj = bpy.context.active_object
+        self.mesh = self.obj.data
+        self.mesh.calc_loop_triangles()
+
+    def tearDown(self):
+        bpy.data.objects.remove(self.obj)
+
+    def test_edge_keys(self):
+        mesh = self.mesh
+        self.assertEqual(self._pairs(mesh_utils.edge_keys_array(mesh)), mesh.edge_keys)
+        self.assertEqual(
+            self._pairs(mesh_utils.loop_edge_keys_array(mesh)),
+            [key for poly in mesh.polygons for key in poly.edge_keys],
+        )
+        self.assertEqual(
+            self._pairs(mesh_utils.loop_triangle_edge_keys_array(mesh)),
+            [key for tri in mesh.loop_triangles for key in tri.edge_keys],
+        )
+
+    def test_edge_face_count(self):
+        mesh = self.mesh
+        edge_face_count_dict = {}
+        for poly in mesh.polygons:
+            for key in poly.edge_keys:
+                edge_face_count_dict[key] = edge_face_count_dict.get(key, 0) + 1
+        edge_face_count = [edge_face_count_dict.get(key, 0) for key in mesh.edge_keys]
+
+        self.assertEqual(mesh_utils.edge_face_count_dict(mesh), edge_face_count_dict)
+        self.assertEqual(mesh_utils.edge_face_count(mesh), edge_face_count)
+        self.assertEqual(mesh_utils.edge_face_count_array(mesh).tolist(), edge_face_count)
+
+
+if __name__ == '__main__':
+    import sys
+    sys.argv = [__file__] + (sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else [])
+    unittest.main()
@@ -0,0 +1,151 @@
+# Apache License, Version 2.0
+
+# ./blender.bin --background -noaudio --factory-startup --python tests/python/bl_operators_clip.py -- --verbose
+import bpy
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from bl_operators import clip as clip_operators
+from mathutils import Vector
+
+
+def image_create(filepath, width, height):
+    # A single image is loaded as a clip of this size.
+    image = bpy.data.images.new("Frame", width, height)
+    image.filepath_raw = filepath
+    image.file_format = 'PNG'
+    image.save()
+    bpy.data.images.remove(image)
+
+
+def tracks_create(clip, tracks_num, frame_start, frame_end, seed):
+    """
+    Tracks moving in the same direction with gaps between markers,
+    some markers outside the frame range and a few spikes.
+    """
+    rng = random.Random(seed)
+    for track_index in range(tracks_num):
+        frame_first = rng.randint(frame_start - 5, frame_end - 10)
+        frame_last = rng.randint(frame_first + 1, frame_end + 5)
+        track = clip.tracking.tracks.new(name="Track.%03d" % track_index, frame=frame_first)
+        co = Vector((rng.uniform(0.2, 0.8), rng.uniform(0.2, 0.8)))
+        for frame in range(frame_first, frame_last + 1):
+            co.x += 0.001 + rng.uniform(-0.0005, 0.0005)
+            co.y += rng.uniform(-0.0005, 0.0005)
+            # The marker added with the track is always replaced.
+            if frame != frame_first and rng.random() < 0.1:
+                continue
+            if rng.random() < 0.02:
+                track.markers.insert_frame(frame, co=co + Vector((0.05, -0.05)))
+            else:
+                track.markers.insert_frame(frame, co=co)
+        track.select = rng.random() < 0.5
+
+
+def tracks_filter_reference(clip, frame_start, frame_end, threshold):
+    # The previous implementation of 'CLIP_OT_filter_tracks._filter_values',
+    # finding the markers of each frame with 'find_frame'.
+    def get_marker_coordinates_in_pixels(clip_size, track, frame_number):
+        marker = track.markers.find_frame(frame_number)
+        return Vector((marker.co[0] * clip_size[0], marker.co[1] * clip_size[1]))
+
+    def marker_velocity(clip_size, track, frame):
+        marker_a = get_marker_coordinates_in_pixels(clip_size, track, frame)
+        marker_b = get_marker_coordinates_in_pixels(clip_size, track, frame - 1)
+        return marker_a - marker_b
+
+    clip_size = clip.size[:]
+    tracks_to_clean = set()
+
+    for frame in range(frame_start, frame_end + 1):
+        relevant_tracks = [
+            track for track in clip.tracking.tracks
+            if (track.markers.find_frame(frame) and
+                track.markers.find_frame(frame - 1))
+        ]
+        if not relevant_tracks:
+            continue
+
+        average_velocity = Vector((0.0, 0.0))
+        for track in relevant_tracks:
+            track.select = False
+            average_velocity += marker_velocity(clip_size, track, frame)
+        average_velocity = average_velocity / len(relevant_tracks)
+
+        for track in relevant_tracks:
+            track_velocity = marker_velocity(clip_size, track, frame)
+            distance = (average_velocity - track_velocity).length
+            if distance > threshold:
+                tracks_to_clean.add(track)
+
+    for track in tracks_to_clean:
+        track.select = True
+    return len(tracks_to_clean)
+
+
+class TestClipTracks(unittest.TestCase):
+    frame_start = 20
+    frame_end = 80
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.filepath = os.path.join(self.tempdir, "frame.png")
+        image_create(self.filepath, 640, 480)
+        self.clips = []
+
+    def tearDown(self):
+        for clip in self.clips:
+            bpy.data.movieclips.remove(clip)
+        shutil.rmtree(self.tempdir)
+
+    def _clip_create(self, tracks_num, seed):
+        clip = bpy.data.movieclips.load(self.filepath)
+        self.clips.append(clip)
+        tracks_create(clip, tracks_num, self.frame_start, self.frame_end, seed)
+        return clip
+
+    def test_tracks_marker_matrix(self):
+        clip = self._clip_create(10, seed=0)
+        tracks = clip.tracking.tracks[:]
+        co, valid = clip_operators.CLIP_tracks_marker_matrix(tracks, self.frame_start, self.frame_end)
+        frames_num = self.frame_end - self.frame_start + 1
+        self.assertEqual(len(valid), len(tracks) * frames_num)
+        self.assertEqual(len(co), len(tracks) * frames_num * 2)
+
+        index = 0
+        for track in tracks:
+            for frame in range(self.frame_start, self.frame_end + 1):
+                marker = track.markers.find_frame(frame)
+                self.assertEqual(bool(valid[index]), marker is not None)
+                if marker is not None:
+                    self.assertEqual(tuple(co[index * 2:index * 2 + 2]), tuple(marker.co))
+                index += 1
+
+    def test_tracks_filter(self):
+        for seed in range(3):
+            with self.subTest(seed=seed):
+                clip = self._clip_create(30, seed=seed)
+                tracks = clip.tracking.tracks
+                select = [track.select for track in tracks]
+
+                num_reference = tracks_filter_reference(clip, self.frame_start, self.frame_end, 5.0)
+                select_reference = [track.select for track in tracks]
+
+                for track, track_select in zip(tracks, select):
+                    track.select = track_select
+                num = clip_operators.CLIP_tracks_filter(clip, self.frame_start, self.frame_end, 5.0)
+
+                self.assertEqual(num, num_reference)
+                self.assertEqual([track.select for track in tracks], select_reference)
+                # Only the tracks with spikes are selected.
+                self.assertGreater(num, 0)
+                self.assertLess(num, len(tracks))
+
+
+if __name__ == '__main__':
+    import sys
+    sys.argv = [__file__] + (sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else [])
+    unittest.main()
@@ -0,0 +1,106 @@
+# Apache License, Version 2.0
+
+# ./blender.bin --background -noaudio --python tests/python/bl_operators_rigidbody.py -- --verbose
+import bpy
+import unittest
+
+
+def rigidbody_scene_create(objects_num, frame_end):
+    """
+    Create a scene with ``objects_num`` cubes falling on a passive ground plane,
+    using all rotation modes.
+    """
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    scene = bpy.context.scene
+    scene.frame_start = 1
+    scene.frame_end = frame_end
+    bpy.ops.rigidbody.world_add()
+    scene.rigidbody_world.point_cache.frame_end = frame_end
+
+    bpy.ops.mesh.primitive_plane_add(size=100.0)
+    bpy.ops.rigidbody.object_add(type='PASSIVE')
+
+    rotation_modes = ('QUATERNION', 'AXIS_ANGLE', 'XYZ', 'ZXY')
+    objects = []
+    for i in range(objects_num):
+        bpy.ops.mesh.primitive_cube_add(
+            size=0.5,
+            location=((i % 10) * 1.5, (i // 10) * 1.5, 1.0 + (i % 3)),
+            rotation=(0.3 * i, 0.2, 0.1 * i),
+        )
+        obj = bpy.context.active_object
+        obj.rotation_mode = rotation_modes[i % len(rotation_modes)]
+        bpy.ops.rigidbody.object_add(type='ACTIVE')
+        objects.append(obj)
+    return scene, objects
+
+
+class TestBakeToKeyframes(unittest.TestCase):
+
+    def setUp(self):
+        self.frame_end = 40
+        self.scene, self.objects = rigidbody_scene_create(8, self.frame_end)
+
+    def test_bake_to_keyframes(self):
+        scene = self.scene
+        step = 2
+        frames = range(scene.frame_start, self.frame_end + 1, step)
+
+        matrices = {}
+        for f in range(scene.frame_start, self.frame_end + 1):
+            scene.frame_set(f)
+            if f in frames:
+                matrices[f] = [obj.matrix_world.copy() for obj in self.objects]
+
+        bpy.ops.object.select_all(action='SELECT')
+        bpy.ops.rigidbody.bake_to_keyframes(frame_start=scene.frame_start, frame_end=self.frame_end, step=step)
+
+        for obj in self.objects:
+            self.assertIsNone(obj.rigid_body)
+            fcurves = obj.animation_data.action.fcurves
+            self.assertEqual(len(fcurves), 6 if obj.rotation_mode in {'XYZ', 'ZXY'} else 7)
+            for fcu in fcurves:
+                self.assertEqual(fcu.group.name, "Object Transforms")
+                self.assertLessEqual(len(fcu.keyframe_points), len(frames))
+                self.assertTrue(all(keyframe.interpolation == 'LINEAR' for keyframe in fcu.keyframe_points))
+
+        for f in frames:
+            scene.frame_set(f)
+            for obj, matrix in zip(self.objects, matrices[f]):
+                for row, row_baked in zip(matrix, obj.matrix_world):
+                    for value, value_baked in zip(row, row_baked):
+                        self.assertAlmostEqual(value, value_baked, places=3)
+
+    def test_bake_to_keyframes_existing(self):
+        # Existing keyframes on frames which aren't baked keep their settings.
+        scene = self.scene
+        obj = self.objects[0]
+        action = bpy.data.actions.new("Existing")
+        obj.animation_data_create().action = action
+        fcu = action.fcurves.new("location", index=0)
+        keyframe = fcu.keyframe_points.insert(100.0, 7.0)
+        keyframe.type = 'BREAKDOWN'
+        keyframe.easing = 'EASE_OUT'
+        keyframe.handle_left_type = 'VECTOR'
+
+        bpy.ops.object.select_all(action='SELECT')
+        bpy.ops.rigidbody.bake_to_keyframes(frame_start=scene.frame_start, frame_end=self.frame_end, step=1)
+
+        self.assertEqual(obj.animation_data.action, action)
+        keyframe_points = fcu.keyframe_points
+        self.assertGreater(len(keyframe_points), 1)
+        keyframe = keyframe_points[-1]
+        self.assertEqual(tuple(keyframe.co), (100.0, 7.0))
+        self.assertEqual(keyframe.type, 'BREAKDOWN')
+        self.assertEqual(keyframe.easing, 'EASE_OUT')
+        self.assertEqual(keyframe.handle_left_type, 'VECTOR')
+        for keyframe in keyframe_points[:-1]:
+            self.assertLessEqual(keyframe.co[0], self.frame_end)
+            self.assertEqual(keyframe.type, 'KEYFRAME')
+            self.assertEqual(keyframe.interpolation, 'LINEAR')
+
+
+if __name__ == '__main__':
+    import sys
+    sys.argv = [__file__] + (sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else [])
+    unittest.main()
@@ -0,0 +1,173 @@
+# Apache License, Version 2.0
+
+# ./blender.bin --background -noaudio --python tests/python/bl_operators_uvcalc_smart_project.py -- --verbose
+import bpy
+import unittest
+from array import array
+
+from bl_operators import uvcalc_smart_project
+
+
+def mesh_frames_and_quads_create(frames_num, quads_num):
+    """
+    Create a mesh containing frames (5x5 quads without the inner 3x3),
+    each with a hole which fits smaller, separate quads.
+    Returns the mesh and the polygon indices of each island.
+    """
+    co = array('f')
+    faces = array('i')
+    islands = []
+
+    def quad_add(x, y, size):
+        v = len(co) // 3
+        co.extend((x, y, 0.0, x + size, y, 0.0, x + size, y + size, 0.0, x, y + size, 0.0))
+        faces.extend((v, v + 1, v + 2, v + 3))
+        return len(faces) // 4 - 1
+
+    for i in range(frames_num):
+        # Separate quads (not sharing UV's), only the edges are used for intersection tests.
+        ox = i * 10.0
+        islands.append([
+            quad_add(ox + x, y, 1.0)
+            for y in range(5) for x in range(5)
+            if not (1 <= x <= 3 and 1 <= y <= 3)
+        ])
+    for i in range(quads_num):
+        islands.append([quad_add(i * 10.0, -10.0, 0.5)])
+
+    me = bpy.data.meshes.new("Islands")
+    me.from_buffers(co, faces=faces, face_sizes=4)
+    uv_layer = me.uv_layers.new()
+    vert_indices = array('i', [0]) * len(me.loops)
+    me.loops.foreach_get("vertex_index", vert_indices)
+    uv_layer.data.foreach_set("uv", array('f', [
+        value for v in vert_indices for value in co[v * 3:v * 3 + 2]
+    ]))
+    return me, islands
+
+
+def thickface_from_polygon(me, poly):
+    f = uvcalc_smart_project.thickface(tuple(poly.vertices), poly.normal.copy(), poly.area, poly.loop_start)
+    for uv, loop_index in zip(f.uv, poly.loop_indices):
+        uv[:] = me.uv_layers.active.data[loop_index].uv
+    return f
+
+
+def uv_bounds(faces):
+    uvs = [uv for f in faces for uv in f.uv]
+    return (
+        min(uv.x for uv in uvs), min(uv.y for uv in uvs),
+        max(uv.x for uv in uvs), max(uv.y for uv in uvs),
+    )
+
+
+class TestMergeUvIslands(unittest.TestCase):
+
+    def test_merge(self):
+        frames_num, quads_num = 20, 100
+        eps = 1e-5
+
+        me, islands = mesh_frames_and_quads_create(frames_num, quads_num)
+        polygons = me.polygons
+        frame_loop_starts = {polygons[i].loop_start for island in islands[:frames_num] for i in island}
+
+        island_list = [[thickface_from_polygon(me, polygons[i]) for i in island] for island in islands]
+        uvcalc_smart_project.dict_matrix.clear()
+        uvcalc_smart_project.mergeUvIslands(island_list, fill_holes_quality=50)
+
+        # Every frame has room for at least one quad.
+        self.assertLessEqual(len(island_list), quads_num)
+        # Each face is in exactly one island.
+        loop_starts = [f.loop_start for island in island_list for f in island]
+        self.assertEqual(sorted(loop_starts), sorted(poly.loop_start for poly in polygons))
+
+        frames_found = 0
+        for island in island_list:
+            frame = [f for f in island if f.loop_start in frame_loop_starts]
+            quads = [f for f in island if f.loop_start not in frame_loop_starts]
+            if not frame:
+                # Quads are only ever merged into frames.
+                self.assertEqual(len(quads), 1)
+                continue
+            frames_found += 1
+            self.assertEqual(len(frame), 16)
+
+            # Islands are moved to the origin, the frame keeps its size.
+            frame_min_x, frame_min_y, frame_max_x, frame_max_y = uv_bounds(frame)
+            self.assertAlmostEqual(frame_min_x, 0.0, places=5)
+            self.assertAlmostEqual(frame_min_y, 0.0, places=5)
+            self.assertAlmostEqual(frame_max_x, 5.0, places=5)
+            self.assertAlmostEqual(frame_max_y, 5.0, places=5)
+
+            # Merged quads keep their size and don't overlap any other face of the island.
+            face_bounds = [uv_bounds((f,)) for f in frame]
+            for f in quads:
+                min_x, min_y, max_x, max_y = uv_bounds((f,))
+                self.assertAlmostEqual(max_x - min_x, 0.5, places=5)
+                self.assertAlmostEqual(max_y - min_y, 0.5, places=5)
+                self.assertGreaterEqual(min_y, -eps)
+                for other_min_x, other_min_y, other_max_x, other_max_y in face_bounds:
+                    self.assertTrue(
+                        max_x <= other_min_x + eps or other_max_x <= min_x + eps or
+                        max_y <= other_min_y + eps or other_max_y <= min_y + eps
+                    )
+                face_bounds.append((min_x, min_y, max_x, max_y))
+            # At least one quad fills the hole.
+            self.assertTrue(any(
+                1.0 - eps <= min_x and max_x <= 4.0 + eps and 1.0 - eps <= min_y and max_y <= 4.0 + eps
+                for min_x, min_y, max_x, max_y in face_bounds[len(frame):]
+            ))
+        self.assertEqual(frames_found, frames_num)
+
+        bpy.data.meshes.remove(me)
+
+
+class TestSmartProject(unittest.TestCase):
+
+    def setUp(self):
+        self.objects = []
+        for primitive_add in (bpy.ops.mesh.primitive_monkey_add, bpy.ops.mesh.primitive_cube_add):
+            primitive_add()
+            self.objects.append(bpy.context.active_object)
+
+    def tearDown(self):
+        for ob in self.objects:
+            bpy.data.objects.remove(ob)
+
+    def test_smart_project_meshes(self):
+        meshes = [ob.data for ob in self.objects]
+        settings = uvcalc_smart_project.SmartProjectSettings(island_margin=0.02)
+        uvcalc_smart_project.smart_project_meshes(meshes, settings)
+
+        for me in meshes:
+            uvs = array('f', [0.0]) * (len(me.loops) * 2)
+            me.uv_layers.active.data.foreach_get("uv", uvs)
+            self.assertGreaterEqual(min(uvs), -1e-5)
+            self.assertLessEqual(max(uvs), 1.0 + 1e-5)
+            # All faces have an area, so none are left at (0, 0).
+            self.assertGreater(len(set(zip(uvs[0::2], uvs[1::2]))), 4)
+
+    def test_smart_project_zero_area(self):
+        # Only zero area faces, with UV's from a previous unwrap.
+        me = bpy.data.meshes.new("ZeroArea")
+        me.from_pydata(
+            [(0.0, 0.0, 0.0), (1.0, 0.0, 0.0), (2.0, 0.0, 0.0), (3.0, 0.0, 0.0)],
+            [],
+            [(0, 1, 2, 3)],
+        )
+        me.uv_layers.new()
+        uvs = array('f', [0.5]) * (len(me.loops) * 2)
+        me.uv_layers.active.data.foreach_set("uv", uvs)
+
+        settings = uvcalc_smart_project.SmartProjectSettings()
+        uvcalc_smart_project.smart_project_meshes([me], settings)
+
+        me.uv_layers.active.data.foreach_get("uv", uvs)
+        self.assertEqual(uvs.tolist(), [0.0] * len(uvs))
+        bpy.data.meshes.remove(me)
+
+
+if __name__ == '__main__':
+    import sys
+    sys.argv = [__file__] + (sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else [])
+    unittest.main()
@@ -0,0 +1,111 @@
+# Apache License, Version 2.0
+
+# ./blender.bin --background -noaudio --python tests/python/bl_operators_vertexpaint_dirt.py -- --verbose
+import bpy
+import unittest
+from math import pi
+
+from bl_operators.vertexpaint_dirt import applyVertexDirt
+
+
+def mesh_grid_create(z_center):
+    """
+    Create a grid of 2x2 quads, with the center vertex (index 4) moved by *z_center*.
+    """
+    verts = [(x, y, z_center if (x, y) == (1, 1) else 0.0) for y in range(3) for x in range(3)]
+    faces = [(0, 1, 4, 3), (1, 2, 5, 4), (3, 4, 7, 6), (4, 5, 8, 7)]
+    me = bpy.data.meshes.new("Grid")
+    me.from_pydata(verts, [], faces)
+    me.calc_normals()
+    # Select all polygons except the last.
+    for poly in me.polygons:
+        poly.select = poly.index != 3
+    me.vertex_colors.new().active = True
+    return me
+
+
+class TestVertexPaintDirt(unittest.TestCase):
+
+    def setUp(self):
+        self.meshes = []
+
+    def tearDown(self):
+        for me in self.meshes:
+            bpy.data.meshes.remove(me)
+
+    def _vertex_tones(self, z_center, args, use_paint_mask=False):
+        """
+        Apply the dirt to a grid with white vertex colors.
+
+        :return: The tone of each vertex (None when unchanged) and the alpha of all loops.
+        """
+        me = mesh_grid_create(z_center)
+        self.meshes.append(me)
+        me.use_paint_mask = use_paint_mask
+        self.assertEqual(applyVertexDirt(me, *args), {'FINISHED'})
+
+        vert_tones = [None] * len(me.vertices)
+        alphas = []
+        for poly in me.polygons:
+            for loop_index in poly.loop_indices:
+                r, g, b, a = me.vertex_colors.active.data[loop_index].color
+                self.assertAlmostEqual(r, g, places=6)
+                self.assertAlmostEqual(r, b, places=6)
+                alphas.append(a)
+                if use_paint_mask and not poly.select:
+                    self.assertEqual(r, 1.0)
+                    continue
+                v = me.loops[loop_index].vertex_index
+                if vert_tones[v] is not None:
+                    self.assertAlmostEqual(vert_tones[v], r, places=6)
+                vert_tones[v] = r
+        return vert_tones, alphas
+
+    def test_flat(self):
+        # All vertices have the same tone, so the range collapses to zero.
+        vert_tones, alphas = self._vertex_tones(0.0, (0, 1.0, 0.0, pi, False))
+        self.assertEqual(vert_tones, [0.0] * 9)
+        self.assertEqual(alphas, [1.0] * 16)
+
+    def test_crease(self):
+        for z_center, tone_center in ((-1.0, 0.0), (1.0, 1.0)):
+            for args in ((0, 1.0, 0.0, pi, False), (2, 0.5, 0.0, pi, False), (0, 1.0, 0.0, 2.5, False)):
+                with self.subTest(z_center=z_center, args=args):
+                    vert_tones, _alphas = self._vertex_tones(z_center, args)
+                    # Dirt accumulates in the pit, the bump is worn.
+                    self.assertAlmostEqual(vert_tones[4], tone_center, places=6)
+                    # Tones are normalized.
+                    self.assertAlmostEqual(min(vert_tones), 0.0, places=6)
+                    self.assertAlmostEqual(max(vert_tones), 1.0, places=6)
+                    # The grid is symmetric.
+                    for corners in ((0, 2, 6, 8), (1, 3, 5, 7)):
+                        for v in corners[1:]:
+                            self.assertAlmostEqual(vert_tones[v], vert_tones[corners[0]], places=5)
+
+    def test_tones(self):
+        # Known tones of the corners, edge centers & center vertex.
+        for z_center, tones_expected in ((-1.0, (0.4095, 1.0, 0.0)), (1.0, (0.5905, 0.0, 1.0))):
+            vert_tones, _alphas = self._vertex_tones(z_center, (0, 1.0, 0.0, pi, False))
+            for tone, tone_expected in zip((vert_tones[0], vert_tones[1], vert_tones[4]), tones_expected):
+                self.assertAlmostEqual(tone, tone_expected, places=3)
+
+    def test_dirt_only(self):
+        vert_tones, _alphas = self._vertex_tones(-1.0, (0, 1.0, 0.0, pi, True))
+        self.assertEqual(vert_tones[4], 0.0)
+        for tone in vert_tones:
+            self.assertTrue(0.0 <= tone <= 1.0)
+        # Clean areas are not darkened.
+        self.assertEqual(max(vert_tones), 1.0)
+
+    def test_paint_mask(self):
+        vert_tones, alphas = self._vertex_tones(-1.0, (0, 1.0, 0.0, pi, False), use_paint_mask=True)
+        self.assertEqual(alphas, [1.0] * 16)
+        # Vertex 8 is only used by the unselected polygon.
+        self.assertIsNone(vert_tones[8])
+        self.assertEqual(vert_tones[4], 0.0)
+
+
+if __name__ == '__main__':
+    import sys
+    sys.argv = [__file__] + (sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else [])
+    unittest.main()
@@ -0,0 +1,152 @@
+# Apache License, Version 2.0
+
+# ./blender.bin --background -noaudio --python tests/python/bl_pyapi_bpy_types.py -- --verbose
+import bpy
+import unittest
+
+
+def bone_children_depths(parent_fn, bones_num, index):
+    """
+    Map the indices of all children of bone *index* to their distance to it,
+    for an armature created by ``armature_create(name, parent_fn, bones_num)``.
+    """
+    children_map = {}
+    for i in range(bones_num):
+        children_map.setdefault(parent_fn(i), []).append(i)
+    depths = {}
+    depth = 0
+    indices = [index]
+    while indices:
+        depth += 1
+        indices = [i for parent_index in indices for i in children_map.get(parent_index, ())]
+        depths.update(dict.fromkeys(indices, depth))
+    return depths
+
+
+def bone_index(bone):
+    return int(bone.name.rpartition(".")[2])
+
+
+def parent_deep(i):
+    return i - 1
+
+
+def parent_wide(i):
+    return -1 if i == 0 else (i - 1) // 8
+
+
+def armature_create(name, parent_fn, bones_num):
+    """
+    Create an armature object where the parent of each bone
+    is the index returned by ``parent_fn(index)``, -1 for no parent.
+    """
+    arm = bpy.data.armatures.new(name)
+    obj = bpy.data.objects.new(name, arm)
+    bpy.context.scene.collection.objects.link(obj)
+    bpy.context.view_layer.objects.active = obj
+    bpy.ops.object.mode_set(mode='EDIT')
+    edit_bones = arm.edit_bones
+    for i in range(bones_num):
+        ebone = edit_bones.new("%s.%.4d" % (name, i))
+        ebone.tail.z = 1.0
+        parent_index = parent_fn(i)
+        if parent_index != -1:
+            ebone.parent = edit_bones[parent_index]
+    bpy.ops.object.mode_set(mode='OBJECT')
+    return obj
+
+
+class TestBoneHierarchy(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.rigs = (
+            (armature_create("Deep", parent_deep, 1000), parent_deep),
+            (armature_create("Wide", parent_wide, 2000), parent_wide),
+        )
+        cls.obj_deep = cls.rigs[0][0]
+        cls.obj_wide = cls.rigs[1][0]
+
+    def _test_bones(self, bones, parent_fn):
+        for bone in bones[:50]:
+            depths = bone_children_depths(parent_fn, len(bones), bone_index(bone))
+            children = [bone_index(child) for child in bone.children_recursive]
+            # All children, sorted by their distance to the bone.
+            self.assertEqual(sorted(children), sorted(depths))
+            children_depths = [depths[i] for i in children]
+            self.assertEqual(children_depths, sorted(children_depths))
+
+    def test_children_recursive(self):
+        for obj, parent_fn in self.rigs:
+            self._test_bones(obj.data.bones, parent_fn)
+            self._test_bones(obj.pose.bones, parent_fn)
+
+    def test_children_recursive_basename(self):
+        bones = self.obj_deep.data.bones
+        chain = bones[0].children_recursive_basename
+        self.assertEqual(len(chain), len(bones) - 1)
+        # Forks terminate the chain.
+        self.assertEqual(self.obj_wide.data.bones[0].children_recursive_basename, [])
+
+    def test_children_recursive_root(self):
+        for obj, _parent_fn in self.rigs:
+            bones = obj.data.bones
+            root = bones["%s.0000" % obj.name]
+            children = [bone_index(child) for child in root.children_recursive]
+            self.assertEqual(sorted(children), list(range(1, len(bones))))
+
+
+class TestMeshFromBuffers(unittest.TestCase):
+    vertices = [(0.0, 0.0, 0.0), (1.0, 0.0, 0.0), (1.0, 1.0, 0.0), (0.0, 1.0, 0.0), (2.0, 0.0, 0.0), (3.0, 3.0, 3.0)]
+    faces = [(0, 1, 2, 3), (1, 4, 2)]
+    edges = [(4, 5)]
+
+    @staticmethod
+    def _mesh_data(me):
+        return (
+            [v.co[:] for v in me.vertices],
+            sorted(e.key for e in me.edges),
+            [p.vertices[:] for p in me.polygons],
+        )
+
+    def test_from_buffers(self):
+        from array import array
+        me_pydata = bpy.data.meshes.new("PyData")
+        me_pydata.from_pydata(self.vertices, self.edges, self.faces)
+
+        me_buffers = bpy.data.meshes.new("Buffers")
+        me_buffers.from_buffers(
+            array('f', [axis for co in self.vertices for axis in co]),
+            faces=array('i', [i for face in self.faces for i in face]),
+            face_sizes=array('i', [len(face) for face in self.faces]),
+            edges=array('i', [i for edge in self.edges for i in edge]),
+        )
+        self.assertFalse(me_buffers.validate())
+        self.assertEqual(self._mesh_data(me_pydata), self._mesh_data(me_buffers))
+
+    def test_from_buffers_face_size(self):
+        me = bpy.data.meshes.new("Triangles")
+        me.from_buffers(self.vertices[:3], faces=(0, 1, 2))
+        self.assertEqual([p.vertices[:] for p in me.polygons], [(0, 1, 2)])
+        with self.assertRaises(ValueError):
+            me.from_buffers(self.vertices[:3], faces=(0, 1, 2, 3))
+
+    def test_from_buffers_face_size_integral(self):
+        import numpy as np
+        me = bpy.data.meshes.new("Quads")
+        me.from_buffers(self.vertices[:4], faces=np.arange(4, dtype=np.int32), face_sizes=np.int64(4))
+        self.assertEqual([p.vertices[:] for p in me.polygons], [(0, 1, 2, 3)])
+
+    def test_from_buffers_face_size_invalid(self):
+        me = bpy.data.meshes.new("Invalid")
+        for face_sizes in (0, -3, 2):
+            with self.subTest(face_sizes=face_sizes):
+                with self.assertRaises(ValueError):
+                    me.from_buffers(self.vertices[:4], faces=(0, 1, 2, 3), face_sizes=face_sizes)
+        self.assertEqual(len(me.vertices), 0)
+
+
+if __name__ == '__main__':
+    import sys
+    sys.argv = [__file__] + (sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else [])
+    unittest.main()
@@ -0,0 +1,64 @@
+# Apache License, Version 2.0
+
+# ./blender.bin --background -noaudio --python tests/python/bl_rna_info.py -- --verbose
+import unittest
+import os
+import tempfile
+
+import rna_info
+
+
+def rna_info_dump(lookups):
+    structs, funcs, ops, props = lookups
+    data = []
+    for struct_id, struct in sorted(structs.items()):
+        data.append((
+            struct_id,
+            struct.base.identifier if struct.base else None,
+            struct.nested.identifier if struct.nested else None,
+            struct.full_path,
+            struct.py_class,
+            tuple(struct.references),
+            tuple(rna_struct.identifier for rna_struct in struct.children),
+        ))
+        for prop in struct.properties:
+            data.append((
+                prop.identifier,
+                prop.get_type_description(),
+                prop.default_str,
+                prop.fixed_type.identifier if prop.fixed_type else None,
+            ))
+        for func in struct.functions:
+            data.append((
+                func.identifier,
+                tuple(prop.get_arg_default() for prop in func.args),
+                tuple(prop.get_type_description(as_ret=True) for prop in func.return_values),
+            ))
+    for op_id, op in sorted(ops.items()):
+        data.append((op_id, op.description, tuple(prop.get_arg_default() for prop in op.args)))
+    data.append((len(funcs), len(props)))
+    return data
+
+
+class TestRNAInfo(unittest.TestCase):
+
+    def test_bases(self):
+        structs = rna_info.BuildRNAInfo()[0]
+        for struct in structs.values():
+            for base in struct.get_bases():
+                self.assertIn(("", base.identifier), structs)
+
+    def test_cache(self):
+        data = rna_info_dump(rna_info.BuildRNAInfo())
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_filepath = os.path.join(tmp_dir, "rna_info.pickle")
+            rna_info.BuildRNAInfo(cache_filepath=cache_filepath)
+            self.assertTrue(os.path.exists(cache_filepath))
+            lookups = rna_info.BuildRNAInfo(cache_filepath=cache_filepath)
+            self.assertEqual(rna_info_dump(lookups), data)
+
+
+if __name__ == '__main__':
+    import sys
+    sys.argv = [__file__] + (sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else [])
+    unittest.main()
@@ -0,0 +1,114 @@
+# Apache License, Version 2.0
+
+# ./blender.bin --background -noaudio --python tests/python/bl_ui_startup.py -- --verbose
+#
+# Runs Blender in a sub-process to check startup profiling & lazy registration of interface scripts.
+import bpy
+import bl_ui
+import json
+import os
+import subprocess
+import unittest
+
+LAZY_REGISTER_EXPR = """\
+import bpy
+import bl_ui
+import json
+result = {
+    "pending": sorted(bl_ui._modules_lazy_pending),
+    "headers": sorted(cls.__name__ for cls in bl_ui._lazy_headers.values()),
+    "registered": hasattr(bpy.types, "CLIP_HT_header"),
+}
+bl_ui.lazy_register_ensure('CLIP_EDITOR')
+result["registered_space_type"] = hasattr(bpy.types, "CLIP_HT_header")
+result["pending_space_type"] = sorted(bl_ui._modules_lazy_pending)
+bl_ui.lazy_register_ensure()
+result["pending_all"] = sorted(bl_ui._modules_lazy_pending)
+result["headers_all"] = sorted(cls.__name__ for cls in bl_ui._lazy_headers.values())
+result["registered_all"] = hasattr(bpy.types, "PARTICLE_PT_context_particles")
+print(json.dumps({"lazy_register": result}))
+"""
+
+
+def blender_run(args, env_extra=None):
+    env = os.environ.copy()
+    env.pop("BLENDER_UI_LAZY_REGISTER", None)
+    if env_extra is not None:
+        env.update(env_extra)
+    output = subprocess.check_output(
+        (
+            bpy.app.binary_path,
+            "--background",
+            "-noaudio",
+            "--factory-startup",
+            "--python-exit-code", "1",
+            *args,
+        ),
+        env=env,
+    )
+    return [
+        json.loads(line)
+        for line in output.decode("utf-8", "surrogateescape").splitlines()
+        if line.startswith("{")
+    ]
+
+
+class TestStartupProfile(unittest.TestCase):
+
+    def test_profile(self):
+        records = blender_run(("--debug-python-profile", "--python-expr", "pass"))
+        records_import = {
+            record["module"]: record["time"]
+            for record in records if record.get("python_profile") == "import"
+        }
+        records_register = {
+            record["module"]: record["time"]
+            for record in records if record.get("python_profile") == "register"
+        }
+        records_total = [record for record in records if record.get("python_profile") == "total"]
+
+        for name in bl_ui._modules:
+            self.assertIn("bl_ui." + name, records_import)
+            self.assertIn("bl_ui." + name, records_register)
+        for module_name in ("bl_ui", "bl_operators"):
+            self.assertIn(module_name, records_import)
+            self.assertIn(module_name, records_register)
+        self.assertEqual(len(records_total), 1)
+        self.assertGreaterEqual(records_total[0]["time"], records_import["bl_ui"])
+
+
+class TestLazyRegister(unittest.TestCase):
+
+    def test_lazy_register_disabled(self):
+        self.assertEqual(bl_ui._modules_lazy_pending, set())
+        self.assertEqual(bl_ui._lazy_headers, {})
+        self.assertEqual(bl_ui.lazy_register_ensure(), [])
+        self.assertTrue(hasattr(bpy.types, "CLIP_HT_header"))
+
+    def test_lazy_register(self):
+        records = blender_run(
+            ("--debug-python-profile", "--python-expr", LAZY_REGISTER_EXPR),
+            env_extra={"BLENDER_UI_LAZY_REGISTER": "1"},
+        )
+        result = [record["lazy_register"] for record in records if "lazy_register" in record][0]
+        modules_lazy = sorted(name for name in bl_ui._modules if name in bl_ui._modules_lazy)
+        space_types = {space_type for name in modules_lazy for space_type in bl_ui._modules_lazy[name]}
+
+        self.assertEqual(result["pending"], modules_lazy)
+        self.assertEqual(result["headers"], sorted("UI_HT_lazy_" + space_type.lower() for space_type in space_types))
+        self.assertFalse(result["registered"])
+        self.assertTrue(result["registered_space_type"])
+        self.assertNotIn("space_clip", result["pending_space_type"])
+        self.assertEqual(result["pending_all"], [])
+        self.assertEqual(result["headers_all"], [])
+        self.assertTrue(result["registered_all"])
+
+        # Lazy modules aren't imported at startup.
+        records_import = [record["module"] for record in records if record.get("python_profile") == "import"]
+        self.assertLess(records_import.index("bl_ui"), records_import.index("bl_ui.space_clip"))
+
+
+if __name__ == '__main__':
+    import sys
+    sys.argv = [__file__] + (sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else [])
+    unittest.main()
@@ -3,6 +3,7 @@
 # Compare renders or screenshots against reference versions and generate
 # a HTML report showing the differences, for regression testing.
 
+import concurrent.futures
 import glob
 import os
 import pathlib
@@ -13,6 +14,12 @@ import time
 
 from . import global_report
 
+try:
+    # Compare images in-process when OpenImageIO Python module is available.
+    import OpenImageIO as oiio
+except ImportError:
+    oiio = None
+
 
 class COLORS_ANSI:
     RED = '\033[00;31m'
@@ -68,6 +75,55 @@ def blend_list(dirpath):
                 yield filepath
 
 
+def image_diff(ref_img, new_img, diff_img, fail=0.016, failpercent=1.0, idiff="idiff"):
+    """
+    Compare images with the same semantic as ``idiff -fail <fail> -failpercent <failpercent>``:
+    images differ when more than failpercent % of their pixels have a channel differing by more than fail.
+    An absolute difference image (scaled by 16) is written to diff_img only when images differ.
+
+    Returns True when images match.
+    """
+    if os.path.exists(diff_img):
+        os.remove(diff_img)
+
+    if oiio is None:
+        # Single idiff process, only writing the difference image when there is any difference.
+        command = (
+            idiff,
+            "-fail", str(fail),
+            "-failpercent", str(failpercent),
+            "-o", diff_img, "-od",
+            "-abs", "-scale", "16",
+            ref_img,
+            new_img,
+        )
+        try:
+            subprocess.check_output(command)
+        except subprocess.CalledProcessError as e:
+            # Return code 1 is a warning (pixels differing below failure threshold).
+            return e.returncode == 1
+        return True
+
+    ref = oiio.ImageBuf(ref_img)
+    new = oiio.ImageBuf(new_img)
+    if ref.has_error or new.has_error:
+        return False
+    ref_spec = ref.spec()
+    new_spec = new.spec()
+    if (ref_spec.width, ref_spec.height, ref_spec.nchannels) != (new_spec.width, new_spec.height, new_spec.nchannels):
+        return False
+
+    result = oiio.ImageBufAlgo.compare(ref, new, fail, fail)
+    pixels_num = ref_spec.width * ref_spec.height * max(ref_spec.depth, 1)
+    if result.nfail <= (failpercent / 100.0) * pixels_num:
+        return True
+
+    diff = oiio.ImageBufAlgo.absdiff(ref, new)
+    diff = oiio.ImageBufAlgo.mul(diff, 16.0)
+    diff.write(diff_img)
+    return False
+
+
 def test_get_name(filepath):
     filename = os.path.basename(filepath)
     return os.path.splitext(filename)[0]
@@ -109,7 +165,8 @@ class Report:
         'failed_tests',
         'passed_tests',
         'compare_tests',
-        'compare_engines'
+        'compare_engines',
+        'jobs',
     )
 
     def __init__(self, title, output_dir, idiff):
@@ -122,6 +179,8 @@ class Report:
         self.pixelated = False
         self.verbose = os.environ.get("BLENDER_VERBOSE") is not None
         self.update = os.getenv('BLENDER_TEST_UPDATE') is not None
+        # Number of Blender processes rendering tests concurrently, each one rendering its own shard of tests.
+        self.jobs = max(int(os.environ.get("BLENDER_TEST_JOBS", 1)), 1)
 
         if os.environ.get("BLENDER_TEST_COLOR") is not None:
             global COLORS, COLORS_ANSI
@@ -142,6 +201,9 @@ class Report:
     def set_compare_engines(self, engine, other_engine):
         self.compare_engines = (engine, other_engine)
 
+    def set_jobs(self, jobs):
+        self.jobs = max(jobs, 1)
+
     def run(self, dirpath, blender, arguments_cb, batch=False):
         # Run tests and output report.
         dirname = os.path.basename(dirpath)
@@ -230,7 +292,7 @@ class Report:
             columns_html = "<tr><th>Name</th><th>%s</th><th>%s</th>" % (engine_self, engine_other)
         else:
             title = self.title + " Test Report"
-            columns_html = "<tr><th>Name</th><th>New</th><th>Reference</th><th>Diff</th>"
+            columns_html = "<tr><th>Name</th><th>Time</th><th>New</th><th>Reference</th><th>Diff</th>"
 
         html = """
 <html>
@@ -300,7 +362,7 @@ class Report:
         relpath = os.path.relpath(filepath, self.output_dir)
         return pathlib.Path(relpath).as_posix()
 
-    def _write_test_html(self, testname, filepath, error):
+    def _write_test_html(self, testname, filepath, error, test_time=None):
         name = test_get_name(filepath)
         name = name.replace('_', ' ')
 
@@ -308,24 +370,28 @@ class Report:
 
         status = error if error else ""
         tr_style = """ class="table-danger" """ if error else ""
+        time_str = "%.2f s" % test_time if test_time is not None else ""
 
         new_url = self._relative_url(new_img)
         ref_url = self._relative_url(ref_img)
-        diff_url = self._relative_url(diff_img)
+        # Difference images are only written for failed tests.
+        diff_html = """<img src="%s">""" % self._relative_url(diff_img) if os.path.exists(diff_img) else ""
 
         test_html = """
             <tr{tr_style}>
                 <td><b>{name}</b><br/>{testname}<br/>{status}</td>
+                <td>{time_str}</td>
                 <td><img src="{new_url}" onmouseover="this.src='{ref_url}';" onmouseout="this.src='{new_url}';" class="render"></td>
                 <td><img src="{ref_url}" onmouseover="this.src='{new_url}';" onmouseout="this.src='{ref_url}';" class="render"></td>
-                <td><img src="{diff_url}"></td>
+                <td>{diff_html}</td>
             </tr>""" . format(tr_style=tr_style,
                               name=name,
                               testname=testname,
                               status=status,
+                              time_str=time_str,
                               new_url=new_url,
                               ref_url=ref_url,
-                              diff_url=diff_url)
+                              diff_html=diff_html)
 
         if error:
             self.failed_tests += test_html
@@ -364,20 +430,9 @@ class Report:
 
         if os.path.exists(ref_img):
             # Diff images test with threshold.
-            command = (
-                self.idiff,
-                "-fail", "0.016",
-                "-failpercent", "1",
-                ref_img,
-                tmp_filepath,
-            )
-            try:
-                subprocess.check_output(command)
-                failed = False
-            except subprocess.CalledProcessError as e:
-                if self.verbose:
-                    print_message(e.output.decode("utf-8"))
-                failed = e.returncode != 1
+            failed = not image_diff(ref_img, tmp_filepath, diff_img, idiff=self.idiff)
+            if failed and self.verbose:
+                print_message("Difference image saved to: " + diff_img)
         else:
             if not self.update:
                 return False
@@ -388,23 +443,10 @@ class Report:
             # Update reference image if requested.
             shutil.copy(new_img, ref_img)
             shutil.copy(new_img, old_img)
+            if os.path.exists(diff_img):
+                os.remove(diff_img)
             failed = False
 
-        # Generate diff image.
-        command = (
-            self.idiff,
-            "-o", diff_img,
-            "-abs", "-scale", "16",
-            ref_img,
-            tmp_filepath
-        )
-
-        try:
-            subprocess.check_output(command)
-        except subprocess.CalledProcessError as e:
-            if self.verbose:
-                print_message(e.output.decode("utf-8"))
-
         return not failed
 
     def _run_tests(self, filepaths, blender, arguments_cb, batch):
@@ -414,6 +456,7 @@ class Report:
 
         remaining_filepaths = filepaths[:]
         errors = []
+        times = []
 
         while len(remaining_filepaths) > 0:
             command = [blender]
@@ -440,6 +483,7 @@ class Report:
             # Run process
             crash = False
             output = None
+            time_start = time.time()
             try:
                 output = subprocess.check_output(command)
             except subprocess.CalledProcessError as e:
@@ -460,28 +504,58 @@ class Report:
                     # In case of crash, stop after missing files and re-render remaining
                     if not os.path.exists(output_filepath):
                         errors.append("CRASH")
+                        times.append(None)
                         print_message("Crash running Blender")
                         print_message(testname, 'FAILURE', 'FAILED')
                         break
 
                 testname = test_get_name(filepath)
 
+                # Tests of a batch are rendered one after the other, so the time of each test
+                # is the time since the previous result was written.
+                test_time = None
+                if os.path.exists(output_filepath):
+                    time_end = os.path.getmtime(output_filepath)
+                    test_time = max(time_end - time_start, 0.0)
+                    time_start = time_end
+                times.append(test_time)
+                time_str = " ({} ms)" . format(int(test_time * 1000)) if test_time is not None else ""
+
                 if not os.path.exists(output_filepath) or os.path.getsize(output_filepath) == 0:
                     errors.append("NO OUTPUT")
                     print_message("No render result file found")
-                    print_message(testname, 'FAILURE', 'FAILED')
+                    print_message(testname + time_str, 'FAILURE', 'FAILED')
                 elif not self._diff_output(filepath, output_filepath):
                     errors.append("VERIFY")
                     print_message("Render result is different from reference image")
-                    print_message(testname, 'FAILURE', 'FAILED')
+                    print_message(testname + time_str, 'FAILURE', 'FAILED')
                 else:
                     errors.append(None)
-                    print_message(testname, 'SUCCESS', 'OK')
+                    print_message(testname + time_str, 'SUCCESS', 'OK')
 
                 if os.path.exists(output_filepath):
                     os.remove(output_filepath)
 
-        return errors
+        return errors, times
+
+    def _run_tests_sharded(self, filepaths, blender, arguments_cb, batch):
+        # Split tests in shards, each rendered by its own Blender process (re-run after crashes),
+        # running self.jobs processes concurrently.
+        if self.jobs <= 1 or len(filepaths) <= 1:
+            return self._run_tests(filepaths, blender, arguments_cb, batch)
+
+        shards_num = min(self.jobs, len(filepaths))
+        shards = [filepaths[i::shards_num] for i in range(shards_num)]
+        with concurrent.futures.ThreadPoolExecutor(shards_num) as executor:
+            results = list(executor.map(lambda shard: self._run_tests(shard, blender, arguments_cb, batch), shards))
+
+        # Back to the order of filepaths.
+        errors = [None] * len(filepaths)
+        times = [None] * len(filepaths)
+        for i, (shard_errors, shard_times) in enumerate(results):
+            errors[i::shards_num] = shard_errors
+            times[i::shards_num] = shard_times
+        return errors, times
 
     def _run_all_tests(self, dirname, dirpath, blender, arguments_cb, batch):
         passed_tests = []
@@ -492,8 +566,8 @@ class Report:
                       format(len(all_files)),
                       'SUCCESS', "==========")
         time_start = time.time()
-        errors = self._run_tests(all_files, blender, arguments_cb, batch)
-        for filepath, error in zip(all_files, errors):
+        errors, times = self._run_tests_sharded(all_files, blender, arguments_cb, batch)
+        for filepath, error, test_time in zip(all_files, errors, times):
             testname = test_get_name(filepath)
             if error:
                 if error == "NO_ENGINE":
@@ -503,7 +577,7 @@ class Report:
                 failed_tests.append(testname)
             else:
                 passed_tests.append(testname)
-            self._write_test_html(dirname, filepath, error)
+            self._write_test_html(dirname, filepath, error, test_time)
         time_end = time.time()
         elapsed_ms = int((time_end - time_start) * 1000)
         print_message("")